@@ -0,0 +1,44 @@
+"""add_calls_query_indexes
+
+Revision ID: 5a7d3e9c1f64
+Revises: 0c9e4d7a2b18
+Create Date: 2025-08-26 09:47:15.206381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7d3e9c1f64'
+down_revision: Union[str, None] = '0c9e4d7a2b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Active dispatch states covered by the partial index
+ACTIVE_STATUSES = "status IN ('Ready', 'Queued', 'In Progress')"
+
+
+def upgrade() -> None:
+    # Built CONCURRENTLY so writes to calls are not blocked while indexing;
+    # this cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_calls_organization_id_created_at', 'calls', ['organization_id', sa.text('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_calls_organization_id_status_created_at', 'calls', ['organization_id', 'status', 'created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_calls_active_status', 'calls', ['status', 'organization_id', 'lease_expires_at'], unique=False, postgresql_where=sa.text(ACTIVE_STATUSES), postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_calls_service_record_id', 'calls', ['service_record_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_calls_campaign_id', 'calls', ['campaign_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_calls_updated_at', 'calls', ['updated_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+    op.execute('ANALYZE calls')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_calls_updated_at', table_name='calls', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_calls_campaign_id', table_name='calls', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_calls_service_record_id', table_name='calls', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_calls_active_status', table_name='calls', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_calls_organization_id_status_created_at', table_name='calls', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_calls_organization_id_created_at', table_name='calls', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+"""add_servicerecords_keyset_index
+
+Revision ID: b82f6c0d4e17
+Revises: 5a7d3e9c1f64
+Create Date: 2025-08-27 15:21:38.640112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b82f6c0d4e17'
+down_revision: Union[str, None] = '5a7d3e9c1f64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_servicerecords_organization_id_created_at_id', 'servicerecords', ['organization_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_servicerecords_organization_id_created_at_id', table_name='servicerecords', postgresql_concurrently=True, if_exists=True)
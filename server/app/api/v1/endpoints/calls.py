@@ -9,13 +9,16 @@ import os
 from datetime import date
 from sqlalchemy import select, and_
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Path, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_current_organization, get_current_user, get_tenant_db
+from app.core.pagination import set_next_cursor
+from app.dependencies import get_admin_user, get_current_organization, get_current_user, get_tenant_db
 from app.models import Organization, User, ServiceRecord, Call
 from app.schemas import CallCreate, CallResponse, CallUpdate, CSVTemplateResponse, BulkCallUpload
 from app.schemas.demo_call import DemoCallCreate, DemoCallResponse
+from app.schemas.analysis_backfill import AnalysisBackfillCreate, AnalysisBackfillJobResponse
+from app.services.analysis_backfill_service import AnalysisBackfillService
 from app.schemas.call import CallDetailResponse
 from app.services.call_service import CallService
 from app.call_initiator.worker import CallInitiatorWorker
@@ -23,11 +26,16 @@ from app.core.config import settings
 
 router = APIRouter()
 
+# One worker per process, so API-triggered cycles share its per-organization dial timers
+initiator_worker = CallInitiatorWorker()
+
 
 @router.get("/", response_model=List[CallResponse])
 async def list_calls(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status: Optional[str] = Query(None, description="Filter by call status"),
     call_type: Optional[str] = Query(None, description="Filter by call type"),
     service_record_id: Optional[int] = Query(None, description="Filter by service record ID"),
@@ -36,10 +44,15 @@ async def list_calls(
     db: AsyncSession = Depends(get_tenant_db),
 ) -> Any:
     """
-    List calls.
+    List calls, newest first.
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the next
+    page; skip is ignored when a cursor is given.
     
     Args:
+        response: Outgoing response (carries X-Next-Cursor)
         skip: Number of calls to skip
+        cursor: Keyset cursor from the previous page
         limit: Maximum number of calls to return
         status: Filter by call status
         call_type: Filter by call type
@@ -59,8 +72,10 @@ async def list_calls(
         call_type=call_type,
         service_record_id=service_record_id,
         campaign_id=campaign_id,
+        cursor=cursor,
         db=db
     )
+    set_next_cursor(response, calls, limit)
     
     # Enhance calls with additional info
     result = []
@@ -604,6 +619,94 @@ async def list_recent_calls(
         )
 
 
+@router.post("/reanalysis", response_model=AnalysisBackfillJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_call_reanalysis(
+    job_data: AnalysisBackfillCreate,
+    background_tasks: BackgroundTasks,
+    organization: Organization = Depends(get_current_organization),
+    current_user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_tenant_db),
+) -> Any:
+    """
+    Re-analyse the organization's completed calls in the background.
+    
+    Args:
+        job_data: Job scope and analysis settings
+        background_tasks: Background task runner
+        organization: Current organization
+        current_user: Current user (admin)
+        db: Database session
+        
+    Returns:
+        AnalysisBackfillJobResponse: Created job; poll GET /calls/reanalysis/{job_id} for progress
+    """
+    job = await AnalysisBackfillService.create_job(
+        db,
+        organization_id=organization.id,
+        completed_since=job_data.completed_since,
+        model=job_data.model,
+        prompt_version=job_data.prompt_version
+    )
+    background_tasks.add_task(AnalysisBackfillService.run_job, job.id)
+    return job
+
+
+@router.get("/reanalysis/{job_id}", response_model=AnalysisBackfillJobResponse)
+async def get_call_reanalysis(
+    job_id: int = Path(..., ge=1),
+    organization: Organization = Depends(get_current_organization),
+    db: AsyncSession = Depends(get_tenant_db),
+) -> Any:
+    """
+    Get re-analysis job progress.
+    
+    Args:
+        job_id: Job ID
+        organization: Current organization
+        db: Database session
+        
+    Returns:
+        AnalysisBackfillJobResponse: Job status and counters
+    """
+    job = await AnalysisBackfillService.get_job(job_id, db, organization_id=organization.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Re-analysis job not found"
+        )
+    return job
+
+
+@router.post("/reanalysis/{job_id}/cancel", response_model=AnalysisBackfillJobResponse)
+async def cancel_call_reanalysis(
+    job_id: int = Path(..., ge=1),
+    organization: Organization = Depends(get_current_organization),
+    current_user: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_tenant_db),
+) -> Any:
+    """
+    Cancel a re-analysis job. A running job stops after its current chunk.
+    
+    Args:
+        job_id: Job ID
+        organization: Current organization
+        current_user: Current user (admin)
+        db: Database session
+        
+    Returns:
+        AnalysisBackfillJobResponse: Job status
+    """
+    job = await AnalysisBackfillService.get_job(job_id, db, organization_id=organization.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Re-analysis job not found"
+        )
+    await AnalysisBackfillService.cancel_job(job_id, db)
+    await db.refresh(job)
+    return job
+
+
 @router.get("/{call_id}", response_model=CallResponse)
 async def get_call(
     call_id: int = Path(..., ge=1),
@@ -846,11 +949,8 @@ async def initiate_call_worker(
                 detail="Invalid access token"
             )
         
-        # Create worker instance
-        worker = CallInitiatorWorker()
-        
         # Run a single processing cycle
-        stats = await worker.run_single_cycle()
+        stats = await initiator_worker.run_single_cycle()
         
         # Check if there was an error
         if "error" in stats:
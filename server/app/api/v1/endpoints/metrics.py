@@ -11,8 +11,9 @@ from pydantic import BaseModel
 from sqlalchemy import select, func, case, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.dependencies import get_current_organization, get_tenant_db
-from app.models import Organization, Call, CallFeedback, ServiceRecord
+from app.models import Organization, Call, CallFeedback, ServiceRecord, DailyCallStats
 
 router = APIRouter()
 
@@ -91,67 +92,112 @@ async def get_dashboard_kpis(
     # Note: group_by parameter affects the aggregation period but for KPIs 
     # we still show totals - the grouping is more relevant for trends/charts
     
-    # 1. Total Call Minutes
-    total_minutes_result = await db.execute(
-        select(func.coalesce(func.sum(Call.duration_sec), 0))
-        .where(base_filter)
-    )
-    total_seconds = total_minutes_result.scalar() or 0
-    total_minutes = round(total_seconds / 60.0, 2)
-    
-    # 2. Total Calls
-    total_calls_result = await db.execute(
-        select(func.count(Call.id))
-        .where(base_filter)
-    )
-    total_calls = total_calls_result.scalar() or 0
+    if settings.ANALYTICS_USE_DAILY_ROLLUPS:
+        # 1-6 from the daily rollup in one grouped query
+        rollup_conditions = [
+            DailyCallStats.organization_id == organization.id,
+            DailyCallStats.day >= start_dt,
+            DailyCallStats.day <= end_dt
+        ]
+        if filter_type:
+            rollup_conditions.append(DailyCallStats.call_reason == filter_type)
+        
+        rollup_result = await db.execute(
+            select(
+                DailyCallStats.status,
+                DailyCallStats.direction,
+                func.sum(DailyCallStats.call_count).label('count'),
+                func.sum(DailyCallStats.total_duration_sec).label('seconds'),
+                func.sum(DailyCallStats.total_cost).label('cost'),
+                func.sum(DailyCallStats.nps_count).label('nps_count'),
+                func.sum(DailyCallStats.total_nps).label('nps_total')
+            )
+            .where(*rollup_conditions)
+            .group_by(DailyCallStats.status, DailyCallStats.direction)
+        )
+        
+        total_seconds = 0
+        total_calls = 0
+        total_spend = 0.0
+        nps_count = 0
+        nps_total = 0
+        call_status_breakdown = {}
+        call_types_breakdown = {}
+        for row in rollup_result:
+            total_seconds += row.seconds or 0
+            total_calls += row.count
+            total_spend += float(row.cost or 0)
+            nps_count += row.nps_count or 0
+            nps_total += row.nps_total or 0
+            call_status_breakdown[row.status] = call_status_breakdown.get(row.status, 0) + row.count
+            if row.direction:
+                direction = row.direction.title()
+                call_types_breakdown[direction] = call_types_breakdown.get(direction, 0) + row.count
+        
+        total_minutes = round(total_seconds / 60.0, 2)
+        average_nps = round(nps_total / nps_count, 1) if nps_count else None
+    else:
+        # 1. Total Call Minutes
+        total_minutes_result = await db.execute(
+            select(func.coalesce(func.sum(Call.duration_sec), 0))
+            .where(base_filter)
+        )
+        total_seconds = total_minutes_result.scalar() or 0
+        total_minutes = round(total_seconds / 60.0, 2)
     
-    # 3. Total Spend (cost)
-    total_spend_result = await db.execute(
-        select(func.coalesce(func.sum(Call.cost), 0))
-        .where(base_filter)
-    )
-    total_spend = float(total_spend_result.scalar() or 0)
+        # 2. Total Calls
+        total_calls_result = await db.execute(
+            select(func.count(Call.id))
+            .where(base_filter)
+        )
+        total_calls = total_calls_result.scalar() or 0
     
-    # 4. Average NPS Score
-    nps_result = await db.execute(
-        select(func.avg(Call.nps_score))
-        .where(
-            and_(
-                base_filter,
-                Call.nps_score.isnot(None)
+        # 3. Total Spend (cost)
+        total_spend_result = await db.execute(
+            select(func.coalesce(func.sum(Call.cost), 0))
+            .where(base_filter)
+        )
+        total_spend = float(total_spend_result.scalar() or 0)
+    
+        # 4. Average NPS Score
+        nps_result = await db.execute(
+            select(func.avg(Call.nps_score))
+            .where(
+                and_(
+                    base_filter,
+                    Call.nps_score.isnot(None)
+                )
             )
         )
-    )
-    average_nps = nps_result.scalar()
-    if average_nps is not None:
-        average_nps = round(float(average_nps), 1)
+        average_nps = nps_result.scalar()
+        if average_nps is not None:
+            average_nps = round(float(average_nps), 1)
     
-    # 5. Call Status Breakdown
-    status_breakdown_result = await db.execute(
-        select(
-            Call.status,
-            func.count(Call.id).label('count')
+        # 5. Call Status Breakdown
+        status_breakdown_result = await db.execute(
+            select(
+                Call.status,
+                func.count(Call.id).label('count')
+            )
+            .where(base_filter)
+            .group_by(Call.status)
         )
-        .where(base_filter)
-        .group_by(Call.status)
-    )
-    call_status_breakdown = {
-        row.status: row.count for row in status_breakdown_result
-    }
+        call_status_breakdown = {
+            row.status: row.count for row in status_breakdown_result
+        }
     
-    # 6. Call Types Breakdown (direction: inbound/outbound)
-    types_breakdown_result = await db.execute(
-        select(
-            Call.direction,
-            func.count(Call.id).label('count')
+        # 6. Call Types Breakdown (direction: inbound/outbound)
+        types_breakdown_result = await db.execute(
+            select(
+                Call.direction,
+                func.count(Call.id).label('count')
+            )
+            .where(base_filter)
+            .group_by(Call.direction)
         )
-        .where(base_filter)
-        .group_by(Call.direction)
-    )
-    call_types_breakdown = {
-        row.direction.title(): row.count for row in types_breakdown_result
-    }
+        call_types_breakdown = {
+            row.direction.title(): row.count for row in types_breakdown_result
+        }
     
     # 7. Cost by Category (based on call reason/service type)
     # First get cost by service type from service records
@@ -409,20 +455,40 @@ async def get_call_analysis_charts(
     # call-trends endpoint.
     
     # 1. Reason Call Ended Chart
-    reason_call_ended_result = await db.execute(
-        select(
-            Call.ended_reason,
-            func.count(Call.id).label('count')
+    if settings.ANALYTICS_USE_DAILY_ROLLUPS:
+        rollup_conditions = [
+            DailyCallStats.organization_id == organization.id,
+            DailyCallStats.day >= start_dt,
+            DailyCallStats.day <= end_dt,
+            DailyCallStats.ended_reason.isnot(None)
+        ]
+        if filter_type:
+            rollup_conditions.append(DailyCallStats.call_reason == filter_type)
+        
+        reason_call_ended_result = await db.execute(
+            select(
+                DailyCallStats.ended_reason,
+                func.sum(DailyCallStats.call_count).label('count')
+            )
+            .where(*rollup_conditions)
+            .group_by(DailyCallStats.ended_reason)
+            .order_by(func.sum(DailyCallStats.call_count).desc())
         )
-        .where(
-            and_(
-                base_filter,
-                Call.ended_reason.isnot(None)
+    else:
+        reason_call_ended_result = await db.execute(
+            select(
+                Call.ended_reason,
+                func.count(Call.id).label('count')
+            )
+            .where(
+                and_(
+                    base_filter,
+                    Call.ended_reason.isnot(None)
+                )
             )
+            .group_by(Call.ended_reason)
+            .order_by(func.count(Call.id).desc())
         )
-        .group_by(Call.ended_reason)
-        .order_by(func.count(Call.id).desc())
-    )
     
     reason_call_ended = []
     color_map = {
@@ -4,15 +4,20 @@ Public API endpoints for external DMS integration.
 
 from typing import Any, List, Optional
 from uuid import UUID
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_api_key_auth, get_api_key_organization, get_db
 from app.models import Organization, ApiKey, Call, ServiceRecord
 from app.schemas import FeedbackCallRequest, FeedbackCallResponse
+from app.services.call_export_service import CallExportService
 from app.services.call_service import CallService
-from app.core.rate_limiter import rate_limit_dependency
+from app.core.config import settings
+from app.core.pagination import set_next_cursor
+from app.core.rate_limiter import export_rate_limit_dependency, rate_limit_dependency
 
 router = APIRouter()
 
@@ -126,6 +131,66 @@ async def create_feedback_call_api(
         )
 
 
+@router.get("/calls/export")
+async def export_calls_api(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    updated_since: Optional[datetime] = Query(None, description="Only calls updated at or after this time (ISO 8601)"),
+    status: Optional[str] = Query(None, description="Filter by call status"),
+    include_transcripts: bool = Query(False, description="Include transcript messages"),
+    include_feedback: bool = Query(False, description="Include feedback mentions"),
+    organization: Organization = Depends(get_api_key_organization),
+    api_key: ApiKey = Depends(get_api_key_auth),
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(rate_limit_dependency),
+    _export_limit: None = Depends(export_rate_limit_dependency),
+) -> Any:
+    """
+    Stream every call of the organization as NDJSON or CSV.
+    
+    Calls are ordered by (updated_at, id) and streamed with chunked transfer
+    encoding. For incremental sync, pass the X-Sync-Watermark header of the
+    previous export as updated_since. The watermark lags the export by
+    PUBLIC_EXPORT_WATERMARK_OVERLAP_SECONDS, so consecutive exports overlap
+    and clients should dedupe rows on (id, updated_at).
+    
+    Args:
+        format: Export format (ndjson or csv)
+        updated_since: Only calls updated at or after this time
+        status: Filter by call status
+        include_transcripts: Include transcript messages
+        include_feedback: Include feedback mentions
+        organization: Organization from API key
+        api_key: Authenticated API key
+        db: Database session
+        
+    Returns:
+        StreamingResponse: Exported calls
+    """
+    # updated_at is a writer's transaction start time, so a transaction still in flight
+    # now can commit rows stamped before now(); the overlap lets the next sync see them
+    watermark = (await db.execute(
+        select(func.now() - timedelta(seconds=settings.PUBLIC_EXPORT_WATERMARK_OVERLAP_SECONDS))
+    )).scalar()
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        CallExportService.stream_export(
+            organization_id=organization.id,
+            export_format=format,
+            updated_since=updated_since,
+            status=status,
+            include_transcripts=include_transcripts,
+            include_feedback=include_feedback
+        ),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="calls.{format}"',
+            "X-Sync-Watermark": watermark.isoformat(),
+        }
+    )
+
+
 @router.get("/calls/{call_id}")
 async def get_call_api(
     call_id: int,
@@ -178,8 +243,10 @@ async def get_call_api(
 @router.get("/calls")
 async def list_calls_api(
     request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status: Optional[str] = Query(None, description="Filter by call status"),
     call_type: Optional[str] = Query(None, description="Filter by call type"),
     organization: Organization = Depends(get_api_key_organization),
@@ -188,10 +255,16 @@ async def list_calls_api(
     _: None = Depends(rate_limit_dependency),
 ) -> Any:
     """
-    List calls via API key authentication.
+    List calls via API key authentication, newest first.
+    
+    To walk the full history, follow the X-Next-Cursor response header:
+    pass it back as cursor until the header is absent. Each page costs the
+    same regardless of depth. skip is ignored when a cursor is given.
     
     Args:
+        response: Outgoing response (carries X-Next-Cursor)
         skip: Number of calls to skip
+        cursor: Keyset cursor from the previous page
         limit: Maximum number of calls to return
         status: Filter by call status
         call_type: Filter by call type
@@ -209,8 +282,10 @@ async def list_calls_api(
             limit=limit,
             status=status,
             call_type=call_type,
+            cursor=cursor,
             db=db
         )
+        set_next_cursor(response, calls, limit)
         
         return [
             {
@@ -227,6 +302,8 @@ async def list_calls_api(
             for call in calls
         ]
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
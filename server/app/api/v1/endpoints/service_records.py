@@ -5,9 +5,10 @@ Service record API endpoints.
 from typing import Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import set_next_cursor
 from app.dependencies import get_current_organization, get_current_user, get_tenant_db
 from app.models import Organization, User
 from app.schemas import ServiceRecordCreate, ServiceRecordResponse, ServiceRecordUpdate
@@ -18,8 +19,10 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ServiceRecordResponse])
 async def list_service_records(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status: Optional[str] = Query(None, description="Filter by service record status"),
     customer_name: Optional[str] = Query(None, description="Filter by customer name"),
     vehicle_make: Optional[str] = Query(None, description="Filter by vehicle make"),
@@ -27,10 +30,15 @@ async def list_service_records(
     db: AsyncSession = Depends(get_tenant_db),
 ) -> Any:
     """
-    List service records.
+    List service records, newest first.
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the next
+    page; skip is ignored when a cursor is given.
     
     Args:
+        response: Outgoing response (carries X-Next-Cursor)
         skip: Number of service records to skip
+        cursor: Keyset cursor from the previous page
         limit: Maximum number of service records to return
         status: Filter by service record status
         customer_name: Filter by customer name
@@ -48,8 +56,10 @@ async def list_service_records(
         status=status,
         customer_name=customer_name,
         vehicle_make=vehicle_make,
+        cursor=cursor,
         db=db
     )
+    set_next_cursor(response, service_records, limit)
     
     # Enhance service records with call information
     result = []
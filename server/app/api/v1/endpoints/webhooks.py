@@ -5,14 +5,15 @@ API endpoints for handling webhooks.
 from typing import Any, Dict
 import json
 import logging
-import os
-from datetime import datetime
-from pathlib import Path
 from fastapi import APIRouter, Depends, Request, HTTPException, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.webhook_archive import webhook_archive
 from app.dependencies import get_tenant_db, verify_vapi_secret
+from app.services.webhook_queue_service import WebhookQueueService
 from app.services.webhook_service import WebhookService
+from app.webhook_consumer import webhook_consumer
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -40,7 +41,8 @@ async def vapi_webhook(
 
         # Parse request body
         body_json = await request.json()
-        logger.info(f"Webhook payload received: {json.dumps(body_json, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Webhook payload received: {json.dumps(body_json)}")
 
         # Extract the message from the webhook payload
         # For status-update events, the structure is { "message": { "type": "status-update", ... } }
@@ -58,28 +60,20 @@ async def vapi_webhook(
             
             logger.info(f"Processing direct event type: {message_type}")
 
-        # Save the webhook payload to a JSON file for reference
-        try:
-            # Create guides directory if it doesn't exist
-            guides_dir = Path("guides")
-            guides_dir.mkdir(exist_ok=True)
-            
-            # Generate timestamp
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            
-            # Create filename based on event type and timestamp
-            filename = f"{message_type or 'unknown'}-{timestamp}.json"
-            filepath = guides_dir / filename
-            
-            # Write the payload to the file
-            with open(filepath, "w") as f:
-                json.dump(body_json, f, indent=2)
-                
-            logger.info(f"Saved webhook payload to {filepath}")
-        except Exception as e:
-            logger.error(f"Failed to save webhook payload: {str(e)}")
-
-        # Process the message using the webhook service
+        # Hand the raw payload to the background archive (no-op when disabled)
+        webhook_archive.submit(message_type, body_json)
+
+        # Store the event and acknowledge immediately; consumers process it in the background
+        if settings.WEBHOOK_ASYNC_PROCESSING:
+            event = await WebhookQueueService.enqueue(message, message_type, db)
+            webhook_consumer.notify()
+            return {
+                "status": "accepted",
+                "message": "Webhook queued for processing",
+                "event_id": event.id
+            }
+
+        # Process the message inline using the webhook service
         webhook_service = WebhookService()
         result = await webhook_service.process_webhook_data(message, db)
         
@@ -92,4 +86,22 @@ async def vapi_webhook(
         raise HTTPException(
             status_code=500,
             detail=f"Error processing webhook: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+@router.get("/queue-stats")
+async def webhook_queue_stats(
+    db: AsyncSession = Depends(get_tenant_db),
+    _: str = Depends(verify_vapi_secret)
+) -> Any:
+    """
+    Webhook inbox depth and lag metrics.
+
+    Args:
+        db: Database session
+        _: Verified VAPI secret token
+
+    Returns:
+        Dict: Queue depth by status and lag of the oldest unprocessed event
+    """
+    return await WebhookQueueService.get_queue_stats(db)
@@ -2,17 +2,21 @@
 Call Initiator Worker - Process service records and calls for each organization.
 """
 
+import argparse
 import asyncio
 import logging
 import sys
-from datetime import datetime, time
-from zoneinfo import ZoneInfo
+import time
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, update, func
 from sqlalchemy.orm import joinedload
 
+from app.core.config import settings
 from app.core.database import get_engine, async_session_factory
-from app.models import Organization, ServiceRecord, Call, ScheduleConfig
+from app.core.schedule_index import schedule_window_index
+from app.models import Organization, ServiceRecord, Call
+from app.services.call_lease_service import CallLeaseService
 from app.services.vapi_service import VAPIService
 
 # Configure logging
@@ -30,6 +34,13 @@ logger = logging.getLogger(__name__)
 class CallInitiatorWorker:
     """Worker to process service records and calls for each organization."""
     
+    def __init__(self):
+        self.worker_id = CallLeaseService.generate_owner_id()
+        # Per-organization dial timers (monotonic seconds); entries are dropped once due
+        self._org_next_dial_at: Dict[Any, float] = {}
+        self._stop_event = asyncio.Event()
+        self._dial_semaphore = asyncio.Semaphore(settings.CALL_INITIATOR_MAX_CONCURRENT_DIALS)
+    
     async def _get_db_session(self) -> AsyncSession:
         """Get a database session."""
         engine = get_engine()
@@ -42,16 +53,19 @@ class CallInitiatorWorker:
         
         try:
             async with await self._get_db_session() as db:
+                await self._reclaim_expired_leases(db)
+                
                 # Check current "In Progress" calls count
-                in_progress_count = await self._get_in_progress_calls_count(db)
-                print(f"📊 Current 'In Progress' calls: {in_progress_count}")
+                in_progress_count = sum((await self._get_in_progress_counts_by_organization(db)).values())
+                global_limit = settings.CALL_INITIATOR_GLOBAL_CONCURRENCY_LIMIT
+                print(f"📊 Current 'In Progress' calls: {in_progress_count}/{global_limit}")
                 
-                if in_progress_count > 5:
-                    print("⚠️  Too many concurrent calls (>5). Holding service and waiting for next run.")
+                if in_progress_count >= global_limit:
+                    print(f"⚠️  Global concurrency limit reached ({global_limit}). Holding service and waiting for next run.")
                     return
                 
-                # If In Progress calls <= 5, proceed with processing
-                if in_progress_count <= 5:
+                # Capacity available, proceed with processing
+                if in_progress_count < global_limit:
                     # First, queue calls for organizations
                     await self._queue_calls_for_organizations(db)
                     
@@ -64,324 +78,217 @@ class CallInitiatorWorker:
         finally:
             print("✅ Worker completed")
     
-    async def _get_in_progress_calls_count(self, db: AsyncSession) -> int:
-        """Get the count of calls with 'In Progress' status."""
+    async def _get_in_progress_counts_by_organization(self, db: AsyncSession) -> Dict[Any, int]:
+        """Get the number of 'In Progress' calls per organization in one grouped query."""
         try:
             result = await db.execute(
-                select(func.count(Call.id)).where(Call.status == "In Progress")
+                select(Call.organization_id, func.count(Call.id))
+                .where(Call.status == "In Progress")
+                .group_by(Call.organization_id)
             )
-            return result.scalar() or 0
+            return {org_id: count for org_id, count in result.all()}
         except Exception as e:
             logger.error(f"❌ Error getting in progress calls count: {str(e)}")
-            return 0
-    
-    async def _is_organization_in_time_window(self, org_id, org_name: str, db: AsyncSession) -> bool:
-        """Check if organization is in active time window based on schedule config."""
-        try:
-            # Get schedule configuration for the organization
-            schedule_query = select(ScheduleConfig).where(
-                and_(
-                    ScheduleConfig.organization_id == org_id,
-                    ScheduleConfig.campaign_id.is_(None)  # Org-wide config
-                )
-            )
-            schedule_result = await db.execute(schedule_query)
-            schedule_config = schedule_result.scalar_one_or_none()
-            
-            if not schedule_config:
-                print(f"   📅 No schedule config found for {org_name} - returning False")
-                return False
-            
-            config = schedule_config.config_json
-            
-            # Check if auto_call_enabled is true
-            if not config.get("auto_call_enabled", False):
-                print(f"   🚫 Auto call is disabled for {org_name}")
-                return False
-            
-            # Get current time in organization's timezone
-            timezone_str = config.get("timezone", "UTC")
-            try:
-                tz = ZoneInfo(timezone_str)
-            except Exception:
-                print(f"   ⚠️  Invalid timezone {timezone_str} for {org_name}, using UTC")
-                tz = ZoneInfo("UTC")
-            
-            current_time = datetime.now(tz)
-            
-            # Check if current day is in active days
-            current_day = current_time.strftime("%A").lower()
-            active_days = config.get("active_days", [])
-            
-            if current_day not in active_days:
-                print(f"   📅 {org_name} not active on {current_day} (active days: {active_days})")
-                return False
-            
-            # Check if current time is within active hours
-            start_time_str = config.get("start_time", "00:00")
-            end_time_str = config.get("end_time", "23:59")
-            
-            try:
-                start_time = datetime.strptime(start_time_str, "%H:%M").time()
-                end_time = datetime.strptime(end_time_str, "%H:%M").time()
-                current_time_only = current_time.time()
-                
-                # Handle time ranges that span midnight
-                if start_time <= end_time:
-                    # Normal range (e.g., 09:00 to 17:00)
-                    in_time_window = start_time <= current_time_only <= end_time
-                else:
-                    # Spans midnight (e.g., 22:00 to 06:00)
-                    in_time_window = current_time_only >= start_time or current_time_only <= end_time
-                
-                if in_time_window:
-                    print(f"   ✅ {org_name} is in active time window ({start_time_str} - {end_time_str})")
-                    return True
-                else:
-                    print(f"   ⏰ {org_name} not in active time window ({start_time_str} - {end_time_str})")
-                    return False
-                    
-            except ValueError as e:
-                print(f"   ⚠️  Invalid time format in schedule config for {org_name}: {e}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"❌ Error checking time window for {org_name}: {str(e)}")
-            return False
+            return {}
     
     async def _queue_calls_for_organizations(self, db: AsyncSession):
         """Queue calls for all organizations that are in active time window."""
         print("🔄 Queuing calls for organizations...")
         
-        try:
-            # Get all organizations
-            result = await db.execute(select(Organization.name, Organization.id))
-            organizations = result.fetchall()
-            
-            print("📋 All Organizations:")
-            if organizations:
-                for i, (org_name, org_id) in enumerate(organizations, 1):
-                    print(f"   {i}. {org_name} - ID: {org_id}")
-                    
-                    # Check if organization is in active time window
-                    if await self._is_organization_in_time_window(org_id, org_name, db):
-                        # Queue call for this organization
-                        await self._queue_call_for_organization(org_id, org_name, db)
-                    else:
-                        print(f"   ⏰ Organization {org_name} is not in active time window - skipping calls")
-            else:
-                print("   No organizations found.")
-                
-        except Exception as e:
-            logger.error(f"❌ Error queuing calls for organizations: {str(e)}")
+        stats = await self._queue_calls_for_organizations_with_stats(db)
+        
+        print(
+            f"   📋 {stats['organizations_processed']}/{stats['total_organizations']} organizations in active time window, "
+            f"{stats['calls_queued']} calls queued"
+        )
     
-    async def _queue_call_for_organization(self, org_id, org_name: str, db: AsyncSession):
-        """Queue a call for a specific organization."""
-        print(f"🔄 Queuing call for organization: {org_name}")
+    async def _process_queued_calls(self, db: AsyncSession):
+        """Process queued calls by changing their status to 'In Progress' and triggering VAPI calls."""
+        print("🔄 Processing queued calls...")
         
-        try:
-            # Check if we already have a "Queued" call for this organization
-            queued_call_query = select(Call).join(Call.service_record).where(
-                and_(
-                    ServiceRecord.organization_id == org_id,
-                    Call.status == "Queued"
-                )
-            )
-            queued_result = await db.execute(queued_call_query)
-            queued_call = queued_result.scalar_one_or_none()
-            
-            if queued_call:
-                print(f"   ⏳ Organization {org_name} already has a queued call - skipping")
-                return
-            
-            # Find service records with "Ready" status for this organization
-            service_records_query = select(ServiceRecord).where(
-                and_(
-                    ServiceRecord.organization_id == org_id,
-                    ServiceRecord.status == "Ready"
-                )
-            ).options(joinedload(ServiceRecord.calls))
-            
-            service_records_result = await db.execute(service_records_query)
-            ready_service_records = service_records_result.unique().scalars().all()
-            
-            if not ready_service_records:
-                print(f"   ⏭️  No ready service records found for {org_name}")
-                return
-            
-            print(f"   📋 Found {len(ready_service_records)} ready service records")
-            
-            # Take the first ready service record and queue its call
-            first_service_record = ready_service_records[0]
-            await self._queue_service_record_call(first_service_record, org_name, db)
-                
-        except Exception as e:
-            logger.error(f"❌ Error queuing call for organization {org_name}: {str(e)}")
+        stats = await self._process_queued_calls_with_stats(db)
+        
+        if stats["calls_processed"]:
+            print(f"   ✅ Dispatched {stats['calls_processed']} queued calls")
+        else:
+            print("   ⏭️  No queued calls dispatched")
     
-    async def _process_organization(self, org_id, org_name: str, db: AsyncSession):
-        """Process service records and calls for a specific organization."""
-        print(f"🔄 Processing organization: {org_name}")
+    def _select_calls_to_dial(
+        self,
+        queued_calls: List[Call],
+        in_progress_by_org: Dict[Any, int],
+        available_slots: int
+    ) -> List[Call]:
+        """
+        Pick queued calls that fit both the global and per-organization limits.
         
-        try:
-            # Check if we already have a "Queued" call for this organization
-            queued_call_query = select(Call).join(Call.service_record).where(
-                and_(
-                    ServiceRecord.organization_id == org_id,
-                    Call.status == "Queued"
-                )
-            )
-            queued_result = await db.execute(queued_call_query)
-            queued_call = queued_result.scalar_one_or_none()
-            
-            if queued_call:
-                print(f"   ⏳ Organization {org_name} already has a queued call - skipping")
-                return
-            
-            # Find service records with "Ready" status for this organization
-            service_records_query = select(ServiceRecord).where(
-                and_(
-                    ServiceRecord.organization_id == org_id,
-                    ServiceRecord.status == "Ready"
-                )
-            ).options(joinedload(ServiceRecord.calls))
-            
-            service_records_result = await db.execute(service_records_query)
-            ready_service_records = service_records_result.unique().scalars().all()
-            
-            if not ready_service_records:
-                print(f"   ⏭️  No ready service records found for {org_name}")
-                return
-            
-            print(f"   📋 Found {len(ready_service_records)} ready service records")
-            
-            # Take the first ready service record and queue its call
-            first_service_record = ready_service_records[0]
-            await self._queue_service_record_call(first_service_record, org_name, db)
-                
-        except Exception as e:
-            logger.error(f"❌ Error processing organization {org_name}: {str(e)}")
+        Organizations with the fewest calls in flight are served first so one
+        large tenant cannot starve the rest. An organization whose dial timer
+        has elapsed gets as many calls as it has free slots under
+        Organization.call_concurrency_limit (a limit of 0 pauses it). The
+        timer itself only moves once a dial succeeds (see _dispatch_calls).
+        """
+        now = time.monotonic()
+        selected: List[Call] = []
+        selected_by_org: Dict[Any, int] = {}
+        
+        # Forget timers that have already elapsed
+        for org_id in [org_id for org_id, due in self._org_next_dial_at.items() if due <= now]:
+            del self._org_next_dial_at[org_id]
+        
+        ordered_calls = sorted(
+            queued_calls,
+            key=lambda queued: in_progress_by_org.get(queued.organization_id, 0)
+        )
+        
+        for call in ordered_calls:
+            if len(selected) >= available_slots:
+                break
+            
+            org_id = call.organization_id
+            if self._org_next_dial_at.get(org_id, 0) > now:
+                continue
+            
+            limit = call.organization.call_concurrency_limit
+            org_limit = 1 if limit is None else limit
+            in_flight = in_progress_by_org.get(org_id, 0) + selected_by_org.get(org_id, 0)
+            if in_flight >= org_limit:
+                continue
+            
+            selected_by_org[org_id] = selected_by_org.get(org_id, 0) + 1
+            selected.append(call)
+        
+        return selected
     
-    async def _queue_service_record_call(self, service_record: ServiceRecord, org_name: str, db: AsyncSession):
-        """Queue a call for a service record by changing its status to 'Queued'."""
-        print(f"   📞 Queuing call for service record {service_record.id} - {service_record.customer_name}")
+    async def _dispatch_calls(self, calls: List[Call], db: AsyncSession) -> int:
+        """
+        Lease calls and move them to 'In Progress' in a single commit, then dial them concurrently.
+        
+        Calls another worker claimed first are dropped. Leases are kept alive
+        by a heartbeat while VAPI requests are in flight. Each dial is marked
+        attempted before its request is sent and recorded as soon as VAPI
+        accepts it, each in its own commit (see _trigger_vapi_call), so an
+        expired lease never puts a dialed call back in the queue. A request
+        that raises marks its call 'Failed'. Remaining leases are released
+        once every request has returned, settling any call still 'In Progress'
+        (see CallLeaseService.release_calls). Only organizations with a call VAPI
+        accepted wait CALL_INITIATOR_DIAL_INTERVAL_SECONDS for their next dial
+        (no wait when it is 0).
+        
+        Returns:
+            Number of calls for which VAPI accepted the request
+        """
+        claimed_ids = await CallLeaseService.claim_calls(
+            call_ids=[call.id for call in calls],
+            owner=self.worker_id,
+            db=db
+        )
+        await db.commit()
+        
+        claimed_set = set(claimed_ids)
+        claimed_calls = [call for call in calls if call.id in claimed_set]
         
+        if len(claimed_calls) < len(calls):
+            print(f"   ⏭️  {len(calls) - len(claimed_calls)} calls already claimed by another worker")
+        
+        if not claimed_calls:
+            return 0
+        
+        heartbeat_task = asyncio.create_task(self._heartbeat_leases(claimed_ids))
         try:
-            # Find the associated call with "Ready" status
-            call_query = select(Call).where(
-                and_(
-                    Call.service_record_id == service_record.id,
-                    Call.status == "Ready"
-                )
+            results = await asyncio.gather(
+                *(self._trigger_vapi_call(call, call.service_record, call.organization) for call in claimed_calls)
             )
-            call_result = await db.execute(call_query)
-            call = call_result.scalar_one_or_none()
-            
-            if not call:
-                print(f"      ⚠️  No ready call found for service record {service_record.id}")
-                return
-            
-            # Update call status to "Queued"
-            call.status = "Queued"
-            
-            # Commit the status change
-            await db.commit()
-            
-            print(f"      ✅ Queued call {call.id} for service record {service_record.id}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error queuing call for service record {service_record.id}: {str(e)}")
-            await db.rollback()
-    
-    async def _process_queued_calls(self, db: AsyncSession):
-        """Process queued calls by changing their status to 'In Progress' and triggering VAPI calls."""
-        print("🔄 Processing queued calls...")
+        finally:
+            heartbeat_task.cancel()
+            try:
+                await heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            await CallLeaseService.release_calls(claimed_ids, self.worker_id, db)
         
-        try:
-            # Get current "In Progress" calls count
-            in_progress_count = await self._get_in_progress_calls_count(db)
-            available_slots = 5 - in_progress_count
-            
-            if available_slots <= 0:
-                print("⚠️  No available slots for processing queued calls")
-                return
-            
-            # Find queued calls
-            queued_calls_query = select(Call).join(Call.service_record).join(Call.organization).where(
-                Call.status == "Queued"
-            ).options(joinedload(Call.service_record), joinedload(Call.organization))
-            
-            queued_calls_result = await db.execute(queued_calls_query)
-            queued_calls = queued_calls_result.unique().scalars().all()
-            
-            if not queued_calls:
-                print("   ⏭️  No queued calls found")
-                return
-            
-            print(f"   📋 Found {len(queued_calls)} queued calls")
-            
-            # Process up to available_slots queued calls
-            calls_to_process = queued_calls[:available_slots]
-            
-            for call in calls_to_process:
-                await self._process_queued_call(call, db)
-                
-                # Add 3-minute delay between calls (except for the last one)
-                if call != calls_to_process[-1]:
-                    print(f"   ⏳ Waiting 3 minutes before next call...")
-                    await asyncio.sleep(180)  # 3 minutes = 180 seconds
-                
-        except Exception as e:
-            logger.error(f"❌ Error processing queued calls: {str(e)}")
+        if settings.CALL_INITIATOR_DIAL_INTERVAL_SECONDS > 0:
+            next_dial_at = time.monotonic() + settings.CALL_INITIATOR_DIAL_INTERVAL_SECONDS
+            for call, initiated in zip(claimed_calls, results):
+                if initiated:
+                    self._org_next_dial_at[call.organization_id] = next_dial_at
+        
+        return sum(1 for initiated in results if initiated)
     
-    async def _process_queued_call(self, call: Call, db: AsyncSession):
-        """Process a single queued call by changing status to 'In Progress' and triggering VAPI call."""
-        print(f"   📞 Processing queued call {call.id} for {call.service_record.customer_name}")
+    async def _heartbeat_leases(self, call_ids: List[int]):
+        """Keep leases on in-flight calls alive until cancelled."""
+        interval = max(settings.CALL_INITIATOR_LEASE_SECONDS / 3, 1)
         
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with await self._get_db_session() as heartbeat_db:
+                    await CallLeaseService.heartbeat(call_ids, self.worker_id, heartbeat_db)
+            except Exception as e:
+                logger.error(f"❌ Error extending call leases: {str(e)}")
+    
+    async def _reclaim_expired_leases(self, db: AsyncSession):
+        """Put calls abandoned mid-dispatch by a dead worker back in the queue."""
         try:
-            # Update service record status to "In Progress"
-            call.service_record.status = "In Progress"
-            
-            # Update call status to "In Progress"
-            call.status = "In Progress"
-            
-            # Commit the status changes
-            await db.commit()
-            
-            print(f"      ✅ Updated status to 'In Progress' for service record {call.service_record.id} and call {call.id}")
-            
-            # Trigger VAPI call
-            await self._trigger_vapi_call(call, call.service_record, call.organization)
-            
+            reclaimed = await CallLeaseService.reclaim_expired_leases(db)
+            if reclaimed:
+                print(f"♻️  Returned {reclaimed} calls with expired leases to the queue")
         except Exception as e:
-            logger.error(f"❌ Error processing queued call {call.id}: {str(e)}")
+            logger.error(f"❌ Error reclaiming expired call leases: {str(e)}")
             await db.rollback()
     
-    async def _trigger_vapi_call(self, call: Call, service_record: ServiceRecord, organization: Organization):
+    async def _trigger_vapi_call(self, call: Call, service_record: ServiceRecord, organization: Organization) -> bool:
         """Trigger VAPI call for the given call and service record."""
-        try:
-            print(f"      📞 Triggering VAPI call for {service_record.customer_name}")
-            
-            # Get location from organization - prefer location_city, fallback to location, then default
-            location = organization.location_city or organization.location or "Main Location"
-            
-            # Initialize VAPI service
-            vapi_service = VAPIService()
+        async with self._dial_semaphore:
+            try:
+                # Past this commit the call is never re-queued, even if this worker dies
+                async with await self._get_db_session() as dial_db:
+                    if not await CallLeaseService.mark_dial_attempted(call.id, self.worker_id, dial_db):
+                        print(f"      ⏭️  Lease on call {call.id} lost before dialing")
+                        return False
+            except Exception as e:
+                logger.error(f"❌ Failed to mark call {call.id} as dialed: {str(e)}")
+                return False
             
-            # Make the VAPI call
-            vapi_response = await vapi_service.create_call(
-                phone=service_record.customer_phone,
-                customer_name=service_record.customer_name,
-                service_advisor_name=service_record.service_advisor_name or "Service Advisor",
-                service_type=service_record.service_type or "Service Call",
-                organization_name=organization.name,
-                location=location,
-                call_id=call.id
-            )
+            try:
+                print(f"      📞 Triggering VAPI call for {service_record.customer_name}")
+                
+                # Get location from organization - prefer location_city, fallback to location, then default
+                location = organization.location_city or organization.location or "Main Location"
+                
+                # Initialize VAPI service
+                vapi_service = VAPIService()
+                
+                # Make the VAPI call
+                vapi_response = await vapi_service.create_call(
+                    phone=service_record.customer_phone,
+                    customer_name=service_record.customer_name,
+                    service_advisor_name=service_record.service_advisor_name or "Service Advisor",
+                    service_type=service_record.service_type or "Service Call",
+                    organization_name=organization.name,
+                    location=location,
+                    call_id=call.id
+                )
+                
+                print(f"      ✅ VAPI call initiated successfully. VAPI ID: {vapi_response.get('id', 'N/A')}")
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to trigger VAPI call for call {call.id}: {str(e)}")
+                # Settle the call under its lease; release_calls catches it if this fails too
+                try:
+                    async with await self._get_db_session() as dial_db:
+                        await CallLeaseService.fail_dial(call.id, self.worker_id, dial_db)
+                except Exception as fail_error:
+                    logger.error(f"❌ Failed to mark call {call.id} Failed: {str(fail_error)}")
+                return False
             
-            print(f"      ✅ VAPI call initiated successfully. VAPI ID: {vapi_response.get('id', 'N/A')}")
+            try:
+                async with await self._get_db_session() as dial_db:
+                    await CallLeaseService.record_dial(call.id, self.worker_id, vapi_response.get("id"), dial_db)
+            except Exception as e:
+                logger.error(f"❌ Failed to record VAPI call for call {call.id}: {str(e)}")
             
-        except Exception as e:
-            logger.error(f"❌ Failed to trigger VAPI call for call {call.id}: {str(e)}")
+            return True
     
     async def run_single_cycle(self) -> dict:
         """
@@ -394,9 +301,12 @@ class CallInitiatorWorker:
         
         try:
             async with await self._get_db_session() as db:
+                await self._reclaim_expired_leases(db)
+                
                 # Check current "In Progress" calls count
-                in_progress_count = await self._get_in_progress_calls_count(db)
-                print(f"📊 Current 'In Progress' calls: {in_progress_count}")
+                in_progress_count = sum((await self._get_in_progress_counts_by_organization(db)).values())
+                global_limit = settings.CALL_INITIATOR_GLOBAL_CONCURRENCY_LIMIT
+                print(f"📊 Current 'In Progress' calls: {in_progress_count}/{global_limit}")
                 
                 stats = {
                     "total_organizations": 0,
@@ -407,12 +317,12 @@ class CallInitiatorWorker:
                     "calls_queued": 0
                 }
                 
-                if in_progress_count > 5:
-                    print("⚠️  Too many concurrent calls (>5). Holding service and waiting for next run.")
+                if in_progress_count >= global_limit:
+                    print(f"⚠️  Global concurrency limit reached ({global_limit}). Holding service and waiting for next run.")
                     return stats
                 
-                # If In Progress calls <= 5, proceed with processing
-                if in_progress_count <= 5:
+                # Capacity available, proceed with processing
+                if in_progress_count < global_limit:
                     # First, queue calls for organizations
                     queue_stats = await self._queue_calls_for_organizations_with_stats(db)
                     stats.update(queue_stats)
@@ -440,148 +350,89 @@ class CallInitiatorWorker:
         }
         
         try:
-            # Get all organizations
-            result = await db.execute(select(Organization.name, Organization.id))
-            organizations = result.fetchall()
-            stats["total_organizations"] = len(organizations)
+            total_result = await db.execute(select(func.count(Organization.id)))
+            stats["total_organizations"] = total_result.scalar() or 0
             
-            if organizations:
-                for org_name, org_id in organizations:
-                    # Check if organization is in active time window
-                    if await self._is_organization_in_time_window(org_id, org_name, db):
-                        # Queue call for this organization
-                        org_stats = await self._queue_call_for_organization_with_stats(org_id, org_name, db)
-                        stats["organizations_processed"] += 1
-                        stats["calls_queued"] += org_stats.get("calls_queued", 0)
-                    else:
-                        stats["calls_skipped"] += 1
-                        
+            open_org_ids = list(await schedule_window_index.get_open_organization_ids(db))
+            stats["organizations_processed"] = len(open_org_ids)
+            stats["calls_skipped"] = stats["total_organizations"] - len(open_org_ids)
+            
+            if open_org_ids:
+                queued = await self._queue_next_ready_calls(open_org_ids, db)
+                stats["calls_queued"] = len(queued)
+                
         except Exception as e:
             logger.error(f"❌ Error queuing calls for organizations: {str(e)}")
+            await db.rollback()
         
         return stats
     
-    async def _queue_call_for_organization_with_stats(self, org_id, org_name: str, db: AsyncSession) -> dict:
-        """Queue a call for a specific organization and return statistics."""
-        stats = {
-            "calls_queued": 0
-        }
+    async def _queue_next_ready_calls(self, org_ids: List[Any], db: AsyncSession) -> List[Any]:
+        """
+        Queue the next Ready calls for every given organization in one statement.
         
-        try:
-            # Check if we already have a "Queued" call for this organization
-            queued_call_query = select(Call).join(Call.service_record).where(
+        Each organization gets as many calls as it has free capacity: its
+        call_concurrency_limit minus the calls it already has Queued or In
+        Progress. Within an organization the oldest Ready service record is
+        picked first.
+        
+        Returns:
+            (call_id, organization_id) rows for the calls that were queued
+        """
+        active_calls = (
+            select(Call.organization_id, func.count(Call.id).label("active"))
+            .where(
                 and_(
-                    ServiceRecord.organization_id == org_id,
-                    Call.status == "Queued"
+                    Call.organization_id.in_(org_ids),
+                    Call.status.in_(["Queued", "In Progress"])
                 )
             )
-            queued_result = await db.execute(queued_call_query)
-            queued_call = queued_result.scalar_one_or_none()
-            
-            if queued_call:
-                return stats
-            
-            # Find service records with "Ready" status for this organization
-            service_records_query = select(ServiceRecord).where(
-                and_(
-                    ServiceRecord.organization_id == org_id,
-                    ServiceRecord.status == "Ready"
-                )
-            ).options(joinedload(ServiceRecord.calls))
-            
-            service_records_result = await db.execute(service_records_query)
-            ready_service_records = service_records_result.unique().scalars().all()
-            
-            if not ready_service_records:
-                return stats
-            
-            # Take the first ready service record and queue its call
-            first_service_record = ready_service_records[0]
-            call_queued = await self._queue_service_record_call_with_stats(first_service_record, org_name, db)
-            if call_queued:
-                stats["calls_queued"] += 1
-                
-        except Exception as e:
-            logger.error(f"❌ Error queuing call for organization {org_name}: {str(e)}")
+            .group_by(Call.organization_id)
+            .subquery("active_calls")
+        )
         
-        return stats
-    
-    async def _process_organization_with_stats(self, org_id, org_name: str, db: AsyncSession) -> dict:
-        """Process organization and return statistics."""
-        stats = {
-            "calls_processed": 0,
-            "calls_initiated": 0,
-            "calls_skipped": 0,
-            "calls_queued": 0
-        }
-        
-        try:
-            # Check if we already have a "Queued" call for this organization
-            queued_call_query = select(Call).join(Call.service_record).where(
-                and_(
-                    ServiceRecord.organization_id == org_id,
-                    Call.status == "Queued"
-                )
+        ranked_ready_calls = (
+            select(
+                Call.id.label("call_id"),
+                func.row_number().over(
+                    partition_by=Call.organization_id,
+                    order_by=(ServiceRecord.created_at, Call.id)
+                ).label("position"),
+                (
+                    func.coalesce(Organization.call_concurrency_limit, 1)
+                    - func.coalesce(active_calls.c.active, 0)
+                ).label("free_slots")
             )
-            queued_result = await db.execute(queued_call_query)
-            queued_call = queued_result.scalar_one_or_none()
-            
-            if queued_call:
-                return stats
-            
-            # Find service records with "Ready" status for this organization
-            service_records_query = select(ServiceRecord).where(
+            .join(ServiceRecord, Call.service_record_id == ServiceRecord.id)
+            .join(Organization, Call.organization_id == Organization.id)
+            .outerjoin(active_calls, active_calls.c.organization_id == Call.organization_id)
+            .where(
                 and_(
-                    ServiceRecord.organization_id == org_id,
+                    Call.organization_id.in_(org_ids),
+                    Call.status == "Ready",
                     ServiceRecord.status == "Ready"
                 )
-            ).options(joinedload(ServiceRecord.calls))
-            
-            service_records_result = await db.execute(service_records_query)
-            ready_service_records = service_records_result.unique().scalars().all()
-            
-            if not ready_service_records:
-                return stats
-            
-            # Take the first ready service record and queue its call
-            first_service_record = ready_service_records[0]
-            call_queued = await self._queue_service_record_call_with_stats(first_service_record, org_name, db)
-            if call_queued:
-                stats["calls_queued"] += 1
-                
-        except Exception as e:
-            logger.error(f"❌ Error processing organization {org_name}: {str(e)}")
+            )
+            .cte("ranked_ready_calls")
+        )
         
-        return stats
-    
-    async def _queue_service_record_call_with_stats(self, service_record: ServiceRecord, org_name: str, db: AsyncSession) -> bool:
-        """Queue a call for a service record and return whether it was queued successfully."""
-        try:
-            # Find the associated call with "Ready" status
-            call_query = select(Call).where(
+        result = await db.execute(
+            update(Call)
+            .where(
                 and_(
-                    Call.service_record_id == service_record.id,
-                    Call.status == "Ready"
+                    Call.id == ranked_ready_calls.c.call_id,
+                    ranked_ready_calls.c.position <= ranked_ready_calls.c.free_slots,
+                    Call.status == "Ready"  # Re-checked under the row lock
                 )
             )
-            call_result = await db.execute(call_query)
-            call = call_result.scalar_one_or_none()
-            
-            if not call:
-                return False
-            
-            # Update call status to "Queued"
-            call.status = "Queued"
-            
-            # Commit the status change
-            await db.commit()
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Error queuing call for service record {service_record.id}: {str(e)}")
-            await db.rollback()
-            return False
+            .values(status="Queued")
+            .returning(Call.id, Call.organization_id)
+            .execution_options(synchronize_session=False)
+        )
+        queued = result.all()
+        await db.commit()
+        
+        return queued
     
     async def _process_queued_calls_with_stats(self, db: AsyncSession) -> dict:
         """Process queued calls and return statistics."""
@@ -593,9 +444,11 @@ class CallInitiatorWorker:
         }
         
         try:
-            # Get current "In Progress" calls count
-            in_progress_count = await self._get_in_progress_calls_count(db)
-            available_slots = 5 - in_progress_count
+            # Per-tenant slot accounting, bounded by the global ceiling
+            in_progress_by_org = await self._get_in_progress_counts_by_organization(db)
+            available_slots = (
+                settings.CALL_INITIATOR_GLOBAL_CONCURRENCY_LIMIT - sum(in_progress_by_org.values())
+            )
             
             if available_slots <= 0:
                 return stats
@@ -611,56 +464,80 @@ class CallInitiatorWorker:
             if not queued_calls:
                 return stats
             
-            # Process up to available_slots queued calls
-            calls_to_process = queued_calls[:available_slots]
+            # Pace per organization instead of sleeping between dials
+            calls_to_process = self._select_calls_to_dial(queued_calls, in_progress_by_org, available_slots)
+            stats["calls_skipped"] += len(queued_calls) - len(calls_to_process)
             
-            for call in calls_to_process:
-                call_processed = await self._process_queued_call_with_stats(call, db)
-                if call_processed:
-                    stats["calls_processed"] += 1
-                    stats["calls_initiated"] += 1
-                
-                # Add 3-minute delay between calls (except for the last one)
-                if call != calls_to_process[-1]:
-                    await asyncio.sleep(180)  # 3 minutes = 180 seconds
+            if not calls_to_process:
+                return stats
+            
+            stats["calls_processed"] = len(calls_to_process)
+            stats["calls_initiated"] = await self._dispatch_calls(calls_to_process, db)
                 
         except Exception as e:
             logger.error(f"❌ Error processing queued calls: {str(e)}")
+            await db.rollback()
         
         return stats
     
-    async def _process_queued_call_with_stats(self, call: Call, db: AsyncSession) -> bool:
-        """Process a single queued call and return whether it was processed successfully."""
-        try:
-            # Update service record status to "In Progress"
-            call.service_record.status = "In Progress"
-            
-            # Update call status to "In Progress"
-            call.status = "In Progress"
-            
-            # Commit the status changes
-            await db.commit()
-            
-            # Trigger VAPI call
-            await self._trigger_vapi_call(call, call.service_record, call.organization)
-            
-            return True
+    def _seconds_until_next_dial(self, poll_interval: float) -> float:
+        """Sleep until the next organization timer is due, capped at the poll interval."""
+        now = time.monotonic()
+        pending = [due - now for due in self._org_next_dial_at.values() if due > now]
+        return min([poll_interval, *pending])
+    
+    async def run_forever(self, poll_interval: Optional[float] = None):
+        """
+        Run the worker as a long-lived scheduler loop.
+        
+        Each tick runs one non-blocking cycle; dial pacing is handled by
+        per-organization timers, so the loop never holds a DB session while
+        waiting.
+        
+        Args:
+            poll_interval: Seconds between cycles (defaults to CALL_INITIATOR_POLL_INTERVAL_SECONDS)
+        """
+        poll_interval = poll_interval or settings.CALL_INITIATOR_POLL_INTERVAL_SECONDS
+        print(f"🚀 Call Initiator dispatcher starting (poll every {poll_interval}s)...")
+        
+        while not self._stop_event.is_set():
+            await self.run_single_cycle()
             
-        except Exception as e:
-            logger.error(f"❌ Error processing queued call {call.id}: {str(e)}")
-            await db.rollback()
-            return False
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=self._seconds_until_next_dial(poll_interval)
+                )
+            except asyncio.TimeoutError:
+                pass
+        
+        print("🛑 Call Initiator dispatcher stopped")
+    
+    def stop(self):
+        """Ask a running dispatcher loop to exit after the current cycle."""
+        self._stop_event.set()
 
 
-async def main():
+async def main(loop: bool = False):
     """Main entry point."""
     worker = CallInitiatorWorker()
-    await worker.start()
+    if loop:
+        await worker.run_forever()
+    else:
+        await worker.start()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Call initiator worker")
+    parser.add_argument(
+        "--loop",
+        action="store_true",
+        help="Run continuously as a dispatcher instead of a single pass"
+    )
+    args = parser.parse_args()
+    
     try:
-        asyncio.run(main())
+        asyncio.run(main(loop=args.loop))
     except KeyboardInterrupt:
         print("🛑 Worker stopped by user")
     except Exception as e:
@@ -63,6 +63,34 @@ class Settings(BaseSettings):
     VAPI_WEBHOOK_SECRET: str = "your_webhook_secret_here"
     VAPI_WEBHOOK_URL: str = "/api/v1/webhooks/vapi-webhook"
     
+    # Transcripts with at least this many segments are written with COPY instead of INSERT
+    TRANSCRIPT_COPY_THRESHOLD: int = 50
+    
+    # Webhook inbox settings
+    WEBHOOK_ASYNC_PROCESSING: bool = False  # Store and acknowledge, process in background consumers
+    WEBHOOK_CONSUMER_ENABLED: bool = False  # Run consumers inside the API process
+    WEBHOOK_EXTERNAL_CONSUMERS: bool = False  # app.webhook_consumer.worker processes run next to the API
+    WEBHOOK_CONSUMER_CONCURRENCY: int = 4
+    WEBHOOK_CONSUMER_POLL_INTERVAL_SECONDS: float = 2.0
+    WEBHOOK_CONSUMER_LEASE_SECONDS: int = 300  # Claimed events are retried if not finished in time
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_RETRY_BACKOFF_SECONDS: int = 10
+    WEBHOOK_QUEUE_METRICS_INTERVAL_SECONDS: int = 60
+    WEBHOOK_PROCESSED_RETENTION_DAYS: int = 7  # Processed events are deleted after this long
+    WEBHOOK_FAILED_RETENTION_DAYS: int = 30  # Dead (failed) events are kept longer for inspection
+    WEBHOOK_PURGE_INTERVAL_SECONDS: int = 3600
+    WEBHOOK_PURGE_BATCH_SIZE: int = 1000
+    
+    # Raw webhook payload archive (optional)
+    WEBHOOK_ARCHIVE_ENABLED: bool = False
+    WEBHOOK_ARCHIVE_DIR: str = "webhook_archive"
+    WEBHOOK_ARCHIVE_COMPRESSION: str = "gzip"  # "gzip" or "zstd" (requires zstandard)
+    WEBHOOK_ARCHIVE_MAX_SEGMENT_BYTES: int = 64 * 1024 * 1024
+    WEBHOOK_ARCHIVE_MAX_SEGMENT_SECONDS: int = 3600
+    WEBHOOK_ARCHIVE_FLUSH_INTERVAL_SECONDS: float = 5.0
+    WEBHOOK_ARCHIVE_BATCH_SIZE: int = 500
+    WEBHOOK_ARCHIVE_QUEUE_SIZE: int = 10000
+    
     # OpenAI Settings
     OPENAI_BASE_URL: str = "https://api.openai.com/v1"
     OPENAI_API_KEY: str = "your_openai_api_key_here"
@@ -71,14 +99,72 @@ class Settings(BaseSettings):
     OPENAI_TEMPERATURE: float = 0.2
     CALL_INITIATOR_ACCESS_TOKEN: str = "your_call_initiator_access_token_here"
     
-    # Rate limiting settings (in-memory)
+    # Transcript analysis result cache
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_MEMORY_SIZE: int = 1024  # Entries kept in the in-process LRU
+    
+    # Batch re-analysis of historical calls
+    ANALYSIS_BACKFILL_CHUNK_SIZE: int = 100  # Calls fetched and written per transaction
+    ANALYSIS_BACKFILL_CONCURRENCY: int = 4  # Max parallel LLM requests
+    ANALYSIS_BACKFILL_THROTTLE_PAUSE_SECONDS: float = 30.0  # Pause after the LLM API returns 429
+    
+    # Other LLM providers (used by AnyLLMService)
+    ANTHROPIC_API_KEY: Optional[str] = None
+    MISTRAL_API_KEY: Optional[str] = None
+    GROQ_API_KEY: Optional[str] = None
+    OLLAMA_API_BASE: Optional[str] = None
+    
+    # LLM call execution
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    LLM_DEFAULT_PROVIDER_CONCURRENCY: int = 4  # Concurrent requests per provider
+    LLM_PROVIDER_CONCURRENCY: Dict[str, int] = {}  # Per-provider overrides, e.g. {"ollama": 1}
+    LLM_EXECUTOR_MAX_WORKERS: int = 8  # Threads for providers without an async client
+    
+    # Call initiator dispatcher settings
+    CALL_INITIATOR_POLL_INTERVAL_SECONDS: int = 15  # Scheduler loop tick
+    CALL_INITIATOR_DIAL_INTERVAL_SECONDS: int = 180  # Minimum gap between dials per organization (0 disables)
+    CALL_INITIATOR_MAX_CONCURRENT_DIALS: int = 5  # Parallel VAPI create_call requests
+    CALL_INITIATOR_GLOBAL_CONCURRENCY_LIMIT: int = 5  # Ceiling on "In Progress" calls across all tenants
+    CALL_INITIATOR_LEASE_SECONDS: int = 60  # Lease held on a claimed call until VAPI accepts it
+    SCHEDULE_INDEX_TTL_SECONDS: int = 300  # Max age of the compiled schedule window index
+    
+    # Daily analytics rollups (daily_call_stats, daily_service_record_stats)
+    ANALYTICS_USE_DAILY_ROLLUPS: bool = True  # Serve dashboards from the rollups instead of raw rows
+    DAILY_STATS_REFRESH_INTERVAL_SECONDS: int = 60  # Periodic reconciliation of days with changed rows (one process at a time)
+    DAILY_STATS_REFRESH_OVERLAP_SECONDS: int = 300  # Re-scan window covering in-flight transactions
+    
+    # Shared outbound HTTP clients (VAPI, OpenAI)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 60.0
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CLIENT_HTTP2: bool = True  # Used when the h2 package is installed
+    HTTP_CLIENT_MAX_RETRIES: int = 2
+    HTTP_CLIENT_BACKOFF_BASE_SECONDS: float = 0.5
+    
+    # Rate limiting settings
     DEFAULT_RATE_LIMIT_PER_MINUTE: int = 10
+    RATE_LIMIT_BACKEND: str = "memory"  # memory (per process) or postgres (shared across workers)
+    RATE_LIMIT_LEASE_FRACTION: float = 0.1  # Share of a limit leased per database round trip (postgres)
+    RATE_LIMIT_LEASE_MIN_TOKENS: int = 5  # Smallest lease, so small limits do not need a round trip per request
+    RATE_LIMIT_LEASE_SECONDS: float = 5.0  # Leased tokens unspent after this are dropped (postgres)
     
     # API Key settings
     API_KEY_LENGTH: int = 32
+    API_KEY_CACHE_TTL_SECONDS: int = 60  # Verified keys are cached this long (0 disables)
+    API_KEY_CACHE_SIZE: int = 1024
+    API_KEY_USAGE_FLUSH_INTERVAL_SECONDS: float = 10.0  # Usage counts are written in bulk this often
+    
+    # Authenticated user/organization cache (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_SIZE: int = 4096
     
     # Public API settings  
     PUBLIC_API_PREFIX: str = "/api/v1/public"
+    PUBLIC_EXPORT_BATCH_SIZE: int = 500  # Rows fetched per server-side cursor round trip
+    PUBLIC_EXPORT_RATE_LIMIT_PER_MINUTE: int = 2  # Exports per API key, on top of the request limit
+    PUBLIC_EXPORT_WATERMARK_OVERLAP_SECONDS: int = 300  # Sync watermark lag covering in-flight transactions
     
     # Model configuration
     model_config = SettingsConfigDict(
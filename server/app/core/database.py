@@ -3,7 +3,9 @@ Database connection handling for the application.
 """
 
 import logging
-from typing import AsyncGenerator, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from sqlalchemy import inspect
 
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -11,6 +13,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import make_transient_to_detached
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
@@ -86,6 +89,21 @@ async_session_factory = async_sessionmaker(
 )
 
 
+def detached_copy(instance: Any) -> Any:
+    """
+    Copy an ORM instance's loaded column values into a new detached instance.
+    
+    The copy belongs to no session, so it can be cached and shared between
+    requests; use session.merge(copy, load=False) to work with it in a session.
+    """
+    state = inspect(instance)
+    copy = state.mapper.class_(**{
+        attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict
+    })
+    make_transient_to_detached(copy)
+    return copy
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency for getting a database session.
@@ -0,0 +1,177 @@
+"""
+Shared, pooled HTTP clients for outbound API calls.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors raised before the request reached the server, so retrying cannot duplicate work
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Statuses worth retrying for requests that are safe to repeat
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+# Statuses safe to retry for requests that must not run twice (placing a call, a
+# billed completion): a 502/503/504 may come after the upstream did the work
+NON_IDEMPOTENT_RETRY_STATUSES = (429,)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientRegistry:
+    """
+    Registry of long-lived httpx.AsyncClient instances, one per upstream service.
+
+    Clients keep connections alive between requests (and multiplex over
+    HTTP/2 when h2 is installed), so the worker, webhook consumers and API
+    handlers share warm connections instead of paying a TCP/TLS handshake per
+    call. Clients are closed from the application lifespan.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        # Close tasks of replaced clients, referenced until they finish
+        self._closing: Set[asyncio.Task] = set()
+
+    def get(
+        self,
+        name: str,
+        base_url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> httpx.AsyncClient:
+        """
+        Get (or create) the shared client for a service.
+
+        Args:
+            name: Client name, e.g. "vapi" or "openai"
+            base_url: Base URL used when the client is created
+            headers: Default headers used when the client is created
+            timeout: Read timeout in seconds (defaults to HTTP_CLIENT_TIMEOUT_SECONDS)
+
+        Returns:
+            httpx.AsyncClient: Shared client bound to the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(name)
+
+        # A client cannot be reused across event loops (e.g. separate asyncio.run calls)
+        if entry is not None and entry[1] is loop and not entry[0].is_closed:
+            return entry[0]
+        if entry is not None:
+            self._close_replaced(*entry)
+
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            http2=settings.HTTP_CLIENT_HTTP2 and _http2_available(),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(
+                timeout or settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS
+            )
+        )
+        self._clients[name] = (client, loop)
+        return client
+
+    def _close_replaced(self, client: httpx.AsyncClient, owner_loop: asyncio.AbstractEventLoop):
+        """Close a client bound to another event loop before it is replaced, so its pool is not leaked."""
+        if client.is_closed:
+            return
+
+        # Still running in another thread: close it there
+        if owner_loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._aclose_client(client), owner_loop)
+            return
+
+        # Its loop is gone: close what can be closed from this one. Sockets that
+        # still belong to the old loop are released when it is garbage-collected
+        task = asyncio.get_running_loop().create_task(self._aclose_client(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _aclose_client(client: httpx.AsyncClient):
+        """Close a client, logging instead of raising."""
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client: {str(e)}")
+
+    async def aclose(self):
+        """Close every client."""
+        clients = list(self._clients.values())
+        self._clients = {}
+        for client, _ in clients:
+            await self._aclose_client(client)
+
+
+async def request_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+    max_retries: Optional[int] = None,
+    **kwargs: Any
+) -> httpx.Response:
+    """
+    Send a request, retrying with exponential backoff and full jitter.
+
+    Connection errors are always retried because the request never reached
+    the server. Responses are retried only for retry_statuses; pass
+    NON_IDEMPOTENT_RETRY_STATUSES for calls that must not be repeated once
+    accepted (e.g. placing a call or a billed completion).
+
+    Args:
+        client: Shared client
+        method: HTTP method
+        url: URL (relative to the client's base_url)
+        retry_statuses: Response statuses to retry
+        max_retries: Retries after the first attempt (defaults to HTTP_CLIENT_MAX_RETRIES)
+        **kwargs: Passed to client.request
+
+    Returns:
+        httpx.Response: Final response (not raised for status)
+    """
+    max_retries = settings.HTTP_CLIENT_MAX_RETRIES if max_retries is None else max_retries
+    retry_statuses = set(retry_statuses)
+    attempt = 0
+
+    while True:
+        try:
+            response = await client.request(method, url, **kwargs)
+            if response.status_code not in retry_statuses or attempt >= max_retries:
+                return response
+            reason = f"status {response.status_code}"
+        except CONNECT_ERRORS as e:
+            if attempt >= max_retries:
+                raise
+            reason = type(e).__name__
+
+        delay = random.uniform(0, settings.HTTP_CLIENT_BACKOFF_BASE_SECONDS * (2 ** attempt))
+        attempt += 1
+        logger.warning(f"{method} {url} failed ({reason}), retry {attempt}/{max_retries} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+# Global HTTP client registry
+http_clients = HTTPClientRegistry()
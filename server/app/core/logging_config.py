@@ -29,5 +29,8 @@ class LoggingConfig:
     # Maximum body size to log (in bytes)
     MAX_BODY_SIZE: int = getattr(settings, 'MAX_BODY_SIZE', 1000)
     
+    # Whether to include response times in logs
+    LOG_PERFORMANCE: bool = getattr(settings, 'LOG_PERFORMANCE', True)
+    
     # Whether to include request ID in logs
     INCLUDE_REQUEST_ID: bool = getattr(settings, 'INCLUDE_REQUEST_ID', True) 
\ No newline at end of file
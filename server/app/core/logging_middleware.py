@@ -6,12 +6,11 @@ Captures request details, response information, and performance metrics.
 import json
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from urllib.parse import parse_qs
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 from app.core.logging_config import LoggingConfig
@@ -24,13 +23,18 @@ logging.basicConfig(
 logger = logging.getLogger("api_logger")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Comprehensive logging middleware that captures:
     - Request details (URL, method, headers, query params, path params, body)
     - Response details (status code, response time, size)
     - Performance metrics
     - Error tracking
+    
+    Implemented as plain ASGI middleware. The response is never buffered:
+    status and size are read from the send events as they pass through, so
+    streaming responses reach the client chunk by chunk. When a request body
+    is logged it is read once and replayed to the application.
     """
     
     def __init__(
@@ -39,24 +43,29 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         log_request_body: bool = None,
         exclude_paths: Optional[list] = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.log_request_body = log_request_body if log_request_body is not None else LoggingConfig.LOG_REQUEST_BODY
         self.exclude_paths = exclude_paths or LoggingConfig.EXCLUDE_PATHS
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Process request and log comprehensive details.
         
         Args:
-            request: The incoming request
-            call_next: The next middleware/endpoint handler
-            
-        Returns:
-            The response from the next handler
+            scope: The ASGI connection scope
+            receive: The ASGI receive channel
+            send: The ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Skip logging for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
+        if any(scope["path"].startswith(path) for path in self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
         
         # Generate unique request ID
         request_id = self._generate_request_id()
@@ -64,40 +73,81 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         # Start timing
         start_time = time.time()
         
+        # Read the body up front (if it is logged) and hand it on to the application
+        request_body = None
+        if self._should_log_body(request):
+            messages = await self._receive_body(receive)
+            request_body = self._parse_request_body(request, b"".join(
+                message.get("body", b"") for message in messages if message["type"] == "http.request"
+            ))
+            receive = self._replay(messages, receive)
+        
         # Log request details
-        await self._log_request(request, request_id)
+        self._log_request(request, request_id, request_body)
+        
+        # Response details, filled in as the response is sent
+        response = {"status_code": None, "size": 0}
+        
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                response["status_code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
         
         try:
             # Process request
-            response = await call_next(request)
-            
-            # Calculate response time
-            response_time = time.time() - start_time
-            
-            # Log response details
-            await self._log_response(response, request_id, response_time, request)
-            
-            return response
+            await self.app(scope, receive, send_wrapper)
             
         except Exception as e:
             # Log error details
             response_time = time.time() - start_time
-            await self._log_error(e, request_id, response_time)
+            self._log_error(e, request_id, response_time)
             raise
+        
+        # Calculate response time (including the whole body for streaming responses)
+        response_time = time.time() - start_time
+        
+        # Log response details
+        self._log_response(request, request_id, response_time, response["status_code"], response["size"])
+    
+    def _should_log_body(self, request: Request) -> bool:
+        """Whether the request body is read for logging."""
+        if not self.log_request_body or request.method not in ["POST", "PUT", "PATCH"]:
+            return False
+        
+        # Uploads are left to the endpoint, which spools them to disk
+        return "multipart/form-data" not in request.headers.get("content-type", "")
+    
+    async def _receive_body(self, receive: Receive) -> List[Message]:
+        """Receive the complete request body as a list of ASGI messages."""
+        messages = []
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                return messages
     
-    async def _log_request(self, request: Request, request_id: str):
+    @staticmethod
+    def _replay(messages: List[Message], receive: Receive) -> Receive:
+        """Receive channel that returns already received messages before reading on."""
+        pending = list(messages)
+        
+        async def replay_receive() -> Message:
+            if pending:
+                return pending.pop(0)
+            return await receive()
+        
+        return replay_receive
+    
+    def _log_request(self, request: Request, request_id: str, request_body: Optional[Dict[str, Any]]):
         """Log focused request details."""
         try:
             # Parse query parameters
             query_params = dict(request.query_params)
             
             # Parse path parameters (if available)
-            path_params = dict(request.path_params) if hasattr(request, 'path_params') else {}
-            
-            # Get request body (if applicable)
-            request_body = None
-            if self.log_request_body and request.method in ["POST", "PUT", "PATCH"]:
-                request_body = await self._get_request_body(request)
+            path_params = dict(request.path_params)
             
             # Get organization ID from request state
             organization_id = getattr(request.state, 'organization_id', None)
@@ -127,7 +177,14 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.error(f"Error logging request: {e}")
     
-    async def _log_response(self, response: Response, request_id: str, response_time: float, request: Request):
+    def _log_response(
+        self,
+        request: Request,
+        request_id: str,
+        response_time: float,
+        status_code: Optional[int],
+        response_size: int
+    ):
         """Log focused response details."""
         try:
             # Get organization ID from request state
@@ -139,7 +196,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 "level": "INFO",
                 "type": "response",
                 "endpoint": request.url.path,
-                "status_code": response.status_code,
+                "status_code": status_code,
+                "response_size_bytes": response_size,
                 "organization_id": organization_id,
             }
             
@@ -147,8 +205,13 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             if LoggingConfig.INCLUDE_REQUEST_ID:
                 log_data["request_id"] = request_id
             
+            # Add performance metrics if enabled
+            if LoggingConfig.LOG_PERFORMANCE:
+                log_data["response_time_ms"] = round(response_time * 1000, 2)
+            
             # Determine log level based on status code
-            log_level = LoggingConfig.ERROR_LOG_LEVEL if response.status_code >= 400 else LoggingConfig.SUCCESS_LOG_LEVEL
+            failed = status_code is None or status_code >= 400
+            log_level = LoggingConfig.ERROR_LOG_LEVEL if failed else LoggingConfig.SUCCESS_LOG_LEVEL
             log_data["level"] = log_level
             
             # Log as JSON
@@ -161,7 +224,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.error(f"Error logging response: {e}")
     
-    async def _log_error(self, error: Exception, request_id: str, response_time: float):
+    def _log_error(self, error: Exception, request_id: str, response_time: float):
         """Log error details."""
         try:
             log_data = {
@@ -185,24 +248,22 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.error(f"Error logging error: {e}")
     
-    async def _get_request_body(self, request: Request) -> Optional[Dict[str, Any]]:
-        """Safely extract and filter request body."""
+    def _parse_request_body(self, request: Request, body: bytes) -> Optional[Dict[str, Any]]:
+        """Safely parse and filter a received request body."""
+        if not body:
+            return None
+        
         try:
             # Check content type
             content_type = request.headers.get("content-type", "")
             
             if "application/json" in content_type:
-                body = await request.json()
-                return self._filter_sensitive_fields(body)
+                return self._filter_sensitive_fields(json.loads(body))
             elif "application/x-www-form-urlencoded" in content_type:
-                body = await request.form()
-                return dict(body)
-            elif "multipart/form-data" in content_type:
-                body = await request.form()
-                return dict(body)
+                form = parse_qs(body.decode("utf-8", errors="ignore"), keep_blank_values=True)
+                return self._filter_sensitive_fields({key: values[-1] for key, values in form.items()})
             else:
-                # For other content types, try to get raw body
-                body = await request.body()
+                # For other content types, log the raw body
                 return {"raw_body": body.decode("utf-8", errors="ignore")[:LoggingConfig.MAX_BODY_SIZE]}
                 
         except Exception as e:
@@ -6,36 +6,49 @@ import logging
 from typing import Optional
 
 from fastapi import Request
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.security import get_token_claims
 
 logger = logging.getLogger(__name__)
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """
     Middleware for handling multi-tenant context.
     Extracts organization_id from JWT token and stores it in request state.
+    
+    Implemented as plain ASGI middleware: receive and send are passed to the
+    application untouched, so streaming responses are not buffered.
     """
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """
         Process each request to extract tenant information.
         
         Args:
-            request: The incoming request
-            call_next: The next middleware/endpoint handler
-            
-        Returns:
-            The response from the next handler
+            scope: The ASGI connection scope
+            receive: The ASGI receive channel
+            send: The ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Request state lives in scope["state"], shared with the endpoint's Request
+        request = Request(scope)
+        
         # Skip tenant extraction for auth endpoints and health check
         if request.url.path in [f"{settings.API_V1_STR}/auth/login", "/health"]:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
             
         try:
             # Extract token from Authorization header
@@ -51,19 +64,20 @@ class TenantMiddleware(BaseHTTPMiddleware):
         except Exception as e:
             logger.warning(f"Error in tenant middleware: {e}")
         
-        # Continue with the request
-        response = await call_next(request)
-        
-        # Clean up tenant context if needed
-        if hasattr(request.state, "organization_id"):
-            await self._cleanup_tenant_context(request)
-        
-        return response
+        try:
+            # Continue with the request
+            await self.app(scope, receive, send)
+        finally:
+            # Clean up tenant context if needed
+            if hasattr(request.state, "organization_id"):
+                await self._cleanup_tenant_context(request)
     
     def _extract_tenant_from_token(self, request: Request) -> Optional[str]:
         """
         Extract tenant ID from JWT token.
         
+        The decoded claims are kept in request state for the auth dependencies.
+        
         Args:
             request: The incoming request
             
@@ -79,17 +93,13 @@ class TenantMiddleware(BaseHTTPMiddleware):
         token = auth_header.split("Bearer ")[1]
         
         try:
-            # Decode token
-            payload = jwt.decode(
-                token, 
-                settings.JWT_SECRET, 
-                algorithms=[settings.JWT_ALGORITHM]
-            )
+            # Decode token (once per request)
+            claims = get_token_claims(request, token)
             
             # Extract organization_id
-            return payload.get("organization_id")
+            return claims.organization_id
             
-        except JWTError:
+        except (JWTError, KeyError):
             return None
     
     async def _setup_tenant_context(self, request: Request, organization_id: str):
@@ -0,0 +1,126 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Lists are ordered by (created_at DESC, id DESC). A cursor is an opaque,
+URL-safe token holding the (created_at, id) of the last row of a page; the
+next page is every row strictly after it in that order, so each page costs
+the same no matter how deep it is.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+from app.core.exceptions import BadRequestException
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """
+    Encode a row's sort key as an opaque cursor.
+
+    Args:
+        created_at: Row creation time
+        row_id: Row primary key
+
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page
+
+    Returns:
+        Tuple[datetime, int]: (created_at, id) of the last row of that page
+
+    Raises:
+        BadRequestException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError):
+        raise BadRequestException("Invalid cursor")
+
+    # Decoded JSON can hold any type; only the shape encode_cursor writes may reach the query
+    if not isinstance(created_at, str) or not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise BadRequestException("Invalid cursor")
+
+    try:
+        return datetime.fromisoformat(created_at), row_id
+    except ValueError:
+        raise BadRequestException("Invalid cursor")
+
+
+def apply_keyset(query: Select, model: Any, cursor: Optional[str], skip: int, limit: int) -> Select:
+    """
+    Order a query newest first and page it by cursor, or by offset without one.
+
+    Args:
+        query: Filtered select of model rows
+        model: Model with created_at and id columns
+        cursor: Cursor from a previous page (takes precedence over skip)
+        skip: Rows to skip when no cursor is given
+        limit: Page size
+
+    Returns:
+        Select: Ordered, paged query
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(limit)
+
+
+def next_cursor(rows: Sequence[Any], limit: int) -> Optional[str]:
+    """
+    Cursor for the page after rows, or None if rows was the last page.
+
+    Args:
+        rows: Rows of the current page, in order
+        limit: Requested page size
+
+    Returns:
+        Optional[str]: Cursor of the next page
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], limit: int) -> Optional[str]:
+    """
+    Expose the next page's cursor in the X-Next-Cursor response header.
+
+    Args:
+        response: Outgoing response
+        rows: Rows of the current page, in order
+        limit: Requested page size
+
+    Returns:
+        Optional[str]: Cursor of the next page
+    """
+    cursor = next_cursor(rows, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
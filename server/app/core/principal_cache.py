@@ -0,0 +1,138 @@
+"""
+Short-lived cache of authenticated principals (users and their organizations).
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.core.database import detached_copy
+from app.models import Organization, User
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of the users and organizations behind JWT subjects.
+    
+    Entries are detached snapshots shared between requests; dependencies
+    merge them into the request session without loading, so a cache hit
+    costs no query. Any ORM update or delete of a user or organization in
+    this process evicts it once its transaction commits (see the session
+    events below); other processes notice within PRINCIPAL_CACHE_TTL_SECONDS.
+    """
+    
+    def __init__(self):
+        # subject (JWT sub) -> (expires_at, user)
+        self._users: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        # organization id -> (expires_at, organization)
+        self._organizations: "OrderedDict[UUID, Tuple[float, Organization]]" = OrderedDict()
+    
+    @staticmethod
+    def _get(entries: OrderedDict, key: Any) -> Optional[Any]:
+        """Look up a live entry and mark it recently used."""
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        
+        entries.move_to_end(key)
+        return value
+    
+    @staticmethod
+    def _put(entries: OrderedDict, key: Any, value: Any):
+        """Store a snapshot of value, evicting the least recently used entries."""
+        if settings.PRINCIPAL_CACHE_TTL_SECONDS <= 0:
+            return
+        
+        entries[key] = (time.monotonic() + settings.PRINCIPAL_CACHE_TTL_SECONDS, detached_copy(value))
+        entries.move_to_end(key)
+        while len(entries) > settings.PRINCIPAL_CACHE_SIZE:
+            entries.popitem(last=False)
+    
+    def get_user(self, subject: str) -> Optional[User]:
+        """Cached user for a JWT subject."""
+        return self._get(self._users, subject)
+    
+    def put_user(self, subject: str, user: User):
+        """Cache the user behind a JWT subject."""
+        self._put(self._users, subject, user)
+    
+    def get_organization(self, organization_id: UUID) -> Optional[Organization]:
+        """Cached organization."""
+        return self._get(self._organizations, organization_id)
+    
+    def put_organization(self, organization: Organization):
+        """Cache an organization."""
+        self._put(self._organizations, organization.id, organization)
+    
+    def invalidate_user(self, user_id: int):
+        """Forget a user under every subject it is cached for."""
+        for subject in [s for s, (_, user) in self._users.items() if user.id == user_id]:
+            del self._users[subject]
+    
+    def invalidate_organization(self, organization_id: UUID):
+        """Forget an organization."""
+        self._organizations.pop(organization_id, None)
+    
+    def clear(self):
+        """Forget everything."""
+        self._users.clear()
+        self._organizations.clear()
+
+
+# Global principal cache
+principal_cache = PrincipalCache()
+
+
+# Session.info key of the (kind, id) pairs flushed but not yet committed
+_PENDING_EVICTIONS = "principal_cache_evictions"
+
+
+def _invalidate(kind: str, key: Any):
+    if kind == "user":
+        principal_cache.invalidate_user(key)
+    else:
+        principal_cache.invalidate_organization(key)
+
+
+def _defer_eviction(target: Any, kind: str):
+    """
+    Evict a principal when its session commits.
+    
+    Evicting at flush time would let a concurrent request reload the old,
+    still-committed row and cache it for the whole TTL.
+    """
+    session = object_session(target)
+    if session is None:
+        _invalidate(kind, target.id)
+        return
+    session.info.setdefault(_PENDING_EVICTIONS, set()).add((kind, target.id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_user(mapper, connection, target):
+    _defer_eviction(target, "user")
+
+
+@event.listens_for(Organization, "after_update")
+@event.listens_for(Organization, "after_delete")
+def _evict_organization(mapper, connection, target):
+    _defer_eviction(target, "organization")
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _apply_evictions(session):
+    # Evicting is always safe, so a rollback evicts too instead of tracking savepoints
+    for kind, key in session.info.pop(_PENDING_EVICTIONS, ()):
+        _invalidate(kind, key)
@@ -1,22 +1,78 @@
 """
-In-memory rate limiting for API endpoints.
+Rate limiting for API endpoints.
+
+Limits are enforced through a pluggable backend (RATE_LIMIT_BACKEND):
+"memory" keeps token buckets in the process, "postgres" shares them across
+workers and nodes through the rate_limit_buckets table.
 """
 
+import logging
+import math
 import time
-from typing import Dict, List
-from datetime import datetime, timedelta
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Tuple
 from fastapi import HTTPException, status, Request
-from functools import wraps
+from sqlalchemy import Float, Integer, cast, delete, extract, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.core.config import settings
+from app.core.database import async_session_factory, get_engine
+from app.models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# Slack for rounding error in refill arithmetic, so a token due at an exact
+# second (e.g. after 12s at 5 per minute) is available at that second
+_TOKEN_EPSILON = 1e-9
+
+
+class _Bucket:
+    """Token bucket state for one identifier."""
+    
+    __slots__ = ("tokens", "updated_at", "capacity", "rate")
+    
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.tokens = capacity
+        self.updated_at = now
+        self.capacity = capacity
+        self.rate = rate
+    
+    def refill(self, now: float):
+        """Add the tokens earned since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
 
 
 class InMemoryRateLimiter:
-    """In-memory rate limiter using sliding window approach."""
+    """
+    In-memory rate limiter using a token bucket per identifier.
+    
+    Each identifier may burst up to `limit` requests and earns tokens back at
+    limit / window_seconds per second. Checks are O(1) and each identifier
+    holds a fixed-size bucket regardless of its limit. Buckets are kept in
+    least-recently-used order so cleanup only touches idle ones.
+    """
     
     def __init__(self):
-        # Dictionary to store request timestamps per API key
-        # Format: {api_key_id: [timestamp1, timestamp2, ...]}
-        self.requests: Dict[str, List[float]] = {}
+        # Format: {identifier: _Bucket}, least recently used first
+        self.buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+    
+    def _get_bucket(self, identifier: str, limit: int, window_seconds: int, now: float) -> _Bucket:
+        """Get the identifier's bucket, refilled to now (created full if missing)."""
+        rate = limit / window_seconds
+        bucket = self.buckets.get(identifier)
+        
+        if bucket is None:
+            bucket = _Bucket(float(limit), rate, now)
+            self.buckets[identifier] = bucket
+        else:
+            self.buckets.move_to_end(identifier)
+            # The limit may have changed since the last request (API key updated)
+            bucket.capacity = float(limit)
+            bucket.rate = rate
+            bucket.refill(now)
+        
+        return bucket
     
     def is_allowed(self, identifier: str, limit: int, window_seconds: int = 60) -> bool:
         """
@@ -30,41 +86,240 @@ class InMemoryRateLimiter:
         Returns:
             bool: True if request is allowed, False otherwise
         """
-        current_time = time.time()
-        
-        # Initialize if not exists
-        if identifier not in self.requests:
-            self.requests[identifier] = []
-        
-        # Remove old requests outside the window
-        cutoff_time = current_time - window_seconds
-        self.requests[identifier] = [
-            req_time for req_time in self.requests[identifier] 
-            if req_time > cutoff_time
-        ]
-        
-        # Check if under limit
-        if len(self.requests[identifier]) < limit:
-            # Add current request
-            self.requests[identifier].append(current_time)
+        bucket = self._get_bucket(identifier, limit, window_seconds, time.monotonic())
+        
+        if bucket.tokens >= 1 - _TOKEN_EPSILON:
+            bucket.tokens = max(0.0, bucket.tokens - 1)
             return True
         
         return False
     
     def get_reset_time(self, identifier: str, window_seconds: int = 60) -> int:
-        """Get time until rate limit resets."""
-        if identifier not in self.requests or not self.requests[identifier]:
+        """Get time until the next request is allowed, in seconds."""
+        bucket = self.buckets.get(identifier)
+        if bucket is None:
             return 0
         
-        oldest_request = min(self.requests[identifier])
-        reset_time = oldest_request + window_seconds
-        return max(0, int(reset_time - time.time()))
+        bucket.refill(time.monotonic())
+        if bucket.tokens >= 1 - _TOKEN_EPSILON:
+            return 0
+        return math.ceil((1 - bucket.tokens) / bucket.rate - _TOKEN_EPSILON)
+    
+    def cleanup(self) -> int:
+        """
+        Drop buckets that have refilled completely.
+        
+        A full bucket behaves exactly like a missing one, so dropping it does
+        not change any decision. Buckets are visited least recently used first
+        and the walk stops at the first one still refilling.
+        
+        Returns:
+            int: Number of buckets dropped
+        """
+        now = time.monotonic()
+        dropped = 0
+        
+        while self.buckets:
+            identifier, bucket = next(iter(self.buckets.items()))
+            if bucket.tokens + (now - bucket.updated_at) * bucket.rate < bucket.capacity - _TOKEN_EPSILON:
+                break
+            del self.buckets[identifier]
+            dropped += 1
+        
+        return dropped
 
 
 # Global rate limiter instance
 rate_limiter = InMemoryRateLimiter()
 
 
+def _seconds_since_update():
+    """Seconds since a bucket row was last updated, as double precision."""
+    return cast(extract("epoch", func.now() - RateLimitBucket.updated_at), Float)
+
+
+class RateLimiterBackend(ABC):
+    """Interface of rate limiter backends."""
+    
+    @abstractmethod
+    async def acquire(self, identifier: str, limit: int, window_seconds: int = 60) -> Tuple[bool, int]:
+        """
+        Take one request from the identifier's budget.
+        
+        Args:
+            identifier: Unique identifier (API key ID or IP)
+            limit: Maximum number of requests per window
+            window_seconds: Time window in seconds
+            
+        Returns:
+            Tuple[bool, int]: (allowed, seconds until the next request is allowed)
+        """
+    
+    @abstractmethod
+    async def cleanup(self):
+        """Drop state that no longer affects any decision."""
+
+
+class MemoryRateLimiterBackend(RateLimiterBackend):
+    """Per-process backend: each worker enforces limits on its own."""
+    
+    def __init__(self, limiter: InMemoryRateLimiter):
+        self.limiter = limiter
+    
+    async def acquire(self, identifier: str, limit: int, window_seconds: int = 60) -> Tuple[bool, int]:
+        if self.limiter.is_allowed(identifier, limit, window_seconds):
+            return True, 0
+        return False, self.limiter.get_reset_time(identifier, window_seconds)
+    
+    async def cleanup(self):
+        self.limiter.cleanup()
+
+
+class _Lease:
+    """Tokens leased from the shared bucket, usable by this process until expiry."""
+    
+    __slots__ = ("tokens", "expires_at")
+    
+    def __init__(self, tokens: int, expires_at: float):
+        self.tokens = tokens
+        self.expires_at = expires_at
+
+
+class PostgresRateLimiterBackend(RateLimiterBackend):
+    """
+    Backend sharing token buckets across workers and nodes through Postgres.
+    
+    Instead of a round trip per request, a worker leases a chunk of tokens
+    (RATE_LIMIT_LEASE_FRACTION of the limit, but at least
+    RATE_LIMIT_LEASE_MIN_TOKENS) with one atomic upsert that refills the
+    bucket and debits the chunk, then spends the chunk locally.
+    Unspent tokens expire after RATE_LIMIT_LEASE_SECONDS, so a key can never
+    exceed its limit across the fleet; at worst it is briefly held below it.
+    If the database is unreachable, the process falls back to its own
+    in-memory limiter.
+    """
+    
+    def __init__(self, fallback: InMemoryRateLimiter):
+        self.fallback = fallback
+        self._leases: Dict[str, _Lease] = {}
+    
+    @staticmethod
+    def lease_chunk(limit: int) -> int:
+        """
+        Tokens to lease per round trip for a limit.
+        
+        A fraction alone rounds down to a single token for small limits (any
+        limit under 20 at the default 0.1), which would mean one round trip
+        per request again, so the chunk has a floor. It never exceeds the limit.
+        """
+        chunk = max(settings.RATE_LIMIT_LEASE_MIN_TOKENS, int(limit * settings.RATE_LIMIT_LEASE_FRACTION))
+        return max(1, min(limit, chunk))
+    
+    async def _lease_tokens(self, identifier: str, limit: int, window_seconds: int, chunk: int) -> Tuple[int, float, float]:
+        """
+        Refill the shared bucket and take up to chunk whole tokens from it.
+        
+        Returns:
+            Tuple[int, float, float]: (tokens granted, tokens left in the bucket, refill rate)
+        """
+        rate = limit / window_seconds
+        capacity = float(limit)
+        first_grant = min(chunk, limit)
+        
+        # In ON CONFLICT DO UPDATE, every SET expression sees the row as it was
+        refilled = func.least(
+            capacity,
+            RateLimitBucket.tokens + _seconds_since_update() * rate
+        )
+        grant = cast(func.least(chunk, func.floor(refilled)), Integer)
+        
+        stmt = pg_insert(RateLimitBucket).values(
+            identifier=identifier,
+            tokens=capacity - first_grant,
+            capacity=capacity,
+            refill_rate=rate,
+            last_grant=first_grant,
+            updated_at=func.now()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RateLimitBucket.identifier],
+            set_={
+                "tokens": refilled - grant,
+                "capacity": capacity,
+                "refill_rate": rate,
+                "last_grant": grant,
+                "updated_at": func.now()
+            }
+        ).returning(RateLimitBucket.last_grant, RateLimitBucket.tokens)
+        
+        async with async_session_factory(bind=get_engine()) as db:
+            granted, tokens = (await db.execute(stmt)).one()
+            await db.commit()
+        
+        return granted, tokens, rate
+    
+    async def acquire(self, identifier: str, limit: int, window_seconds: int = 60) -> Tuple[bool, int]:
+        now = time.monotonic()
+        lease = self._leases.get(identifier)
+        if lease is not None and lease.tokens >= 1 and lease.expires_at > now:
+            lease.tokens -= 1
+            return True, 0
+        
+        chunk = self.lease_chunk(limit)
+        try:
+            granted, tokens, rate = await self._lease_tokens(identifier, limit, window_seconds, chunk)
+        except Exception as e:
+            logger.warning(f"Shared rate limiter unavailable, limiting in-process: {str(e)}")
+            if self.fallback.is_allowed(identifier, limit, window_seconds):
+                return True, 0
+            return False, self.fallback.get_reset_time(identifier, window_seconds)
+        
+        if granted < 1:
+            self._leases.pop(identifier, None)
+            return False, math.ceil((1 - tokens) / rate)
+        
+        self._leases[identifier] = _Lease(granted - 1, now + settings.RATE_LIMIT_LEASE_SECONDS)
+        return True, 0
+    
+    async def cleanup(self):
+        now = time.monotonic()
+        for identifier in [i for i, lease in self._leases.items() if lease.expires_at <= now]:
+            del self._leases[identifier]
+        self.fallback.cleanup()
+        
+        # Full buckets behave like missing ones
+        async with async_session_factory(bind=get_engine()) as db:
+            await db.execute(
+                delete(RateLimitBucket).where(
+                    RateLimitBucket.tokens
+                    + _seconds_since_update() * RateLimitBucket.refill_rate
+                    >= RateLimitBucket.capacity
+                )
+            )
+            await db.commit()
+
+
+def create_rate_limit_backend(name: str) -> RateLimiterBackend:
+    """
+    Create the rate limiter backend named by RATE_LIMIT_BACKEND.
+    
+    Args:
+        name: "memory" or "postgres"
+        
+    Returns:
+        RateLimiterBackend: Backend instance
+    """
+    if name == "postgres":
+        return PostgresRateLimiterBackend(rate_limiter)
+    if name != "memory":
+        logger.warning(f"Unknown RATE_LIMIT_BACKEND {name!r}, using in-memory rate limiting")
+    return MemoryRateLimiterBackend(rate_limiter)
+
+
+# Global rate limiter backend
+rate_limit_backend = create_rate_limit_backend(settings.RATE_LIMIT_BACKEND)
+
+
 def get_rate_limit_identifier(request: Request) -> str:
     """Get identifier for rate limiting."""
     # Use API key ID if available
@@ -76,7 +331,23 @@ def get_rate_limit_identifier(request: Request) -> str:
     return f"ip:{client_ip}"
 
 
-def rate_limit_dependency(request: Request):
+async def _enforce_rate_limit(identifier: str, limit: int):
+    """Raise 429 if identifier has used up its per-minute limit."""
+    allowed, reset_time = await rate_limit_backend.acquire(identifier, limit, 60)  # 60 seconds = 1 minute
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded. Try again in {reset_time} seconds.",
+            headers={
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) + reset_time),
+                "Retry-After": str(reset_time)
+            }
+        )
+
+
+async def rate_limit_dependency(request: Request):
     """
     FastAPI dependency for rate limiting.
     
@@ -94,31 +365,27 @@ def rate_limit_dependency(request: Request):
     else:
         limit = getattr(settings, 'DEFAULT_RATE_LIMIT_PER_MINUTE', 10)
     
-    if not rate_limiter.is_allowed(identifier, limit, 60):  # 60 seconds = 1 minute
-        reset_time = rate_limiter.get_reset_time(identifier, 60)
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Rate limit exceeded. Try again in {reset_time} seconds.",
-            headers={
-                "X-RateLimit-Limit": str(limit),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(int(time.time()) + reset_time),
-                "Retry-After": str(reset_time)
-            }
-        )
+    await _enforce_rate_limit(identifier, limit)
 
 
-def cleanup_old_requests():
-    """Cleanup old request records to prevent memory leaks."""
-    current_time = time.time()
-    cutoff_time = current_time - 3600  # Keep last hour
+async def export_rate_limit_dependency(request: Request):
+    """
+    FastAPI dependency limiting bulk exports per API key.
+    
+    An export streams a whole call history in one request, so it gets its
+    own, much lower per-minute budget (PUBLIC_EXPORT_RATE_LIMIT_PER_MINUTE)
+    in addition to the regular request limit.
     
-    for identifier in list(rate_limiter.requests.keys()):
-        rate_limiter.requests[identifier] = [
-            req_time for req_time in rate_limiter.requests[identifier]
-            if req_time > cutoff_time
-        ]
+    Args:
+        request: FastAPI request object
         
-        # Remove empty entries
-        if not rate_limiter.requests[identifier]:
-            del rate_limiter.requests[identifier]
\ No newline at end of file
+    Raises:
+        HTTPException: If rate limit is exceeded
+    """
+    identifier = f"export:{get_rate_limit_identifier(request)}"
+    await _enforce_rate_limit(identifier, settings.PUBLIC_EXPORT_RATE_LIMIT_PER_MINUTE)
+
+
+async def cleanup_old_requests():
+    """Cleanup idle rate limit buckets to prevent memory leaks."""
+    await rate_limit_backend.cleanup()
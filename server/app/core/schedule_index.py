@@ -0,0 +1,210 @@
+"""
+In-memory index of organization call schedule windows.
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.schedule_config import ScheduleConfig
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def minute_of_week(moment: datetime) -> int:
+    """Minute offset of a UTC datetime from Monday 00:00."""
+    moment = moment.astimezone(timezone.utc)
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def _parse_minute(value: str) -> int:
+    """Parse an "HH:MM" string into minutes after midnight."""
+    parsed = datetime.strptime(value, "%H:%M")
+    return parsed.hour * 60 + parsed.minute
+
+
+def compile_schedule_windows(config: Dict[str, Any], now: datetime) -> List[Tuple[int, int]]:
+    """
+    Compile an org-wide schedule config into UTC minute-of-week intervals.
+
+    Each interval is half-open: (start_minute, end_minute). Local days are
+    resolved against the seven days starting today in the schedule's timezone,
+    so the UTC offsets in effect this week (including DST) are used. A range
+    that spans midnight only covers the active day itself, matching the
+    per-cycle check the worker used to run.
+
+    Args:
+        config: ScheduleConfig.config_json
+        now: Reference time
+
+    Returns:
+        List[Tuple[int, int]]: UTC minute-of-week intervals (empty if never open)
+
+    Raises:
+        ValueError: If start_time or end_time are not "HH:MM"
+    """
+    if not config.get("auto_call_enabled", False):
+        return []
+
+    timezone_str = config.get("timezone", "UTC")
+    try:
+        tz = ZoneInfo(timezone_str)
+    except Exception:
+        logger.warning(f"Invalid timezone {timezone_str} in schedule config, using UTC")
+        tz = ZoneInfo("UTC")
+
+    start_minute = _parse_minute(config.get("start_time", "00:00"))
+    # End time is inclusive to the minute
+    end_minute = _parse_minute(config.get("end_time", "23:59")) + 1
+    active_days = set(config.get("active_days", []))
+
+    if start_minute < end_minute:
+        local_ranges = [(start_minute, end_minute)]
+    else:
+        # Spans midnight (e.g., 22:00 to 06:00)
+        local_ranges = [(0, end_minute), (start_minute, MINUTES_PER_DAY)]
+
+    today = now.astimezone(tz).date()
+    intervals: List[Tuple[int, int]] = []
+
+    for offset in range(7):
+        local_day = today + timedelta(days=offset)
+        if local_day.strftime("%A").lower() not in active_days:
+            continue
+
+        midnight = datetime(local_day.year, local_day.month, local_day.day, tzinfo=tz)
+        for range_start, range_end in local_ranges:
+            # Convert both ends, so a range crossing a DST change keeps its real length
+            start_utc = (midnight + timedelta(minutes=range_start)).astimezone(timezone.utc)
+            end_utc = (midnight + timedelta(minutes=range_end)).astimezone(timezone.utc)
+            start = minute_of_week(start_utc)
+            end = start + int((end_utc - start_utc).total_seconds() // 60)
+
+            # Split intervals that wrap past the end of the week
+            if end > MINUTES_PER_WEEK:
+                intervals.append((start, MINUTES_PER_WEEK))
+                intervals.append((0, end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((start, end))
+
+    return intervals
+
+
+class ScheduleWindowIndex:
+    """
+    Interval index mapping UTC minute-of-week to the organizations open for calls.
+
+    The index is compiled from every org-wide ScheduleConfig and answers
+    "which organizations are open right now" with one bisect. It is rebuilt
+    when invalidated or after SCHEDULE_INDEX_TTL_SECONDS, which also picks up
+    DST changes and edits made by other processes.
+    """
+
+    def __init__(self):
+        # Sorted segment start minutes and the organizations open in each segment
+        self._boundaries: List[int] = [0]
+        self._segments: List[FrozenSet[Any]] = [frozenset()]
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        """Force a rebuild on the next lookup."""
+        self._expires_at = 0.0
+
+    def build(self, configs: Iterable[Tuple[Any, Dict[str, Any]]], now: Optional[datetime] = None):
+        """
+        Compile schedule configs into the index.
+
+        Args:
+            configs: (organization_id, config_json) pairs for org-wide configs
+            now: Reference time (defaults to the current time)
+        """
+        now = now or datetime.now(timezone.utc)
+        events: Dict[int, List[Tuple[Any, int]]] = {0: []}
+
+        for org_id, config in configs:
+            try:
+                windows = compile_schedule_windows(config or {}, now)
+            except ValueError as e:
+                logger.warning(f"Invalid time format in schedule config for organization {org_id}: {e}")
+                continue
+
+            for start, end in windows:
+                events.setdefault(start, []).append((org_id, 1))
+                events.setdefault(end, []).append((org_id, -1))
+
+        boundaries: List[int] = []
+        segments: List[FrozenSet[Any]] = []
+        open_counts: Dict[Any, int] = {}
+
+        for boundary in sorted(events):
+            if boundary >= MINUTES_PER_WEEK:
+                break
+
+            for org_id, delta in events[boundary]:
+                count = open_counts.get(org_id, 0) + delta
+                if count:
+                    open_counts[org_id] = count
+                else:
+                    open_counts.pop(org_id, None)
+
+            current = frozenset(open_counts)
+            # Merge adjacent segments with the same open set
+            if segments and segments[-1] == current:
+                continue
+            boundaries.append(boundary)
+            segments.append(current)
+
+        self._boundaries = boundaries
+        self._segments = segments
+        self._expires_at = time.monotonic() + settings.SCHEDULE_INDEX_TTL_SECONDS
+
+    def lookup(self, now: Optional[datetime] = None) -> FrozenSet[Any]:
+        """
+        Get the organizations whose schedule window is open.
+
+        Args:
+            now: Time to look up (defaults to the current time)
+
+        Returns:
+            FrozenSet: Open organization IDs
+        """
+        minute = minute_of_week(now or datetime.now(timezone.utc))
+        return self._segments[bisect_right(self._boundaries, minute) - 1]
+
+    async def get_open_organization_ids(self, db: AsyncSession) -> FrozenSet[Any]:
+        """
+        Get the currently open organizations, rebuilding the index if stale.
+
+        Args:
+            db: Database session used when a rebuild is needed
+
+        Returns:
+            FrozenSet: Open organization IDs
+        """
+        if time.monotonic() >= self._expires_at:
+            async with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    result = await db.execute(
+                        select(ScheduleConfig.organization_id, ScheduleConfig.config_json)
+                        .where(ScheduleConfig.campaign_id.is_(None))  # Org-wide config
+                    )
+                    self.build(result.all())
+                    logger.info(f"Rebuilt schedule window index ({len(self._segments)} segments)")
+
+        return self.lookup()
+
+
+# Global schedule window index instance
+schedule_window_index = ScheduleWindowIndex()
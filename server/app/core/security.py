@@ -5,6 +5,7 @@ Security utilities for authentication and authorization.
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Union
 
+from fastapi import Request
 from jose import jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
@@ -103,3 +104,31 @@ def decode_access_token(token: str) -> TokenData:
     )
     
     return token_data
+
+
+def get_token_claims(request: Request, token: str) -> TokenData:
+    """
+    Decode a JWT once per request.
+    
+    TenantMiddleware decodes the bearer token and keeps the claims in request
+    state; dependencies reuse them instead of decoding the token again.
+    
+    Args:
+        request: The incoming request
+        token: The JWT token
+        
+    Returns:
+        TokenData: The decoded token data
+        
+    Raises:
+        JWTError: If the token is invalid
+    """
+    if getattr(request.state, "token", None) == token:
+        claims = getattr(request.state, "token_claims", None)
+        if claims is not None:
+            return claims
+    
+    claims = decode_access_token(token)
+    request.state.token = token
+    request.state.token_claims = claims
+    return claims
@@ -0,0 +1,202 @@
+"""
+Compressed, rotating NDJSON archive for raw webhook payloads.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "webhooks-"
+
+
+class WebhookArchiveWriter:
+    """
+    Background sink that batches webhook payloads into compressed NDJSON segments.
+
+    Requests only enqueue the payload; a background task drains the queue in
+    batches and appends each batch as a complete gzip member (or zstd frame)
+    to the current segment, so the segment is readable at any time. A segment
+    is rolled over once it exceeds WEBHOOK_ARCHIVE_MAX_SEGMENT_BYTES or
+    WEBHOOK_ARCHIVE_MAX_SEGMENT_SECONDS.
+    """
+
+    def __init__(self, directory: Optional[str] = None, compression: Optional[str] = None):
+        self.directory = Path(directory or settings.WEBHOOK_ARCHIVE_DIR)
+        self.compression = compression or settings.WEBHOOK_ARCHIVE_COMPRESSION
+        if self.compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, archiving webhooks with gzip")
+            self.compression = "gzip"
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._segment_path: Optional[Path] = None
+        self._segment_opened_at = 0.0
+        self._pending: List[Dict[str, Any]] = []
+        self._write_lock = threading.Lock()
+        self._dropped = 0
+
+    def submit(self, event_type: Optional[str], payload: Dict[str, Any]):
+        """
+        Queue a payload for archiving without blocking the caller.
+
+        Payloads are dropped (and counted) when the writer is not running or
+        its queue is full, so archiving never slows down webhook handling.
+        """
+        if self._queue is None:
+            return
+
+        record = {
+            "received_at": datetime.now(timezone.utc).isoformat(),
+            "event_type": event_type,
+            "payload": payload,
+        }
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            if self._dropped % 1000 == 1:
+                logger.warning(f"Webhook archive queue full, dropped {self._dropped} payloads so far")
+
+    def start(self):
+        """Start the background writer on the running event loop."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue(maxsize=settings.WEBHOOK_ARCHIVE_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Archiving webhook payloads to {self.directory} ({self.compression})")
+
+    async def stop(self):
+        """Flush queued payloads and stop the writer."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        # Write anything still queued
+        batch = self._pending + self._drain()
+        self._pending = []
+        if batch:
+            await asyncio.to_thread(self._write_batch, batch)
+
+        self._task = None
+        self._queue = None
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        """Take up to one batch of queued records without waiting."""
+        batch = []
+        while self._queue is not None and len(batch) < settings.WEBHOOK_ARCHIVE_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self):
+        """Collect records into batches and write them off the event loop."""
+        while True:
+            self._pending = [await self._queue.get()]
+            # Give the batch a moment to fill before writing
+            await asyncio.sleep(settings.WEBHOOK_ARCHIVE_FLUSH_INTERVAL_SECONDS)
+            batch = self._pending + self._drain()
+            self._pending = []
+
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(f"Failed to archive {len(batch)} webhook payloads: {str(e)}")
+
+    def _segment_suffix(self) -> str:
+        """File suffix for the configured compression."""
+        return ".ndjson.zst" if self.compression == "zstd" else ".ndjson.gz"
+
+    def _current_segment(self) -> Path:
+        """Return the segment to append to, rolling over on size or age."""
+        now = time.monotonic()
+        path = self._segment_path
+
+        if path is not None and path.exists():
+            too_big = path.stat().st_size >= settings.WEBHOOK_ARCHIVE_MAX_SEGMENT_BYTES
+            too_old = now - self._segment_opened_at >= settings.WEBHOOK_ARCHIVE_MAX_SEGMENT_SECONDS
+            if not (too_big or too_old):
+                return path
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        self._segment_path = self.directory / f"{SEGMENT_PREFIX}{timestamp}-{os.getpid()}{self._segment_suffix()}"
+        self._segment_opened_at = now
+        return self._segment_path
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Append a batch as one compressed member to the current segment (runs in a thread)."""
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in batch).encode("utf-8")
+
+        if self.compression == "zstd":
+            compressed = zstandard.ZstdCompressor().compress(data)
+        else:
+            compressed = gzip.compress(data)
+
+        with self._write_lock:
+            with open(self._current_segment(), "ab") as f:
+                f.write(compressed)
+
+
+def read_archive_segment(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Read the records of an archive segment.
+
+    Args:
+        path: Segment file (.ndjson.gz or .ndjson.zst)
+
+    Yields:
+        Dict: Archived records with received_at, event_type and payload
+    """
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst archive segments")
+        with open(path, "rb") as raw:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            for line in _iter_lines(reader):
+                yield json.loads(line)
+    else:
+        with gzip.open(path, "rb") as reader:
+            for line in reader:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _iter_lines(reader) -> Iterator[bytes]:
+    """Split a binary stream into non-empty lines."""
+    buffer = b""
+    while True:
+        chunk = reader.read(1 << 16)
+        if not chunk:
+            break
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+# Global webhook archive writer instance
+webhook_archive = WebhookArchiveWriter()
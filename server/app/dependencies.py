@@ -12,7 +12,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.middleware import TenantQueryFilter
-from app.core.security import TokenData, decode_access_token
+from app.core.principal_cache import principal_cache
+from app.core.security import TokenData, get_token_claims
 from app.models import Organization, User, ApiKey
 from app.services.api_key_service import ApiKeyService
 from app.core.config import settings
@@ -46,13 +47,18 @@ async def get_tenant_db(
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_tenant_db)
 ) -> User:
     """
     Get the current authenticated user.
     
+    Reuses the claims decoded by TenantMiddleware and, on a principal cache
+    hit, merges the cached user into the session without a query.
+    
     Args:
+        request: The request object
         token: JWT token from request
         db: Database session
         
@@ -70,10 +76,15 @@ async def get_current_user(
     
     try:
         # Decode token
-        token_data = decode_access_token(token)
+        token_data = get_token_claims(request, token)
         if token_data.sub is None:
             raise credentials_exception
         
+        # Only active users are cached
+        cached_user = principal_cache.get_user(token_data.sub)
+        if cached_user is not None:
+            return await db.merge(cached_user, load=False)
+        
         # Get user from database
         result = await db.execute(
             select(User).where(User.email == token_data.sub)
@@ -89,7 +100,8 @@ async def get_current_user(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Inactive user"
             )
-            
+        
+        principal_cache.put_user(token_data.sub, user)
         return user
         
     except JWTError:
@@ -113,6 +125,10 @@ async def get_current_organization(
     Raises:
         HTTPException: If organization does not exist
     """
+    cached_organization = principal_cache.get_organization(current_user.organization_id)
+    if cached_organization is not None:
+        return await db.merge(cached_organization, load=False)
+    
     result = await db.execute(
         select(Organization).where(Organization.id == current_user.organization_id)
     )
@@ -123,7 +139,8 @@ async def get_current_organization(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found"
         )
-        
+    
+    principal_cache.put_organization(organization)
     return organization
 
 
@@ -224,8 +241,8 @@ async def get_api_key_auth(
     request.state.organization_id = api_key_record.organization_id
     request.state.api_key = api_key_record
     
-    # Update usage statistics (async, don't await to avoid blocking)
-    await ApiKeyService.update_usage(api_key_record, db)
+    # Counted in memory and written in bulk, so the request stays read-only
+    ApiKeyService.record_usage(api_key_record)
     
     return api_key_record
 
@@ -244,10 +261,8 @@ async def get_api_key_organization(
     Returns:
         Organization: The API key's organization
     """
-    result = await db.execute(
-        select(Organization).where(Organization.id == api_key.organization_id)
-    )
-    organization = result.scalar_one_or_none()
+    # Loaded (or cached) together with the key by verify_api_key
+    organization = api_key.organization
     
     if not organization:
         raise HTTPException(
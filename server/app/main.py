@@ -11,11 +11,17 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.core.config import settings
-from app.core.database import create_db_and_tables
+from app.core.database import async_session_factory, create_db_and_tables, get_engine
 from app.core.exceptions import setup_exception_handlers
+from app.core.http_client import http_clients
 from app.core.middleware import TenantMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.core.logging_middleware import RequestLoggingMiddleware
 from app.core.rate_limiter import cleanup_old_requests
+from app.core.webhook_archive import webhook_archive
+from app.services.api_key_service import ApiKeyService
+from app.services.daily_stats_service import DailyStatsService
+from app.webhook_consumer import webhook_consumer
 
 
 # Configure logging
@@ -33,6 +39,17 @@ async def lifespan(app: FastAPI):
     
     This runs before the application starts and after it stops.
     """
+    # Queued webhooks are only processed by consumers; refuse to accept them without any
+    if settings.WEBHOOK_ASYNC_PROCESSING and not (
+        settings.WEBHOOK_CONSUMER_ENABLED or settings.WEBHOOK_EXTERNAL_CONSUMERS
+    ):
+        message = (
+            "WEBHOOK_ASYNC_PROCESSING is on but no webhook consumer runs: set WEBHOOK_CONSUMER_ENABLED=true, "
+            "or run app.webhook_consumer.worker and set WEBHOOK_EXTERNAL_CONSUMERS=true"
+        )
+        logger.error(message)
+        raise RuntimeError(message)
+    
     # Create tables if they don't exist
     if settings.CREATE_TABLES_ON_STARTUP:
         logger.info("Creating database tables...")
@@ -41,20 +58,71 @@ async def lifespan(app: FastAPI):
     # Start background task for rate limiter cleanup
     async def periodic_cleanup():
         while True:
-            cleanup_old_requests()
+            try:
+                await cleanup_old_requests()
+            except Exception as e:
+                logger.error(f"Error cleaning up rate limiter: {str(e)}")
             await asyncio.sleep(300)  # Cleanup every 5 minutes
     
     cleanup_task = asyncio.create_task(periodic_cleanup())
     
+    # Start background reconciliation of the daily analytics rollups (one process at a time)
+    async def periodic_rollup_refresh():
+        while True:
+            await asyncio.sleep(settings.DAILY_STATS_REFRESH_INTERVAL_SECONDS)
+            try:
+                await DailyStatsService.reconcile()
+            except Exception as e:
+                logger.error(f"Error refreshing daily stats: {str(e)}")
+    
+    rollup_task = asyncio.create_task(periodic_rollup_refresh())
+    
+    # Start write-behind flushing of API key usage counts
+    async def flush_api_key_usage():
+        try:
+            async with async_session_factory(bind=get_engine()) as db:
+                await ApiKeyService.flush_usage(db)
+        except Exception as e:
+            logger.error(f"Error flushing API key usage: {str(e)}")
+    
+    async def periodic_usage_flush():
+        while True:
+            await asyncio.sleep(settings.API_KEY_USAGE_FLUSH_INTERVAL_SECONDS)
+            await flush_api_key_usage()
+    
+    usage_task = asyncio.create_task(periodic_usage_flush())
+    
+    # Start the raw webhook payload archive
+    if settings.WEBHOOK_ARCHIVE_ENABLED:
+        webhook_archive.start()
+    
+    # Start background consumers for the webhook inbox
+    if settings.WEBHOOK_CONSUMER_ENABLED:
+        webhook_consumer.start()
+    
     logger.info("Application startup complete")
     yield
     
-    # Cancel cleanup task on shutdown
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    # Let in-flight webhook events finish before shutting down
+    if settings.WEBHOOK_CONSUMER_ENABLED:
+        await webhook_consumer.stop()
+    
+    # Flush archived webhook payloads
+    await webhook_archive.stop()
+    
+    # Close pooled outbound HTTP connections
+    await http_clients.aclose()
+    
+    # Cancel background tasks on shutdown
+    for task in (cleanup_task, rollup_task, usage_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    # Write the usage counted since the last flush
+    await flush_api_key_usage()
         
     logger.info("Application shutdown complete")
 
@@ -80,6 +148,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Add request logging middleware (logs body, query params, URL params, endpoint, org ID)
@@ -25,6 +25,12 @@ from .role import Role
 from .call_feedback import CallFeedback
 from .knowledge_file import KnowledgeFile
 from .api_key import ApiKey
+from .webhook_event import WebhookEvent
+from .processed_webhook_event import ProcessedWebhookEvent
+from .analysis_result import AnalysisResult
+from .analysis_backfill_job import AnalysisBackfillJob
+from .daily_stats import DailyCallStats, DailyServiceRecordStats, DailyStatsWatermark
+from .rate_limit_bucket import RateLimitBucket
 
 # For Alembic discovery
 __all__ = [
@@ -50,4 +56,12 @@ __all__ = [
     "CallFeedback",
     "KnowledgeFile",
     "ApiKey",
+    "WebhookEvent",
+    "ProcessedWebhookEvent",
+    "AnalysisResult",
+    "AnalysisBackfillJob",
+    "DailyCallStats",
+    "DailyServiceRecordStats",
+    "DailyStatsWatermark",
+    "RateLimitBucket",
 ]
@@ -0,0 +1,51 @@
+"""
+AnalysisBackfillJob model for batch re-analysis of historical calls.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base
+
+
+class AnalysisBackfillJob(Base):
+    """
+    AnalysisBackfillJob model tracking a re-analysis run over completed calls.
+    
+    Calls are processed in ascending id order; last_call_id is the checkpoint
+    committed with each chunk's results, so an interrupted job resumes where
+    it stopped.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "analysis_backfill_jobs"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Scope (None = all organizations)
+    organization_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=True
+    )
+    completed_since = Column(DateTime(timezone=True), nullable=True)
+    
+    # Analysis settings (None = current defaults)
+    model = Column(String(100), nullable=True)
+    prompt_version = Column(Integer, nullable=True)
+    
+    # Status: "pending", "running", "completed", "failed", "cancelled"
+    status = Column(String(20), nullable=False, default="pending")
+    
+    # Progress
+    last_call_id = Column(Integer, nullable=False, default=0)
+    total_count = Column(Integer, nullable=True)
+    processed_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<AnalysisBackfillJob {self.id}: {self.status}>"
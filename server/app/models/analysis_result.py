@@ -0,0 +1,37 @@
+"""
+AnalysisResult model for cached transcript analysis results.
+"""
+
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .base import Base
+
+
+class AnalysisResult(Base):
+    """
+    AnalysisResult model caching LLM analysis output by content hash.
+    
+    The cache key is a SHA-256 of everything that shapes the analysis prompt
+    (transcript messages, service record and organization context, tags,
+    model and prompt version), so identical inputs reuse the stored result.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "analysis_results"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Content hash of the analysis inputs
+    cache_key = Column(String(64), nullable=False, unique=True)
+    
+    # What produced the result
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(Integer, nullable=False)
+    
+    # Analysis output
+    result = Column(JSONB, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<AnalysisResult {self.cache_key[:12]}: {self.model} v{self.prompt_version}>"
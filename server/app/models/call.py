@@ -2,7 +2,7 @@
 Call model for phone call records.
 """
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, Boolean, Numeric
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, Boolean, Numeric, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -66,6 +66,12 @@ class Call(Base):
     ended_reason = Column(String(50), nullable=True)  # Reason for call ending
     duration_ms = Column(Integer, nullable=True)  # Duration in milliseconds
     
+    # Dispatch lease held by a call initiator worker while dialing
+    lease_owner = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    # Committed just before the VAPI request; such a call is never re-queued
+    dial_attempted_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Relationships
     organization = relationship("Organization", back_populates="calls")
     service_record = relationship("ServiceRecord", back_populates="calls")
@@ -75,5 +81,24 @@ class Call(Base):
     audio_file = relationship("AudioFile", back_populates="call", uselist=False)
     feedback = relationship("CallFeedback", back_populates="call", uselist=False)
     
+    __table_args__ = (
+        # Tenant-scoped lists (newest first) and date-range analytics
+        Index("ix_calls_organization_id_created_at", "organization_id", text("created_at DESC")),
+        # Tenant-scoped status filters and counts over a date range
+        Index("ix_calls_organization_id_status_created_at", "organization_id", "status", "created_at"),
+        # Dispatch states only: the initiator's Ready/Queued/In Progress scans and lease reclaim
+        Index(
+            "ix_calls_active_status",
+            "status",
+            "organization_id",
+            "lease_expires_at",
+            postgresql_where=text("status IN ('Ready', 'Queued', 'In Progress')")
+        ),
+        Index("ix_calls_service_record_id", "service_record_id"),
+        Index("ix_calls_campaign_id", "campaign_id"),
+        # Periodic rollup refresh (rows changed since the last pass)
+        Index("ix_calls_updated_at", "updated_at"),
+    )
+    
     def __repr__(self) -> str:
         return f"<Call {self.id}: {self.customer_number} - {self.status}>"
@@ -0,0 +1,126 @@
+"""
+Daily rollup models for call and service record analytics.
+"""
+
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base
+
+
+class DailyCallStats(Base):
+    """
+    DailyCallStats model holding call aggregates per organization and UTC day.
+    
+    One row per (organization, day, status, direction, campaign, ended_reason,
+    call_reason) group, so analytics can read O(days) rows instead of scanning
+    calls. ORM writes to calls apply per-call deltas to their group; the
+    periodic reconciliation recomputes whole days from calls.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "daily_call_stats"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Dimensions
+    organization_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    day = Column(Date, nullable=False)
+    status = Column(String(20), nullable=False)
+    direction = Column(String(10), nullable=True)
+    campaign_id = Column(Integer, nullable=True)
+    ended_reason = Column(String(50), nullable=True)
+    call_reason = Column(String(100), nullable=True)
+    
+    # Measures
+    call_count = Column(Integer, nullable=False, default=0)
+    duration_count = Column(Integer, nullable=False, default=0)  # Calls with a duration
+    total_duration_sec = Column(Integer, nullable=False, default=0)
+    total_cost = Column(Numeric(14, 4), nullable=False, default=0)
+    nps_count = Column(Integer, nullable=False, default=0)  # Calls with an NPS score
+    total_nps = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # One row per group (NULL dimensions compare equal), the target of delta upserts
+        Index(
+            "uq_daily_call_stats_group",
+            "organization_id",
+            "day",
+            "status",
+            "direction",
+            "campaign_id",
+            "ended_reason",
+            "call_reason",
+            unique=True,
+            postgresql_nulls_not_distinct=True
+        ),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<DailyCallStats {self.organization_id} {self.day}: {self.status} x{self.call_count}>"
+
+
+class DailyServiceRecordStats(Base):
+    """
+    DailyServiceRecordStats model holding service record counts per organization and UTC day.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "daily_service_record_stats"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Dimensions
+    organization_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    day = Column(Date, nullable=False)
+    status = Column(String(20), nullable=False)
+    campaign_id = Column(Integer, nullable=True)
+    is_demo = Column(Boolean, nullable=False, default=False)
+    
+    # Measures
+    record_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # One row per group (NULL dimensions compare equal), the target of delta upserts
+        Index(
+            "uq_daily_service_record_stats_group",
+            "organization_id",
+            "day",
+            "status",
+            "campaign_id",
+            "is_demo",
+            unique=True,
+            postgresql_nulls_not_distinct=True
+        ),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<DailyServiceRecordStats {self.organization_id} {self.day}: {self.status} x{self.record_count}>"
+
+
+class DailyStatsWatermark(Base):
+    """
+    DailyStatsWatermark model persisting how far the periodic rollup reconciliation has got.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "daily_stats_watermarks"
+    
+    # Primary key
+    name = Column(String(50), primary_key=True)
+    
+    # Rows updated before this time have been reconciled
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<DailyStatsWatermark {self.name}: {self.watermark}>"
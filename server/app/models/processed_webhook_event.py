@@ -0,0 +1,39 @@
+"""
+ProcessedWebhookEvent model for webhook idempotency keys.
+"""
+
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+
+from .base import Base
+
+
+class ProcessedWebhookEvent(Base):
+    """
+    ProcessedWebhookEvent model recording which webhook events have been handled.
+    
+    The unique (vapi_call_id, event_type, event_timestamp) key lets retried
+    deliveries be detected with a single index lookup.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "processed_webhook_events"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Dedup key
+    vapi_call_id = Column(String(100), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    event_timestamp = Column(String(64), nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "vapi_call_id",
+            "event_type",
+            "event_timestamp",
+            name="uq_processed_webhook_events_dedup_key"
+        ),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<ProcessedWebhookEvent {self.vapi_call_id}: {self.event_type}>"
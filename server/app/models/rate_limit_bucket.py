@@ -0,0 +1,34 @@
+"""
+RateLimitBucket model for the shared rate limiter backend.
+"""
+
+from sqlalchemy import Column, Float, Integer, String
+
+from .base import Base
+
+
+class RateLimitBucket(Base):
+    """
+    RateLimitBucket model holding one token bucket per rate limit identifier.
+    
+    Used by the Postgres rate limiter backend so every worker and node draws
+    from the same budget. Workers lease tokens in chunks with a single upsert
+    instead of touching the row on every request.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "rate_limit_buckets"
+    
+    # Rate limit identifier, e.g. "api_key:12" or "export:ip:10.0.0.1"
+    identifier = Column(String(200), primary_key=True)
+    
+    # Bucket state as of updated_at
+    tokens = Column(Float, nullable=False)
+    capacity = Column(Float, nullable=False)
+    refill_rate = Column(Float, nullable=False)  # Tokens per second
+    
+    # Tokens handed out by the most recent lease
+    last_grant = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        return f"<RateLimitBucket {self.identifier}: {self.tokens:.1f}/{self.capacity:.0f}>"
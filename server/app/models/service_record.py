@@ -3,7 +3,7 @@ ServiceRecord model for customer service records.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, SmallInteger, String, Text, Boolean
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, SmallInteger, String, Text, Boolean, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 
@@ -60,5 +60,10 @@ class ServiceRecord(Base):
     modifier = relationship("User", foreign_keys=[modified_by])
     calls = relationship("Call", back_populates="service_record")
     
+    __table_args__ = (
+        # Tenant-scoped lists paged by (created_at, id), newest first
+        Index("ix_servicerecords_organization_id_created_at_id", "organization_id", text("created_at DESC"), text("id DESC")),
+    )
+    
     def __repr__(self) -> str:
         return f"<ServiceRecord {self.id}: {self.customer_name} - {self.status}>"
@@ -0,0 +1,43 @@
+"""
+WebhookEvent model for the durable webhook inbox.
+"""
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .base import Base
+
+
+class WebhookEvent(Base):
+    """
+    WebhookEvent model storing received webhook payloads until a consumer processes them.
+    """
+    
+    # Table name - explicitly set
+    __tablename__ = "webhook_events"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Event details
+    source = Column(String(50), nullable=False, default="vapi")
+    event_type = Column(String(50), nullable=True)
+    payload = Column(JSONB, nullable=False)
+    
+    # Processing state: "pending", "processing", "processed", "failed"
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Consumer lease
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index("ix_webhook_events_status_available_at", "status", "available_at"),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<WebhookEvent {self.id}: {self.event_type} - {self.status}>"
@@ -0,0 +1,39 @@
+"""
+Call re-analysis (analysis backfill) schemas.
+"""
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class AnalysisBackfillCreate(BaseModel):
+    """Schema for starting a re-analysis of completed calls."""
+    
+    completed_since: Optional[datetime] = None
+    model: Optional[str] = Field(None, max_length=100)
+    prompt_version: Optional[int] = Field(None, ge=1)
+
+
+class AnalysisBackfillJobResponse(BaseModel):
+    """Schema for re-analysis job status."""
+    
+    id: int
+    organization_id: Optional[UUID]
+    completed_since: Optional[datetime]
+    model: Optional[str]
+    prompt_version: Optional[int]
+    status: str
+    last_call_id: int
+    total_count: Optional[int]
+    processed_count: int
+    failed_count: int
+    last_error: Optional[str]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
@@ -11,6 +11,8 @@ from app.services.call_service import CallService
 from app.services.service_record_service import ServiceRecordService
 from app.services.vapi_service import VAPIService
 from app.services.activity_service import ActivityService
+# Also registers the flush hook that keeps the daily rollups current in every process
+from app.services.daily_stats_service import DailyStatsService
 
 __all__ = [
     "AuthService",
@@ -21,4 +23,5 @@ __all__ = [
     "ServiceRecordService",
     "VAPIService",
     "ActivityService",
+    "DailyStatsService",
 ]
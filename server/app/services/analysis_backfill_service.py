@@ -0,0 +1,446 @@
+"""
+Analysis backfill service.
+
+Re-scores completed calls after a prompt or model change. Calls are read in
+keyset-paginated chunks (by id), their transcripts, organizations, service
+records and tags are prefetched in bulk, LLM requests run with bounded
+parallelism, and each chunk's results are written together with the job
+checkpoint so an interrupted job resumes where it stopped.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_engine, async_session_factory
+from app.models import AnalysisBackfillJob, Call, CallFeedback, Organization, ServiceRecord, Tag, Transcript
+from app.services.analysis_cache_service import AnalysisCacheService
+from app.services.call_analysis_service import CallAnalysisService
+from app.services.openai_service import OpenAIService
+
+logger = logging.getLogger(__name__)
+
+# Job statuses a runner may pick up
+RESUMABLE_STATUSES = ("pending", "failed", "cancelled")
+
+
+class AnalysisBackfillService:
+    """Service for batch re-analysis of historical calls."""
+
+    @staticmethod
+    def _call_filters(
+        organization_id: Optional[UUID],
+        completed_since: Optional[datetime]
+    ) -> List[Any]:
+        """Filters selecting the calls a job covers."""
+        conditions = [Call.status == "Completed"]
+        if organization_id is not None:
+            conditions.append(Call.organization_id == organization_id)
+        if completed_since is not None:
+            conditions.append(Call.created_at >= completed_since)
+        return conditions
+
+    @staticmethod
+    async def create_job(
+        db: AsyncSession,
+        organization_id: Optional[UUID] = None,
+        completed_since: Optional[datetime] = None,
+        model: Optional[str] = None,
+        prompt_version: Optional[int] = None
+    ) -> AnalysisBackfillJob:
+        """
+        Create a re-analysis job.
+
+        Args:
+            db: Database session
+            organization_id: Organization to re-analyse (None for all)
+            completed_since: Only re-analyse calls created at or after this time
+            model: LLM model (defaults to OPENAI_MODEL)
+            prompt_version: Prompt version (defaults to the configured default)
+
+        Returns:
+            AnalysisBackfillJob: Created job
+        """
+        total_result = await db.execute(
+            select(func.count(Call.id)).where(
+                *AnalysisBackfillService._call_filters(organization_id, completed_since)
+            )
+        )
+
+        job = AnalysisBackfillJob(
+            organization_id=organization_id,
+            completed_since=completed_since,
+            model=model,
+            prompt_version=prompt_version,
+            status="pending",
+            last_call_id=0,
+            total_count=total_result.scalar() or 0,
+            processed_count=0,
+            failed_count=0
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_job(
+        job_id: int,
+        db: AsyncSession,
+        organization_id: Optional[UUID] = None
+    ) -> Optional[AnalysisBackfillJob]:
+        """
+        Get a job, optionally restricted to an organization.
+
+        Args:
+            job_id: Job ID
+            db: Database session
+            organization_id: Organization the job must belong to
+
+        Returns:
+            Optional[AnalysisBackfillJob]: Job, or None if not found
+        """
+        query = select(AnalysisBackfillJob).where(AnalysisBackfillJob.id == job_id)
+        if organization_id is not None:
+            query = query.where(AnalysisBackfillJob.organization_id == organization_id)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def cancel_job(job_id: int, db: AsyncSession) -> None:
+        """
+        Ask a job to stop. A running job stops after its current chunk.
+
+        Args:
+            job_id: Job ID
+            db: Database session
+        """
+        await db.execute(
+            update(AnalysisBackfillJob)
+            .where(
+                AnalysisBackfillJob.id == job_id,
+                AnalysisBackfillJob.status.in_(["pending", "running"])
+            )
+            .values(status="cancelled")
+        )
+        await db.commit()
+
+    @staticmethod
+    async def _claim_job(job_id: int, db: AsyncSession, force: bool = False) -> Optional[AnalysisBackfillJob]:
+        """Mark a job running, unless another runner already has it (or force)."""
+        statuses = RESUMABLE_STATUSES + (("running",) if force else ())
+        result = await db.execute(
+            update(AnalysisBackfillJob)
+            .where(
+                AnalysisBackfillJob.id == job_id,
+                AnalysisBackfillJob.status.in_(statuses)
+            )
+            .values(
+                status="running",
+                started_at=func.coalesce(AnalysisBackfillJob.started_at, func.now()),
+                finished_at=None
+            )
+            .returning(AnalysisBackfillJob)
+        )
+        job = result.scalar_one_or_none()
+        await db.commit()
+        return job
+
+    @staticmethod
+    async def _fetch_chunk(job: AnalysisBackfillJob, after_id: int, limit: int, db: AsyncSession) -> List[Call]:
+        """Next chunk of calls after the checkpoint (keyset pagination on id)."""
+        result = await db.execute(
+            select(Call)
+            .where(
+                Call.id > after_id,
+                *AnalysisBackfillService._call_filters(job.organization_id, job.completed_since)
+            )
+            .order_by(Call.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _prefetch(
+        calls: List[Call],
+        db: AsyncSession
+    ) -> Tuple[Dict[Any, Organization], Dict[int, ServiceRecord], Dict[int, List[Any]], Dict[Any, List[str]]]:
+        """Load organizations, service records, transcripts and tags for a chunk in four queries."""
+        call_ids = [call.id for call in calls]
+        org_ids = {call.organization_id for call in calls}
+        service_record_ids = {call.service_record_id for call in calls if call.service_record_id}
+
+        org_result = await db.execute(select(Organization).where(Organization.id.in_(org_ids)))
+        organizations = {org.id: org for org in org_result.scalars().all()}
+
+        service_records = {}
+        if service_record_ids:
+            record_result = await db.execute(
+                select(ServiceRecord).where(ServiceRecord.id.in_(service_record_ids))
+            )
+            service_records = {record.id: record for record in record_result.scalars().all()}
+
+        transcripts: Dict[int, List[Any]] = defaultdict(list)
+        transcript_result = await db.execute(
+            select(Transcript.call_id, Transcript.role, Transcript.message)
+            .where(Transcript.call_id.in_(call_ids))
+            .order_by(Transcript.call_id, Transcript.id)
+        )
+        for row in transcript_result.all():
+            transcripts[row.call_id].append(row)
+
+        tags: Dict[Any, List[str]] = defaultdict(list)
+        tag_result = await db.execute(
+            select(Tag.organization_id, Tag.name).where(
+                Tag.organization_id.in_(org_ids),
+                Tag.type == "areas_to_focus"
+            )
+        )
+        for org_id, name in tag_result.all():
+            tags[org_id].append(name)
+
+        return organizations, service_records, transcripts, tags
+
+    @staticmethod
+    async def _process_chunk(
+        job: AnalysisBackfillJob,
+        calls: List[Call],
+        openai_service: OpenAIService,
+        model: str,
+        prompt_version: int,
+        concurrency: int,
+        db: AsyncSession
+    ) -> bool:
+        """
+        Analyse a chunk and write the results with the job checkpoint.
+
+        If the LLM API throttles (429), results are only written up to the first
+        throttled call and the checkpoint stops there, so the rest of the chunk
+        is retried; calls already analysed are then served from the cache.
+
+        Returns:
+            bool: True if the LLM API throttled requests
+        """
+        organizations, service_records, transcripts, tags = await AnalysisBackfillService._prefetch(calls, db)
+
+        inputs_by_call: Dict[int, Dict[str, Any]] = {}
+        keys_by_call: Dict[int, str] = {}
+        errors: Dict[int, str] = {}
+
+        for call in calls:
+            organization = organizations.get(call.organization_id)
+            if organization is None:
+                errors[call.id] = "Organization not found"
+                continue
+            if not transcripts.get(call.id):
+                errors[call.id] = "No transcript found for call"
+                continue
+
+            service_record = service_records.get(call.service_record_id)
+            if service_record is not None and service_record.organization_id != call.organization_id:
+                service_record = None
+
+            inputs = CallAnalysisService.build_analysis_inputs(
+                organization, service_record, transcripts[call.id], tags.get(call.organization_id, [])
+            )
+            inputs_by_call[call.id] = inputs
+            keys_by_call[call.id] = CallAnalysisService.build_cache_key(
+                inputs, openai_service, model, prompt_version
+            )
+
+        # One lookup for every cached result in the chunk
+        cached = await AnalysisCacheService.get_many(list(set(keys_by_call.values())), db)
+        results: Dict[int, Dict[str, Any]] = {
+            call_id: cached[key] for call_id, key in keys_by_call.items() if key in cached
+        }
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze(call_id: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await openai_service.analyze_call_transcript(
+                    **inputs_by_call[call_id],
+                    prompt_version=prompt_version,
+                    model=model
+                )
+
+        pending_ids = [call_id for call_id in inputs_by_call if call_id not in results]
+        outcomes = await asyncio.gather(*(analyze(call_id) for call_id in pending_ids), return_exceptions=True)
+
+        new_cache_entries: Dict[str, Dict[str, Any]] = {}
+        throttled_ids = []
+        for call_id, outcome in zip(pending_ids, outcomes):
+            if isinstance(outcome, httpx.HTTPStatusError) and outcome.response.status_code == 429:
+                throttled_ids.append(call_id)
+            elif isinstance(outcome, Exception):
+                errors[call_id] = str(outcome) or type(outcome).__name__
+            else:
+                results[call_id] = outcome
+                if CallAnalysisService.is_cacheable(outcome):
+                    new_cache_entries[keys_by_call[call_id]] = {
+                        "cache_key": keys_by_call[call_id],
+                        "model": model,
+                        "prompt_version": prompt_version,
+                        "result": outcome
+                    }
+
+        # Stop the checkpoint before the first throttled call
+        checkpoint = min(throttled_ids) - 1 if throttled_ids else calls[-1].id
+        results = {call_id: result for call_id, result in results.items() if call_id <= checkpoint}
+        errors = {call_id: error for call_id, error in errors.items() if call_id <= checkpoint}
+
+        if results:
+            await db.execute(
+                update(Call),
+                [
+                    {
+                        "id": call_id,
+                        "call_summary": result.get("call_summary"),
+                        "nps_score": result.get("nps_score"),
+                        "feedback_summary": result.get("overall_feedback")
+                    }
+                    for call_id, result in results.items()
+                ]
+            )
+            # Re-analysis replaces the previous feedback
+            await db.execute(
+                delete(CallFeedback).where(CallFeedback.call_id.in_(list(results)))
+            )
+            feedback_rows = [
+                row
+                for call_id, result in results.items()
+                for row in CallAnalysisService.build_feedback_rows(call_id, result)
+            ]
+            if feedback_rows:
+                await db.execute(insert(CallFeedback), feedback_rows)
+
+        await AnalysisCacheService.put_many(list(new_cache_entries.values()), db)
+
+        values: Dict[str, Any] = {
+            "last_call_id": checkpoint,
+            "processed_count": AnalysisBackfillJob.processed_count + len(results),
+            "failed_count": AnalysisBackfillJob.failed_count + len(errors)
+        }
+        if errors:
+            last_failed = max(errors)
+            values["last_error"] = f"Call {last_failed}: {errors[last_failed]}"
+            for call_id, error in errors.items():
+                logger.warning(f"Re-analysis of call {call_id} failed: {error}")
+
+        await db.execute(
+            update(AnalysisBackfillJob)
+            .where(AnalysisBackfillJob.id == job.id)
+            .values(**values)
+        )
+        await db.commit()
+
+        job.last_call_id = checkpoint
+        return bool(throttled_ids)
+
+    @staticmethod
+    async def run_job(
+        job_id: int,
+        concurrency: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        force: bool = False
+    ) -> Optional[AnalysisBackfillJob]:
+        """
+        Run (or resume) a job until every call is processed or it is cancelled.
+
+        Uses its own database sessions, one per chunk, so it can run as a
+        background task or from the command line. Parallelism is halved
+        whenever the LLM API throttles and grows back by one per clean chunk.
+
+        Args:
+            job_id: Job ID
+            concurrency: Max parallel LLM requests (defaults to ANALYSIS_BACKFILL_CONCURRENCY)
+            chunk_size: Calls per chunk (defaults to ANALYSIS_BACKFILL_CHUNK_SIZE)
+            force: Take over a job marked running (e.g. after its runner crashed)
+
+        Returns:
+            Optional[AnalysisBackfillJob]: Final job state, or None if the job
+            could not be claimed
+        """
+        max_concurrency = concurrency or settings.ANALYSIS_BACKFILL_CONCURRENCY
+        chunk_size = chunk_size or settings.ANALYSIS_BACKFILL_CHUNK_SIZE
+        engine = get_engine()
+
+        async with async_session_factory(bind=engine) as db:
+            job = await AnalysisBackfillService._claim_job(job_id, db, force=force)
+
+        if job is None:
+            logger.warning(f"Re-analysis job {job_id} not found or already running")
+            return None
+
+        openai_service = OpenAIService()
+        model = job.model or settings.OPENAI_MODEL
+        prompt_version = openai_service.resolve_prompt_version(job.prompt_version)
+        current_concurrency = max_concurrency
+        final_status = "completed"
+
+        logger.info(
+            f"Running re-analysis job {job_id} from call {job.last_call_id} "
+            f"(model {model}, prompt v{prompt_version})"
+        )
+
+        try:
+            while True:
+                async with async_session_factory(bind=engine) as db:
+                    status_result = await db.execute(
+                        select(AnalysisBackfillJob.status).where(AnalysisBackfillJob.id == job_id)
+                    )
+                    if status_result.scalar() == "cancelled":
+                        final_status = "cancelled"
+                        break
+
+                    calls = await AnalysisBackfillService._fetch_chunk(job, job.last_call_id, chunk_size, db)
+                    if not calls:
+                        break
+
+                    throttled = await AnalysisBackfillService._process_chunk(
+                        job, calls, openai_service, model, prompt_version, current_concurrency, db
+                    )
+
+                if throttled:
+                    current_concurrency = max(1, current_concurrency // 2)
+                    logger.warning(
+                        f"LLM API throttled re-analysis job {job_id}, pausing "
+                        f"{settings.ANALYSIS_BACKFILL_THROTTLE_PAUSE_SECONDS}s with concurrency {current_concurrency}"
+                    )
+                    await asyncio.sleep(settings.ANALYSIS_BACKFILL_THROTTLE_PAUSE_SECONDS)
+                else:
+                    current_concurrency = min(max_concurrency, current_concurrency + 1)
+
+        except Exception as e:
+            logger.error(f"Re-analysis job {job_id} failed: {str(e)}")
+            async with async_session_factory(bind=engine) as db:
+                await db.execute(
+                    update(AnalysisBackfillJob)
+                    .where(AnalysisBackfillJob.id == job_id)
+                    .values(status="failed", last_error=str(e), finished_at=func.now())
+                )
+                await db.commit()
+                return await AnalysisBackfillService.get_job(job_id, db)
+
+        async with async_session_factory(bind=engine) as db:
+            await db.execute(
+                update(AnalysisBackfillJob)
+                .where(AnalysisBackfillJob.id == job_id)
+                .values(status=final_status, finished_at=func.now())
+            )
+            await db.commit()
+            job = await AnalysisBackfillService.get_job(job_id, db)
+
+        logger.info(
+            f"Re-analysis job {job_id} {final_status}: {job.processed_count} processed, "
+            f"{job.failed_count} failed"
+        )
+        return job
@@ -0,0 +1,204 @@
+"""
+Analysis cache service.
+
+Content-addressed cache of transcript analysis results: an in-process LRU in
+front of the analysis_results table, so re-analysing an unchanged transcript
+with the same prompt does not call the LLM again.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+# In-process LRU: cache_key -> analysis result
+_memory_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+class AnalysisCacheService:
+    """Service for looking up and storing cached analysis results."""
+
+    @staticmethod
+    def build_cache_key(
+        transcript_messages: List[Dict[str, Any]],
+        service_record_data: Dict[str, Any],
+        organization_data: Dict[str, Any],
+        tags: List[str],
+        model: str,
+        prompt_version: int,
+        prompt_template: str
+    ) -> str:
+        """
+        Hash the analysis inputs into a cache key.
+
+        The prompt template text is hashed in as well, so editing a template
+        without bumping its version still misses the cache.
+
+        Args:
+            transcript_messages: Transcript messages ({"role", "message"})
+            service_record_data: Service record context
+            organization_data: Organization context
+            tags: Focus tags
+            model: LLM model name
+            prompt_version: Resolved prompt version
+            prompt_template: Prompt template text
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        material = {
+            "transcript": transcript_messages,
+            "service_record": service_record_data,
+            "organization": organization_data,
+            "tags": tags,
+            "model": model,
+            "prompt_version": prompt_version,
+            "prompt_sha256": hashlib.sha256(prompt_template.encode("utf-8")).hexdigest(),
+        }
+        encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _remember(cache_key: str, result: Dict[str, Any]) -> None:
+        """Put a result in the in-process LRU."""
+        _memory_cache[cache_key] = result
+        _memory_cache.move_to_end(cache_key)
+        while len(_memory_cache) > settings.ANALYSIS_CACHE_MEMORY_SIZE:
+            _memory_cache.popitem(last=False)
+
+    @staticmethod
+    async def get(cache_key: str, db: AsyncSession) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis result.
+
+        Args:
+            cache_key: Key from build_cache_key
+            db: Database session
+
+        Returns:
+            Optional[Dict]: Cached result, or None on a miss
+        """
+        if not settings.ANALYSIS_CACHE_ENABLED:
+            return None
+
+        result = _memory_cache.get(cache_key)
+        if result is not None:
+            _memory_cache.move_to_end(cache_key)
+            return result
+
+        db_result = await db.execute(
+            select(AnalysisResult.result).where(AnalysisResult.cache_key == cache_key)
+        )
+        result = db_result.scalar_one_or_none()
+        if result is not None:
+            AnalysisCacheService._remember(cache_key, result)
+        return result
+
+    @staticmethod
+    async def get_many(cache_keys: List[str], db: AsyncSession) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several cached results with at most one query.
+
+        Args:
+            cache_keys: Keys from build_cache_key
+            db: Database session
+
+        Returns:
+            Dict[str, Dict]: Cached results by key (misses are absent)
+        """
+        if not settings.ANALYSIS_CACHE_ENABLED:
+            return {}
+
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for cache_key in cache_keys:
+            if cache_key in _memory_cache:
+                _memory_cache.move_to_end(cache_key)
+                found[cache_key] = _memory_cache[cache_key]
+            else:
+                missing.append(cache_key)
+
+        if missing:
+            db_result = await db.execute(
+                select(AnalysisResult.cache_key, AnalysisResult.result)
+                .where(AnalysisResult.cache_key.in_(missing))
+            )
+            for cache_key, result in db_result.all():
+                AnalysisCacheService._remember(cache_key, result)
+                found[cache_key] = result
+
+        return found
+
+    @staticmethod
+    async def put_many(
+        entries: List[Dict[str, Any]],
+        db: AsyncSession
+    ) -> None:
+        """
+        Store several results in one statement. The caller commits.
+
+        Args:
+            entries: Dicts with cache_key, model, prompt_version and result
+            db: Database session
+        """
+        if not settings.ANALYSIS_CACHE_ENABLED or not entries:
+            return
+
+        await db.execute(
+            pg_insert(AnalysisResult)
+            .values(entries)
+            .on_conflict_do_nothing(index_elements=[AnalysisResult.cache_key])
+        )
+        for entry in entries:
+            AnalysisCacheService._remember(entry["cache_key"], entry["result"])
+
+    @staticmethod
+    async def put(
+        cache_key: str,
+        result: Dict[str, Any],
+        model: str,
+        prompt_version: int,
+        db: AsyncSession
+    ) -> None:
+        """
+        Store an analysis result. The caller commits.
+
+        Concurrent analyses of the same input are harmless: the first stored
+        result wins.
+
+        Args:
+            cache_key: Key from build_cache_key
+            result: Analysis result
+            model: LLM model name
+            prompt_version: Resolved prompt version
+            db: Database session
+        """
+        if not settings.ANALYSIS_CACHE_ENABLED:
+            return
+
+        await db.execute(
+            pg_insert(AnalysisResult)
+            .values(
+                cache_key=cache_key,
+                model=model,
+                prompt_version=prompt_version,
+                result=result
+            )
+            .on_conflict_do_nothing(index_elements=[AnalysisResult.cache_key])
+        )
+        AnalysisCacheService._remember(cache_key, result)
+
+    @staticmethod
+    def clear_memory() -> None:
+        """Drop every entry from the in-process LRU."""
+        _memory_cache.clear()
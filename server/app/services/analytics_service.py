@@ -6,11 +6,31 @@ from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import func, select, and_
+from sqlalchemy import Date, DateTime, cast, func, literal_column, select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import BadRequestException
-from app.models import Call, Campaign, ServiceRecord, Transcript, CallFeedback, Tag
+from app.models import (
+    Call, Campaign, ServiceRecord, Transcript, CallFeedback, Tag, DailyCallStats, DailyServiceRecordStats
+)
+
+
+# date_trunc unit for each trend period type
+PERIOD_UNITS = {"daily": "day", "weekly": "week", "monthly": "month"}
+
+
+def _utc_bucket(unit: str, column: Any) -> Any:
+    """
+    date_trunc a timestamp or date column into UTC buckets ("day", "week" or "month").
+    
+    The unit and time zone are inlined rather than bound so the expression is
+    identical in SELECT and GROUP BY.
+    """
+    if isinstance(column.type, Date):
+        # Rollup days are already UTC dates
+        return func.date_trunc(literal_column(f"'{unit}'"), cast(column, DateTime))
+    return func.date_trunc(literal_column(f"'{unit}'"), func.timezone(literal_column("'UTC'"), column))
 
 
 class AnalyticsService:
@@ -96,66 +116,152 @@ class AnalyticsService:
         Returns:
             Dict[str, Any]: Call metrics
         """
+        if settings.ANALYTICS_USE_DAILY_ROLLUPS:
+            return await AnalyticsService._get_call_metrics_from_rollups(
+                db=db,
+                organization_id=organization_id,
+                start_date=start_date,
+                end_date=end_date,
+                campaign_id=campaign_id
+            )
+        
         # Convert dates to datetime for comparison with database fields
         start_datetime = datetime.combine(start_date, datetime.min.time())
         end_datetime = datetime.combine(end_date, datetime.max.time())
         
-        # Base query for all calls in the date range
-        base_query = select(Call).where(
+        # Conditions for all calls in the date range
+        conditions = [
             Call.organization_id == organization_id,
             Call.created_at >= start_datetime,
             Call.created_at <= end_datetime
-        )
+        ]
         
         # Apply campaign filter if provided
         if campaign_id is not None:
-            base_query = base_query.where(Call.campaign_id == campaign_id)
+            conditions.append(Call.campaign_id == campaign_id)
         
-        # Execute query to get all calls
-        result = await db.execute(base_query)
-        calls = result.scalars().all()
+        # Status counts and average duration in a single aggregate query
+        summary_query = select(
+            func.count(Call.id).label("total_count"),
+            func.count(Call.id).filter(Call.status == "Completed").label("completed_count"),
+            func.count(Call.id).filter(Call.status == "Missed").label("missed_count"),
+            func.count(Call.id).filter(Call.status == "Scheduled").label("scheduled_count"),
+            func.avg(Call.duration_sec).filter(Call.status == "Completed").label("avg_duration")
+        ).where(*conditions)
+        summary = (await db.execute(summary_query)).one()
         
-        # Calculate metrics
-        total_count = len(calls)
-        completed_calls = [call for call in calls if call.status == "Completed"]
-        completed_count = len(completed_calls)
-        missed_calls = [call for call in calls if call.status == "Missed"]
-        missed_count = len(missed_calls)
-        scheduled_calls = [call for call in calls if call.status == "Scheduled"]
-        scheduled_count = len(scheduled_calls)
+        total_count = summary.total_count
+        completed_count = summary.completed_count
         
         # Calculate completion rate
         completion_rate = 0
         if total_count > 0:
             completion_rate = (completed_count / total_count) * 100
         
-        # Calculate average duration
-        durations = [call.duration for call in completed_calls if call.duration is not None]
-        avg_duration = sum(durations) / len(durations) if durations else 0
-        
-        # Get call types distribution
-        call_types = {}
-        for call in calls:
-            call_type = call.call_type
-            if call_type not in call_types:
-                call_types[call_type] = 0
-            call_types[call_type] += 1
+        # Get call types (direction) distribution
+        call_types_query = (
+            select(Call.direction, func.count(Call.id))
+            .where(*conditions)
+            .group_by(Call.direction)
+        )
+        call_types_result = await db.execute(call_types_query)
+        call_types = {call_type: count for call_type, count in call_types_result.all()}
         
         return {
             "total_count": total_count,
             "completed_count": completed_count,
-            "missed_count": missed_count,
-            "scheduled_count": scheduled_count,
+            "missed_count": summary.missed_count,
+            "scheduled_count": summary.scheduled_count,
             "completion_rate": completion_rate,
-            "avg_duration": avg_duration,
+            "avg_duration": float(summary.avg_duration) if summary.avg_duration is not None else 0,
             "call_types": call_types,
             "daily_distribution": await AnalyticsService._get_daily_distribution(
-                calls=calls,
+                db=db,
+                conditions=conditions,
                 start_date=start_date,
                 end_date=end_date
             )
         }
     
+    @staticmethod
+    async def _get_call_metrics_from_rollups(
+        db: AsyncSession,
+        organization_id: UUID,
+        start_date: date,
+        end_date: date,
+        campaign_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get call metrics from the daily_call_stats rollup.
+        
+        Same result as get_call_metrics, read from one row per
+        (day, status, direction) instead of one row per call.
+        
+        Args:
+            db: Database session
+            organization_id: Organization ID
+            start_date: Start date for metrics
+            end_date: End date for metrics
+            campaign_id: Filter by campaign ID
+            
+        Returns:
+            Dict[str, Any]: Call metrics
+        """
+        conditions = [
+            DailyCallStats.organization_id == organization_id,
+            DailyCallStats.day >= start_date,
+            DailyCallStats.day <= end_date
+        ]
+        if campaign_id is not None:
+            conditions.append(DailyCallStats.campaign_id == campaign_id)
+        
+        result = await db.execute(
+            select(
+                DailyCallStats.day,
+                DailyCallStats.status,
+                DailyCallStats.direction,
+                func.sum(DailyCallStats.call_count).label("call_count"),
+                func.sum(DailyCallStats.duration_count).label("duration_count"),
+                func.sum(DailyCallStats.total_duration_sec).label("total_duration_sec")
+            )
+            .where(*conditions)
+            .group_by(DailyCallStats.day, DailyCallStats.status, DailyCallStats.direction)
+        )
+        
+        # Initialize distribution with all dates in range
+        daily_distribution = {}
+        current_date = start_date
+        while current_date <= end_date:
+            daily_distribution[current_date.isoformat()] = 0
+            current_date += timedelta(days=1)
+        
+        status_counts: Dict[str, int] = {}
+        call_types: Dict[Any, int] = {}
+        completed_durations = 0
+        completed_duration_count = 0
+        
+        for row in result.all():
+            status_counts[row.status] = status_counts.get(row.status, 0) + row.call_count
+            call_types[row.direction] = call_types.get(row.direction, 0) + row.call_count
+            daily_distribution[row.day.isoformat()] += row.call_count
+            if row.status == "Completed":
+                completed_durations += row.total_duration_sec
+                completed_duration_count += row.duration_count
+        
+        total_count = sum(status_counts.values())
+        completed_count = status_counts.get("Completed", 0)
+        
+        return {
+            "total_count": total_count,
+            "completed_count": completed_count,
+            "missed_count": status_counts.get("Missed", 0),
+            "scheduled_count": status_counts.get("Scheduled", 0),
+            "completion_rate": (completed_count / total_count) * 100 if total_count > 0 else 0,
+            "avg_duration": completed_durations / completed_duration_count if completed_duration_count else 0,
+            "call_types": call_types,
+            "daily_distribution": daily_distribution
+        }
+    
     @staticmethod
     async def get_service_record_metrics(
         db: AsyncSession,
@@ -366,23 +472,28 @@ class AnalyticsService:
         
         # Get trend data based on metric type
         trend_data = []
-        if metric_type == "calls":
+        if not time_periods:
+            pass
+        elif metric_type == "calls":
             trend_data = await AnalyticsService._get_call_trends(
                 db=db,
                 organization_id=organization_id,
-                time_periods=time_periods
+                time_periods=time_periods,
+                period_type=time_period
             )
         elif metric_type == "service_records":
             trend_data = await AnalyticsService._get_service_record_trends(
                 db=db,
                 organization_id=organization_id,
-                time_periods=time_periods
+                time_periods=time_periods,
+                period_type=time_period
             )
         elif metric_type == "revenue":
             trend_data = await AnalyticsService._get_revenue_trends(
                 db=db,
                 organization_id=organization_id,
-                time_periods=time_periods
+                time_periods=time_periods,
+                period_type=time_period
             )
         
         return {
@@ -459,11 +570,88 @@ class AnalyticsService:
         
         return periods
     
+    @staticmethod
+    def _period_bucket(period_start: date, period_type: str) -> date:
+        """Start of the date_trunc bucket a generated period falls in."""
+        if period_type == "weekly":
+            return period_start - timedelta(days=period_start.weekday())
+        if period_type == "monthly":
+            return period_start.replace(day=1)
+        return period_start
+    
+    @staticmethod
+    async def _get_period_aggregates(
+        db: AsyncSession,
+        created_at: Any,
+        conditions: List[Any],
+        time_periods: List[Dict[str, date]],
+        period_type: str,
+        aggregates: List[Any]
+    ) -> Dict[date, Any]:
+        """
+        Compute aggregates for every period in one grouped query.
+        
+        Rows are bucketed with date_trunc (UTC) and right-joined to a
+        generate_series of all buckets, so empty periods come back as zeros.
+        
+        Args:
+            db: Database session
+            created_at: Timestamp column (raw rows) or day column (rollups) used for bucketing
+            conditions: Filters selecting the rows (besides the date range)
+            time_periods: Periods from _generate_time_periods
+            period_type: Type of period (daily, weekly, monthly)
+            aggregates: Labeled aggregate expressions
+            
+        Returns:
+            Dict[date, Any]: Result row per bucket start date
+        """
+        unit = PERIOD_UNITS[period_type]
+        if isinstance(created_at.type, Date):
+            range_start = time_periods[0]["start"]
+            range_end = time_periods[-1]["end"]
+        else:
+            range_start = datetime.combine(time_periods[0]["start"], datetime.min.time())
+            range_end = datetime.combine(time_periods[-1]["end"], datetime.max.time())
+        
+        bucket = _utc_bucket(unit, created_at).label("bucket")
+        totals = (
+            select(bucket, *aggregates)
+            .where(*conditions, created_at >= range_start, created_at <= range_end)
+            .group_by(bucket)
+            .subquery()
+        )
+        
+        first_bucket = datetime.combine(
+            AnalyticsService._period_bucket(time_periods[0]["start"], period_type), datetime.min.time()
+        )
+        last_bucket = datetime.combine(
+            AnalyticsService._period_bucket(time_periods[-1]["start"], period_type), datetime.min.time()
+        )
+        series = select(
+            func.generate_series(
+                cast(first_bucket, DateTime),
+                cast(last_bucket, DateTime),
+                literal_column(f"interval '1 {unit}'")
+            ).label("bucket")
+        ).subquery()
+        
+        query = (
+            select(
+                series.c.bucket,
+                *[func.coalesce(totals.c[aggregate.name], 0).label(aggregate.name) for aggregate in aggregates]
+            )
+            .select_from(series.outerjoin(totals, totals.c.bucket == series.c.bucket))
+            .order_by(series.c.bucket)
+        )
+        result = await db.execute(query)
+        return {row.bucket.date(): row for row in result.all()}
+    
     @staticmethod
     async def _get_call_trends(
         db: AsyncSession,
         organization_id: UUID,
-        time_periods: List[Dict[str, date]]
+        time_periods: List[Dict[str, date]],
+        period_type: str
     ) -> List[Dict[str, Any]]:
         """
         Get call trends for specified time periods.
@@ -472,41 +660,50 @@ class AnalyticsService:
             db: Database session
             organization_id: Organization ID
             time_periods: List of time periods
+            period_type: Type of period (daily, weekly, monthly)
             
         Returns:
             List[Dict[str, Any]]: Call trend data
         """
+        if settings.ANALYTICS_USE_DAILY_ROLLUPS:
+            created_at = DailyCallStats.day
+            conditions = [DailyCallStats.organization_id == organization_id]
+            aggregates = [
+                func.sum(DailyCallStats.call_count).label("total_count"),
+                func.sum(DailyCallStats.call_count).filter(DailyCallStats.status == "Completed").label("completed_count"),
+                func.sum(DailyCallStats.call_count).filter(DailyCallStats.status == "Missed").label("missed_count")
+            ]
+        else:
+            created_at = Call.created_at
+            conditions = [Call.organization_id == organization_id]
+            aggregates = [
+                func.count(Call.id).label("total_count"),
+                func.count(Call.id).filter(Call.status == "Completed").label("completed_count"),
+                func.count(Call.id).filter(Call.status == "Missed").label("missed_count")
+            ]
+        
+        rows = await AnalyticsService._get_period_aggregates(
+            db=db,
+            created_at=created_at,
+            conditions=conditions,
+            time_periods=time_periods,
+            period_type=period_type,
+            aggregates=aggregates
+        )
+        
         trend_data = []
         
         for period in time_periods:
-            start = period["start"]
-            end = period["end"]
-            
-            # Convert to datetime for database comparison
-            start_datetime = datetime.combine(start, datetime.min.time())
-            end_datetime = datetime.combine(end, datetime.max.time())
-            
-            # Query calls for this period
-            query = select(Call).where(
-                Call.organization_id == organization_id,
-                Call.created_at >= start_datetime,
-                Call.created_at <= end_datetime
-            )
-            
-            result = await db.execute(query)
-            calls = result.scalars().all()
-            
-            # Calculate metrics
-            total_count = len(calls)
-            completed_count = len([call for call in calls if call.status == "Completed"])
-            missed_count = len([call for call in calls if call.status == "Missed"])
+            row = rows.get(AnalyticsService._period_bucket(period["start"], period_type))
+            total_count = row.total_count if row else 0
+            completed_count = row.completed_count if row else 0
             
             trend_data.append({
-                "period_start": start.isoformat(),
-                "period_end": end.isoformat(),
+                "period_start": period["start"].isoformat(),
+                "period_end": period["end"].isoformat(),
                 "total_count": total_count,
                 "completed_count": completed_count,
-                "missed_count": missed_count,
+                "missed_count": row.missed_count if row else 0,
                 "completion_rate": (completed_count / total_count * 100) if total_count > 0 else 0
             })
         
@@ -516,7 +713,8 @@ class AnalyticsService:
     async def _get_service_record_trends(
         db: AsyncSession,
         organization_id: UUID,
-        time_periods: List[Dict[str, date]]
+        time_periods: List[Dict[str, date]],
+        period_type: str
     ) -> List[Dict[str, Any]]:
         """
         Get service record trends for specified time periods.
@@ -525,38 +723,48 @@ class AnalyticsService:
             db: Database session
             organization_id: Organization ID
             time_periods: List of time periods
+            period_type: Type of period (daily, weekly, monthly)
             
         Returns:
             List[Dict[str, Any]]: Service record trend data
         """
+        if settings.ANALYTICS_USE_DAILY_ROLLUPS:
+            created_at = DailyServiceRecordStats.day
+            conditions = [DailyServiceRecordStats.organization_id == organization_id]
+            aggregates = [
+                func.sum(DailyServiceRecordStats.record_count).label("total_count"),
+                func.sum(DailyServiceRecordStats.record_count)
+                .filter(DailyServiceRecordStats.status == "Completed").label("completed_count")
+            ]
+        else:
+            created_at = ServiceRecord.created_at
+            conditions = [ServiceRecord.organization_id == organization_id]
+            aggregates = [
+                func.count(ServiceRecord.id).label("total_count"),
+                func.count(ServiceRecord.id).filter(ServiceRecord.status == "Completed").label("completed_count")
+            ]
+        
+        rows = await AnalyticsService._get_period_aggregates(
+            db=db,
+            created_at=created_at,
+            conditions=conditions,
+            time_periods=time_periods,
+            period_type=period_type,
+            aggregates=aggregates
+        )
+        
         trend_data = []
         
         for period in time_periods:
-            start = period["start"]
-            end = period["end"]
-            
-            # Convert to datetime for database comparison
-            start_datetime = datetime.combine(start, datetime.min.time())
-            end_datetime = datetime.combine(end, datetime.max.time())
-            
-            # Query service records for this period
-            query = select(ServiceRecord).where(
-                ServiceRecord.organization_id == organization_id,
-                ServiceRecord.created_at >= start_datetime,
-                ServiceRecord.created_at <= end_datetime
-            )
-            
-            result = await db.execute(query)
-            records = result.scalars().all()
-            
-            # Calculate metrics
-            total_count = len(records)
-            completed_count = len([record for record in records if record.status == "Completed"])
-            total_amount = sum(record.total_amount for record in records if record.total_amount)
+            row = rows.get(AnalyticsService._period_bucket(period["start"], period_type))
+            total_count = row.total_count if row else 0
+            completed_count = row.completed_count if row else 0
+            # Service records do not store an amount
+            total_amount = 0
             
             trend_data.append({
-                "period_start": start.isoformat(),
-                "period_end": end.isoformat(),
+                "period_start": period["start"].isoformat(),
+                "period_end": period["end"].isoformat(),
                 "total_count": total_count,
                 "completed_count": completed_count,
                 "total_amount": total_amount,
@@ -570,7 +778,8 @@ class AnalyticsService:
     async def _get_revenue_trends(
         db: AsyncSession,
         organization_id: UUID,
-        time_periods: List[Dict[str, date]]
+        time_periods: List[Dict[str, date]],
+        period_type: str
     ) -> List[Dict[str, Any]]:
         """
         Get revenue trends for specified time periods.
@@ -579,37 +788,41 @@ class AnalyticsService:
             db: Database session
             organization_id: Organization ID
             time_periods: List of time periods
+            period_type: Type of period (daily, weekly, monthly)
             
         Returns:
             List[Dict[str, Any]]: Revenue trend data
         """
+        if settings.ANALYTICS_USE_DAILY_ROLLUPS:
+            rows = await AnalyticsService._get_period_aggregates(
+                db=db,
+                created_at=DailyServiceRecordStats.day,
+                conditions=[DailyServiceRecordStats.organization_id == organization_id],
+                time_periods=time_periods,
+                period_type=period_type,
+                aggregates=[func.sum(DailyServiceRecordStats.record_count).label("record_count")]
+            )
+        else:
+            rows = await AnalyticsService._get_period_aggregates(
+                db=db,
+                created_at=ServiceRecord.created_at,
+                conditions=[ServiceRecord.organization_id == organization_id],
+                time_periods=time_periods,
+                period_type=period_type,
+                aggregates=[func.count(ServiceRecord.id).label("record_count")]
+            )
+        
         trend_data = []
         
         for period in time_periods:
-            start = period["start"]
-            end = period["end"]
-            
-            # Convert to datetime for database comparison
-            start_datetime = datetime.combine(start, datetime.min.time())
-            end_datetime = datetime.combine(end, datetime.max.time())
-            
-            # Query service records for this period
-            query = select(ServiceRecord).where(
-                ServiceRecord.organization_id == organization_id,
-                ServiceRecord.created_at >= start_datetime,
-                ServiceRecord.created_at <= end_datetime
-            )
-            
-            result = await db.execute(query)
-            records = result.scalars().all()
-            
-            # Calculate revenue metrics
-            total_revenue = sum(record.total_amount for record in records if record.total_amount)
-            record_count = len(records)
+            row = rows.get(AnalyticsService._period_bucket(period["start"], period_type))
+            record_count = row.record_count if row else 0
+            # Service records do not store an amount
+            total_revenue = 0
             
             trend_data.append({
-                "period_start": start.isoformat(),
-                "period_end": end.isoformat(),
+                "period_start": period["start"].isoformat(),
+                "period_end": period["end"].isoformat(),
                 "total_revenue": total_revenue,
                 "record_count": record_count,
                 "avg_revenue_per_record": total_revenue / record_count if record_count > 0 else 0
@@ -619,7 +832,8 @@ class AnalyticsService:
     
     @staticmethod
     async def _get_daily_distribution(
-        calls: List[Call],
+        db: AsyncSession,
+        conditions: List[Any],
         start_date: date,
         end_date: date
     ) -> Dict[str, int]:
@@ -627,7 +841,8 @@ class AnalyticsService:
         Get daily distribution of calls.
         
         Args:
-            calls: List of calls
+            db: Database session
+            conditions: Filters selecting the calls
             start_date: Start date
             end_date: End date
             
@@ -641,13 +856,17 @@ class AnalyticsService:
             distribution[current_date.isoformat()] = 0
             current_date += timedelta(days=1)
         
-        # Count calls by date
-        for call in calls:
-            if call.created_at:
-                call_date = call.created_at.date()
-                if start_date <= call_date <= end_date:
-                    date_key = call_date.isoformat()
-                    distribution[date_key] += 1
+        # Count calls by (UTC) date in the database
+        day = _utc_bucket("day", Call.created_at).label("day")
+        result = await db.execute(
+            select(day, func.count(Call.id))
+            .where(*conditions)
+            .group_by(day)
+        )
+        for call_day, count in result.all():
+            date_key = call_day.date().isoformat()
+            if date_key in distribution:
+                distribution[date_key] += count
         
         return distribution 
     
@@ -4,17 +4,52 @@ This service mirrors OpenAIService functionality but uses any-llm to support mul
 Supports: OpenAI, Anthropic, Mistral, Groq, and Ollama models.
 """
 
+import asyncio
 import logging
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from app.core.config import settings
 # Import any-llm with support for selected providers
 from any_llm import completion
 
+try:
+    # Native async client, available in newer any-llm releases
+    from any_llm import acompletion
+except ImportError:
+    acompletion = None
+
 logger = logging.getLogger(__name__)
 
+# Bounded pool for the synchronous completion() fallback so LLM calls never run on the event loop
+_completion_executor: Optional[ThreadPoolExecutor] = None
+
+# Per-provider concurrency caps, created lazily
+_provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _get_completion_executor() -> ThreadPoolExecutor:
+    """Get the shared executor for blocking completion() calls."""
+    global _completion_executor
+    if _completion_executor is None:
+        _completion_executor = ThreadPoolExecutor(
+            max_workers=settings.LLM_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="anyllm"
+        )
+    return _completion_executor
+
+
+def _get_provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Get the concurrency cap for a provider (LLM_PROVIDER_CONCURRENCY overrides the default)."""
+    if provider not in _provider_semaphores:
+        limit = settings.LLM_PROVIDER_CONCURRENCY.get(provider, settings.LLM_DEFAULT_PROVIDER_CONCURRENCY)
+        _provider_semaphores[provider] = asyncio.Semaphore(limit)
+    return _provider_semaphores[provider]
+
+
 class AnyLLMService:
     def __init__(self):
         # Set API keys from settings for all supported providers
@@ -230,7 +265,8 @@ class AnyLLMService:
             if provider == 'openai':
                 # OpenAI has native JSON schema support
                 # Match the exact format used in openai_service.py
-                response = completion(
+                response = await self._complete(
+                    provider,
                     model=model_to_use,
                     messages=messages,
                     # Add max_tokens and temperature from settings
@@ -266,7 +302,8 @@ class AnyLLMService:
                     # Use the configured temperature but slightly lower for better JSON formatting
                     provider_temperature = min(settings.OPENAI_TEMPERATURE, 0.2)
                 
-                response = completion(
+                response = await self._complete(
+                    provider,
                     model=model_to_use,
                     messages=enhanced_messages,
                     # Set max_tokens and temperature with provider-specific adjustments
@@ -276,7 +313,8 @@ class AnyLLMService:
             else:
                 # Fallback for any unknown provider - try without special handling
                 logger.warning(f"Unknown provider '{provider}'. Using default completion method.")
-                response = completion(
+                response = await self._complete(
+                    provider,
                     model=model_to_use,
                     messages=messages,
                     # Still use the configured parameters
@@ -297,6 +335,46 @@ class AnyLLMService:
             # Here we just re-raise the exception as in the original
             raise
 
+    async def _complete(self, provider: str, **kwargs) -> Any:
+        """
+        Run a completion without blocking the event loop.
+        
+        Uses any-llm's native async client when available, otherwise runs the
+        synchronous client in a bounded thread pool. Calls are capped per
+        provider and time out after LLM_REQUEST_TIMEOUT_SECONDS.
+        
+        A timed-out thread cannot be stopped and keeps running the request,
+        so on the thread pool path the provider slot is only released once
+        the thread actually finishes. The cap therefore bounds the requests
+        really in flight, including abandoned ones.
+        
+        Raises:
+            asyncio.TimeoutError: If the provider does not answer in time
+        """
+        semaphore = _get_provider_semaphore(provider)
+        
+        if acompletion is not None:
+            async with semaphore:
+                return await asyncio.wait_for(acompletion(**kwargs), timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS)
+        
+        await semaphore.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            request = loop.run_in_executor(_get_completion_executor(), partial(completion, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        
+        def release_slot(finished: asyncio.Future):
+            semaphore.release()
+            # Consume the outcome of a request nobody awaits anymore
+            if not finished.cancelled():
+                finished.exception()
+        
+        request.add_done_callback(release_slot)
+        # Shielded, so a timeout abandons the request without marking it done early
+        return await asyncio.wait_for(asyncio.shield(request), timeout=settings.LLM_REQUEST_TIMEOUT_SECONDS)
+
     def _build_analysis_prompt(
         self,
         transcript_messages: List[Dict[str, Any]],
@@ -5,17 +5,32 @@ API Key service for managing API keys.
 import secrets
 import hashlib
 import json
-from typing import List, Optional
-from datetime import datetime
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 from uuid import UUID
-from sqlalchemy import select, and_, func
+from sqlalchemy import DateTime, Integer, column, select, and_, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
+from app.core.database import detached_copy
 from app.models import ApiKey, User
 from app.schemas import ApiKeyCreate, ApiKeyUpdate, ApiKeyResponse, ApiKeySecret
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
+
+# Verified keys: secret_hash -> (expires_at, detached ApiKey with its organization), LRU order
+_verified_keys: "OrderedDict[str, Tuple[float, ApiKey]]" = OrderedDict()
+
+
+# Usage not yet written: api_key_id -> (request count, last used at)
+_pending_usage: Dict[UUID, Tuple[int, datetime]] = {}
+
 
 class ApiKeyService:
     """Service for managing API keys."""
@@ -203,6 +218,7 @@ class ApiKeyService:
         
         await db.commit()
         await db.refresh(api_key)
+        ApiKeyService.invalidate_cache(api_key.secret_hash)
         
         return await ApiKeyService.get_api_key(api_key_id, organization_id, db)
     
@@ -230,18 +246,58 @@ class ApiKeyService:
         
         await db.delete(api_key)
         await db.commit()
+        ApiKeyService.invalidate_cache(api_key.secret_hash)
         
         return True
     
+    @staticmethod
+    def invalidate_cache(secret_hash: str) -> None:
+        """Forget a verified key after it was updated or deleted."""
+        _verified_keys.pop(secret_hash, None)
+    
+    @staticmethod
+    def invalidate_organization_cache(organization_id: UUID) -> None:
+        """Forget every verified key of an organization after the organization changed."""
+        for secret_hash in [h for h, (_, key) in _verified_keys.items() if key.organization_id == organization_id]:
+            del _verified_keys[secret_hash]
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget every verified key."""
+        _verified_keys.clear()
+    
     @staticmethod
     async def verify_api_key(
         raw_key: str,
         db: AsyncSession
     ) -> Optional[ApiKey]:
-        """Verify an API key and return the associated record."""
+        """
+        Verify an API key and return the associated record.
+        
+        Verified keys are cached for API_KEY_CACHE_TTL_SECONDS (LRU-bounded by
+        API_KEY_CACHE_SIZE), so repeat requests skip the database. The cached
+        record and its organization are detached, read-only snapshots shared
+        between requests. A cache hit is only served while its entry has not
+        expired and the snapshot is still active; anything else goes back to
+        the database.
+        
+        Updates and deletes through this service invalidate the local cache at
+        once. A key deactivated or deleted by another process can keep
+        authenticating here for at most API_KEY_CACHE_TTL_SECONDS; API keys
+        have no expiry date of their own, so that TTL is the whole bound.
+        """
         
         hashed_key = ApiKeyService.hash_api_key(raw_key)
         
+        ttl = settings.API_KEY_CACHE_TTL_SECONDS
+        cached = _verified_keys.get(hashed_key)
+        if cached is not None:
+            expires_at, api_key = cached
+            if expires_at > time.monotonic() and api_key.is_active:
+                _verified_keys.move_to_end(hashed_key)
+                return api_key
+            del _verified_keys[hashed_key]
+        
         result = await db.execute(
             select(ApiKey)
             .options(selectinload(ApiKey.organization))
@@ -253,16 +309,84 @@ class ApiKeyService:
             )
         )
         
-        return result.scalar_one_or_none()
+        record = result.scalar_one_or_none()
+        if record is None or ttl <= 0:
+            return record
+        
+        api_key = detached_copy(record)
+        api_key.organization = detached_copy(record.organization) if record.organization else None
+        
+        _verified_keys[hashed_key] = (time.monotonic() + ttl, api_key)
+        while len(_verified_keys) > settings.API_KEY_CACHE_SIZE:
+            _verified_keys.popitem(last=False)
+        
+        return api_key
     
     @staticmethod
-    async def update_usage(
-        api_key: ApiKey,
-        db: AsyncSession
-    ) -> None:
-        """Update API key usage statistics."""
+    def record_usage(api_key: ApiKey) -> None:
+        """
+        Count a request against an API key without touching the database.
+        
+        Counts are written in bulk by flush_usage every
+        API_KEY_USAGE_FLUSH_INTERVAL_SECONDS.
+        """
+        count, _ = _pending_usage.get(api_key.id, (0, None))
+        _pending_usage[api_key.id] = (count + 1, datetime.now(timezone.utc))
+    
+    @staticmethod
+    async def flush_usage(db: AsyncSession) -> int:
+        """
+        Write pending usage counts in one UPDATE ... FROM (VALUES ...).
         
-        api_key.last_used_at = datetime.utcnow()
-        api_key.usage_count += 1
+        The order in which an UPDATE ... FROM visits rows is up to the
+        planner, so the rows are first locked with SELECT ... ORDER BY id
+        FOR UPDATE. Concurrent flushes from several workers then take their
+        locks in the same order and cannot deadlock. On failure the counts
+        are put back and retried on the next flush.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            int: Number of API keys updated
+        """
+        global _pending_usage
+        if not _pending_usage:
+            return 0
+        
+        pending, _pending_usage = _pending_usage, {}
+        usage = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("uses", Integer),
+            column("last_used_at", DateTime(timezone=True)),
+            name="usage"
+        ).data([
+            (api_key_id, count, last_used_at)
+            for api_key_id, (count, last_used_at) in pending.items()
+        ])
+        
+        try:
+            await db.execute(
+                select(ApiKey.id)
+                .where(ApiKey.id.in_(list(pending)))
+                .order_by(ApiKey.id)
+                .with_for_update()
+            )
+            await db.execute(
+                update(ApiKey)
+                .where(ApiKey.id == usage.c.id)
+                .values(
+                    usage_count=ApiKey.usage_count + usage.c.uses,
+                    last_used_at=func.greatest(ApiKey.last_used_at, usage.c.last_used_at)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            for api_key_id, (count, last_used_at) in pending.items():
+                pending_count, pending_last_used_at = _pending_usage.get(api_key_id, (0, last_used_at))
+                _pending_usage[api_key_id] = (count + pending_count, max(last_used_at, pending_last_used_at))
+            raise
         
-        await db.commit()
\ No newline at end of file
+        return len(pending)
\ No newline at end of file
@@ -9,8 +9,10 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models import Call, CallFeedback, Organization, ServiceRecord, Tag, Transcript
-from app.services.openai_service import OpenAIService
+from app.services.analysis_cache_service import AnalysisCacheService
+from app.services.openai_service import PARSE_ERROR_SUMMARY, OpenAIService
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +65,7 @@ class CallAnalysisService:
                 service_record = None
             
             # 4. Get transcript messages
-            transcript_query = select(Transcript).where(Transcript.call_id == call_id)
+            transcript_query = select(Transcript).where(Transcript.call_id == call_id).order_by(Transcript.id)
             transcript_result = await db.execute(transcript_query)
             transcripts = transcript_result.scalars().all()
             
@@ -79,36 +81,30 @@ class CallAnalysisService:
             tags = [tag.name for tag in tag_result.scalars().all()]
             
             # 6. Prepare data for analysis
-            transcript_messages = [
-                {"role": t.role, "message": t.message} for t in transcripts
-            ]
-            
-            service_record_data = {}
-            if service_record:
-                service_record_data = {
-                    "customer_name": service_record.customer_name,
-                    "service_type": service_record.service_type,
-                    "vehicle_info": service_record.vehicle_info,
-                    "service_advisor_name": service_record.service_advisor_name,
-                }
-            
-            organization_data = {
-                "name": organization.name,
-                "description": organization.description,
-                "service_center_description": organization.service_center_description,
-                "focus_areas": organization.focus_areas,
-                "areas_to_improve": tags,  # This field doesn't exist in the model yet
-                "location": organization.location,
-            }
+            inputs = CallAnalysisService.build_analysis_inputs(
+                organization, service_record, transcripts, tags
+            )
             
-            # 7. Process the analysis with OpenAI
+            # 7. Reuse a cached result for identical inputs, otherwise run the analysis with OpenAI
             openai_service = OpenAIService()
-            analysis_result = await openai_service.analyze_call_transcript(
-                transcript_messages,
-                service_record_data,
-                organization_data,
-                tags
+            prompt_version = openai_service.resolve_prompt_version()
+            cache_key = CallAnalysisService.build_cache_key(
+                inputs, openai_service, settings.OPENAI_MODEL, prompt_version
             )
+            analysis_result = await AnalysisCacheService.get(cache_key, db)
+            
+            if analysis_result is None:
+                analysis_result = await openai_service.analyze_call_transcript(
+                    **inputs,
+                    prompt_version=prompt_version
+                )
+                # Unparseable responses are not cached so the next attempt calls the model again
+                if CallAnalysisService.is_cacheable(analysis_result):
+                    await AnalysisCacheService.put(
+                        cache_key, analysis_result, settings.OPENAI_MODEL, prompt_version, db
+                    )
+            else:
+                logger.info(f"Using cached analysis for call {call_id}")
             
             # 8. Store analysis results in the database
             await CallAnalysisService._store_analysis_results(call, analysis_result, db)
@@ -124,6 +120,111 @@ class CallAnalysisService:
             logger.error(f"Error in after-call analysis: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    @staticmethod
+    def build_analysis_inputs(
+        organization: Organization,
+        service_record: Optional[ServiceRecord],
+        transcripts: List[Transcript],
+        tags: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Build the arguments for OpenAIService.analyze_call_transcript.
+        
+        Args:
+            organization: Call organization
+            service_record: Call service record, if any
+            transcripts: Transcript rows in message order
+            tags: Organization's "areas_to_focus" tag names
+            
+        Returns:
+            Dict: transcript_messages, service_record_data, organization_data and tags
+        """
+        transcript_messages = [
+            {"role": t.role, "message": t.message} for t in transcripts
+        ]
+        
+        service_record_data = {}
+        if service_record:
+            service_record_data = {
+                "customer_name": service_record.customer_name,
+                "service_type": service_record.service_type,
+                "vehicle_info": service_record.vehicle_info,
+                "service_advisor_name": service_record.service_advisor_name,
+            }
+        
+        organization_data = {
+            "name": organization.name,
+            "description": organization.description,
+            "service_center_description": organization.service_center_description,
+            "focus_areas": organization.focus_areas,
+            "areas_to_improve": tags,  # This field doesn't exist in the model yet
+            "location": organization.location,
+        }
+        
+        return {
+            "transcript_messages": transcript_messages,
+            "service_record_data": service_record_data,
+            "organization_data": organization_data,
+            "tags": tags,
+        }
+    
+    @staticmethod
+    def build_cache_key(
+        inputs: Dict[str, Any],
+        openai_service: OpenAIService,
+        model: str,
+        prompt_version: int
+    ) -> str:
+        """
+        Get the analysis cache key for a set of inputs.
+        
+        Args:
+            inputs: Result of build_analysis_inputs
+            openai_service: Service whose prompt templates are used
+            model: LLM model name
+            prompt_version: Resolved prompt version
+            
+        Returns:
+            str: Cache key
+        """
+        return AnalysisCacheService.build_cache_key(
+            inputs["transcript_messages"],
+            inputs["service_record_data"],
+            inputs["organization_data"],
+            inputs["tags"],
+            model,
+            prompt_version,
+            openai_service._get_prompt_template(prompt_version)
+        )
+    
+    @staticmethod
+    def is_cacheable(analysis: Dict[str, Any]) -> bool:
+        """Whether an analysis result may be cached (model output was parsed)."""
+        return analysis.get("call_summary") != PARSE_ERROR_SUMMARY
+    
+    @staticmethod
+    def build_feedback_rows(call_id: int, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build call_feedback rows for an analysis result.
+        
+        Args:
+            call_id: Call ID
+            analysis: Analysis results from OpenAI
+            
+        Returns:
+            List[Dict]: One row per positive mention and detractor
+        """
+        rows = []
+        for feedback_type, key in (("positives", "positive_mentions"), ("detractors", "detractors")):
+            for mention in analysis.get(key) or []:
+                clean_mention = mention[1:-1].strip() if mention.startswith('"') and mention.endswith('"') else mention.strip()
+                rows.append({
+                    "call_id": call_id,
+                    "type": feedback_type,
+                    "kpis": clean_mention  # Store as a single string, not an array
+                })
+        return rows
+    
     @staticmethod
     async def _store_analysis_results(
         call: Call,
@@ -143,31 +244,9 @@ class CallAnalysisService:
         call.nps_score = analysis.get("nps_score")
         call.feedback_summary = analysis.get("overall_feedback")
         
-        # 2. Create call_feedback records for positive mentions
-        positive_mentions = analysis.get("positive_mentions", [])
-        if positive_mentions:
-            # Create individual feedback records for each positive mention
-            for mention in positive_mentions:
-                clean_mention = mention[1:-1].strip() if mention.startswith('"') and mention.endswith('"') else mention.strip()
-                positive_feedback = CallFeedback(
-                    call_id=call.id,
-                    type="positives",
-                    kpis=clean_mention  # Store as a single string, not an array
-                )
-                db.add(positive_feedback)
-        
-        # 3. Create call_feedback records for detractors
-        detractors = analysis.get("detractors", [])
-        if detractors:
-            # Create individual feedback records for each detractor
-            for detractor in detractors:
-                clean_detractor = detractor[1:-1].strip() if detractor.startswith('"') and detractor.endswith('"') else detractor.strip()
-                negative_feedback = CallFeedback(
-                    call_id=call.id,
-                    type="detractors",
-                    kpis=clean_detractor  # Store as a single string, not an array
-                )
-                db.add(negative_feedback)
+        # 2. Create call_feedback records for positive mentions and detractors
+        for row in CallAnalysisService.build_feedback_rows(call.id, analysis):
+            db.add(CallFeedback(**row))
         
-        # 4. Commit all changes
+        # 3. Commit all changes
         await db.commit() 
\ No newline at end of file
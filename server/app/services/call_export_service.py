@@ -0,0 +1,233 @@
+"""
+Call export service.
+
+Streams an organization's calls as NDJSON or CSV for API integrations. Calls
+are read through a server-side cursor in batches of PUBLIC_EXPORT_BATCH_SIZE,
+and each batch's transcripts and feedback are loaded with one query each,
+so memory stays flat however many calls are exported.
+"""
+
+import csv
+import io
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_factory, get_engine
+from app.models import Call, CallFeedback, Transcript
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# CSV columns, in order (transcript and feedback only when requested)
+CSV_CALL_COLUMNS = [
+    "id", "status", "customer_number", "direction", "call_reason", "service_record_id",
+    "campaign_id", "created_at", "updated_at", "start_time", "end_time", "duration_sec",
+    "ended_reason", "cost", "nps_score", "call_summary", "feedback_summary"
+]
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """ISO 8601 string or None."""
+    return value.isoformat() if value else None
+
+
+class CallExportService:
+    """Service for streaming call exports."""
+
+    @staticmethod
+    def serialize_call(call: Call) -> Dict[str, Any]:
+        """
+        Convert a call to its export representation.
+
+        Args:
+            call: Call
+
+        Returns:
+            Dict: JSON-serializable call fields
+        """
+        return {
+            "id": str(call.id),
+            "status": call.status,
+            "customer_number": call.customer_number,
+            "direction": call.direction,
+            "call_reason": call.call_reason,
+            "service_record_id": call.service_record_id,
+            "campaign_id": call.campaign_id,
+            "created_at": _isoformat(call.created_at),
+            "updated_at": _isoformat(call.updated_at),
+            "start_time": _isoformat(call.start_time),
+            "end_time": _isoformat(call.end_time),
+            "duration_sec": call.duration_sec,
+            "ended_reason": call.ended_reason,
+            "cost": float(call.cost) if call.cost is not None else None,
+            "nps_score": call.nps_score,
+            "call_summary": call.call_summary,
+            "feedback_summary": call.feedback_summary,
+        }
+
+    @staticmethod
+    async def _load_transcripts(call_ids: List[int], db: AsyncSession) -> Dict[int, List[Dict[str, Any]]]:
+        """Transcript messages of a batch of calls, in speaking order."""
+        result = await db.execute(
+            select(Transcript.call_id, Transcript.role, Transcript.message, Transcript.time)
+            .where(Transcript.call_id.in_(call_ids))
+            .order_by(Transcript.call_id, Transcript.time, Transcript.id)
+        )
+        transcripts = defaultdict(list)
+        for call_id, role, message, time in result.all():
+            transcripts[call_id].append({"role": role, "message": message, "time": time})
+        return transcripts
+
+    @staticmethod
+    async def _load_feedback(call_ids: List[int], db: AsyncSession) -> Dict[int, List[Dict[str, Any]]]:
+        """Feedback mentions of a batch of calls."""
+        result = await db.execute(
+            select(CallFeedback.call_id, CallFeedback.type, CallFeedback.kpis)
+            .where(CallFeedback.call_id.in_(call_ids))
+            .order_by(CallFeedback.call_id, CallFeedback.id)
+        )
+        feedback = defaultdict(list)
+        for call_id, feedback_type, kpis in result.all():
+            feedback[call_id].append({"type": feedback_type, "kpis": kpis})
+        return feedback
+
+    @staticmethod
+    async def iter_call_batches(
+        organization_id: UUID,
+        db: AsyncSession,
+        updated_since: Optional[datetime] = None,
+        status: Optional[str] = None,
+        include_transcripts: bool = False,
+        include_feedback: bool = False,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield an organization's calls in batches, oldest change first.
+
+        Calls are ordered by (updated_at, id). A row committed late by a
+        long transaction can carry an older updated_at than rows already
+        exported, so incremental clients resume from a watermark with some
+        overlap and dedupe on (id, updated_at).
+
+        Args:
+            organization_id: Organization ID
+            db: Database session (holds the cursor's transaction)
+            updated_since: Only calls updated at or after this time
+            status: Only calls with this status
+            include_transcripts: Attach transcript messages
+            include_feedback: Attach feedback mentions
+            batch_size: Rows per cursor fetch (defaults to PUBLIC_EXPORT_BATCH_SIZE)
+
+        Yields:
+            List[Dict]: Serialized calls
+        """
+        batch_size = batch_size or settings.PUBLIC_EXPORT_BATCH_SIZE
+
+        query = select(Call).where(Call.organization_id == organization_id)
+        if updated_since is not None:
+            query = query.where(Call.updated_at >= updated_since)
+        if status:
+            query = query.where(Call.status == status)
+        query = query.order_by(Call.updated_at, Call.id).execution_options(yield_per=batch_size)
+
+        calls = await db.stream_scalars(query)
+        async for batch in calls.partitions():
+            call_ids = [call.id for call in batch]
+            transcripts = await CallExportService._load_transcripts(call_ids, db) if include_transcripts else {}
+            feedback = await CallExportService._load_feedback(call_ids, db) if include_feedback else {}
+
+            rows = []
+            for call in batch:
+                row = CallExportService.serialize_call(call)
+                if include_transcripts:
+                    row["transcript"] = transcripts.get(call.id, [])
+                if include_feedback:
+                    row["feedback"] = feedback.get(call.id, [])
+                rows.append(row)
+
+            # Loaded calls are not needed again; keep the identity map from growing
+            db.expunge_all()
+            yield rows
+
+    @staticmethod
+    def _csv_row(row: Dict[str, Any], include_transcripts: bool, include_feedback: bool) -> List[Any]:
+        """Flatten a serialized call into CSV cells."""
+        cells = [row[column] for column in CSV_CALL_COLUMNS]
+        if include_transcripts:
+            cells.append("\n".join(f"{m['role']}: {m['message']}" for m in row["transcript"]))
+        if include_feedback:
+            cells.append(json.dumps(row["feedback"], separators=(",", ":")))
+        return cells
+
+    @staticmethod
+    async def stream_export(
+        organization_id: UUID,
+        export_format: str = "ndjson",
+        updated_since: Optional[datetime] = None,
+        status: Optional[str] = None,
+        include_transcripts: bool = False,
+        include_feedback: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream an export as NDJSON lines or CSV text, one chunk per batch.
+
+        Opens its own session: the response body is produced after the
+        request's dependencies (and their session) have been closed.
+
+        Args:
+            organization_id: Organization ID
+            export_format: "ndjson" or "csv"
+            updated_since: Only calls updated at or after this time
+            status: Only calls with this status
+            include_transcripts: Attach transcript messages
+            include_feedback: Attach feedback mentions
+
+        Yields:
+            str: Encoded chunk
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            header = list(CSV_CALL_COLUMNS)
+            if include_transcripts:
+                header.append("transcript")
+            if include_feedback:
+                header.append("feedback")
+            writer.writerow(header)
+            yield buffer.getvalue()
+
+        exported = 0
+        async with async_session_factory(bind=get_engine()) as db:
+            try:
+                batches = CallExportService.iter_call_batches(
+                    organization_id,
+                    db,
+                    updated_since=updated_since,
+                    status=status,
+                    include_transcripts=include_transcripts,
+                    include_feedback=include_feedback
+                )
+                async for rows in batches:
+                    if export_format == "csv":
+                        buffer.seek(0)
+                        buffer.truncate()
+                        for row in rows:
+                            writer.writerow(CallExportService._csv_row(row, include_transcripts, include_feedback))
+                        chunk = buffer.getvalue()
+                    else:
+                        chunk = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+                    exported += len(rows)
+                    yield chunk
+            finally:
+                await db.rollback()
+
+        logger.info(f"Exported {exported} calls for organization {organization_id} as {export_format}")
@@ -0,0 +1,381 @@
+"""
+Call lease service.
+
+Atomic claim/lease operations that let several call initiator workers share
+the same queue without dialing a customer twice.
+"""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import timedelta
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Call, ServiceRecord
+
+logger = logging.getLogger(__name__)
+
+
+class CallLeaseService:
+    """Service for leasing queued calls to call initiator workers."""
+
+    @staticmethod
+    def generate_owner_id() -> str:
+        """
+        Build a lease owner identifier unique to this worker instance.
+
+        Returns:
+            str: "<hostname>:<pid>:<random suffix>"
+        """
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def _lease_expiry(lease_seconds: Optional[int] = None):
+        """SQL expression for the lease expiry timestamp."""
+        seconds = lease_seconds or settings.CALL_INITIATOR_LEASE_SECONDS
+        return func.now() + timedelta(seconds=seconds)
+
+    @staticmethod
+    async def claim_calls(
+        call_ids: Sequence[int],
+        owner: str,
+        db: AsyncSession,
+        lease_seconds: Optional[int] = None
+    ) -> List[int]:
+        """
+        Atomically claim queued calls and move them to 'In Progress'.
+
+        Rows are locked with FOR UPDATE SKIP LOCKED, so a row another worker is
+        claiming at the same moment is skipped instead of waited on. Only calls
+        that are still 'Queued' and not held by a live lease are claimed. The
+        caller must commit the session.
+
+        Args:
+            call_ids: Candidate call IDs
+            owner: Lease owner identifier
+            db: Database session
+            lease_seconds: Lease duration (defaults to CALL_INITIATOR_LEASE_SECONDS)
+
+        Returns:
+            List[int]: IDs of the calls that were claimed by this owner
+        """
+        if not call_ids:
+            return []
+
+        claimable = (
+            select(Call.id)
+            .where(
+                and_(
+                    Call.id.in_(call_ids),
+                    Call.status == "Queued",
+                    or_(
+                        Call.lease_expires_at.is_(None),
+                        Call.lease_expires_at < func.now()
+                    )
+                )
+            )
+            .with_for_update(skip_locked=True)
+        )
+
+        result = await db.execute(
+            update(Call)
+            .where(Call.id.in_(claimable.scalar_subquery()))
+            .values(
+                status="In Progress",
+                lease_owner=owner,
+                lease_expires_at=CallLeaseService._lease_expiry(lease_seconds),
+                dial_attempted_at=None
+            )
+            .returning(Call.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        claimed_ids = list(result.scalars().all())
+
+        if claimed_ids:
+            await db.execute(
+                update(ServiceRecord)
+                .where(
+                    ServiceRecord.id.in_(
+                        select(Call.service_record_id).where(Call.id.in_(claimed_ids))
+                    )
+                )
+                .values(status="In Progress")
+                .execution_options(synchronize_session="fetch")
+            )
+
+        return claimed_ids
+
+    @staticmethod
+    async def heartbeat(
+        call_ids: Sequence[int],
+        owner: str,
+        db: AsyncSession,
+        lease_seconds: Optional[int] = None
+    ) -> int:
+        """
+        Extend the leases held by an owner.
+
+        Args:
+            call_ids: Leased call IDs
+            owner: Lease owner identifier
+            db: Database session
+            lease_seconds: New lease duration from now
+
+        Returns:
+            int: Number of leases extended
+        """
+        if not call_ids:
+            return 0
+
+        result = await db.execute(
+            update(Call)
+            .where(and_(Call.id.in_(call_ids), Call.lease_owner == owner))
+            .values(lease_expires_at=CallLeaseService._lease_expiry(lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def mark_dial_attempted(call_id: int, owner: str, db: AsyncSession) -> bool:
+        """
+        Record that a call is about to be dialed, and commit.
+
+        Must be committed before the VAPI request is sent: once it is, an
+        expired lease on the call can no longer put it back in the queue.
+
+        Args:
+            call_id: Leased call ID
+            owner: Lease owner identifier
+            db: Database session
+
+        Returns:
+            bool: False if the lease is no longer held by this owner
+        """
+        result = await db.execute(
+            update(Call)
+            .where(and_(Call.id == call_id, Call.lease_owner == owner))
+            .values(dial_attempted_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def record_dial(
+        call_id: int,
+        owner: str,
+        vapi_call_id: Optional[str],
+        db: AsyncSession
+    ) -> int:
+        """
+        Store the VAPI call ID of an accepted dial and release its lease, and commit.
+
+        Args:
+            call_id: Leased call ID
+            owner: Lease owner identifier
+            vapi_call_id: ID VAPI assigned to the call
+            db: Database session
+
+        Returns:
+            int: Number of calls updated
+        """
+        values = {"lease_owner": None, "lease_expires_at": None}
+        if vapi_call_id:
+            values["vapi_call_id"] = vapi_call_id
+
+        result = await db.execute(
+            update(Call)
+            .where(and_(Call.id == call_id, Call.lease_owner == owner))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+
+    @staticmethod
+    async def fail_dial(call_id: int, owner: str, db: AsyncSession) -> int:
+        """
+        Mark a call whose VAPI request raised as 'Failed' and release its lease, and commit.
+
+        The request may still have reached VAPI, so the call is not dialed
+        again. Its service record is marked 'Failed' too.
+
+        Args:
+            call_id: Leased call ID
+            owner: Lease owner identifier
+            db: Database session
+
+        Returns:
+            int: Number of calls updated
+        """
+        rows = await CallLeaseService._update_leased(
+            Call.lease_owner == owner, Call.id == call_id, "Failed", "Failed", db, skip_locked=False
+        )
+        await db.commit()
+        return len(rows)
+
+    @staticmethod
+    async def release_calls(
+        call_ids: Sequence[int],
+        owner: str,
+        db: AsyncSession
+    ) -> int:
+        """
+        Release leases once every dial request has returned.
+
+        Accepted dials release their lease as soon as they are recorded (see
+        record_dial) and failed requests through fail_dial. Calls still
+        'In Progress' under this owner's lease are settled like expired
+        leases (see reclaim_expired_leases), so none is left 'In Progress'
+        without a lease, where nothing would ever pick it up again. Any
+        other lease is then cleared.
+
+        Args:
+            call_ids: Leased call IDs
+            owner: Lease owner identifier
+            db: Database session
+
+        Returns:
+            int: Number of leases released
+        """
+        if not call_ids:
+            return 0
+
+        held = and_(Call.id.in_(call_ids), Call.lease_owner == owner)
+        reclaimed, failed, released = await CallLeaseService._settle_leases(held, db, skip_locked=False)
+
+        result = await db.execute(
+            update(Call)
+            .where(held)
+            .values(lease_owner=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        if reclaimed:
+            logger.warning(f"Returned {len(reclaimed)} undialed calls to the queue")
+        if failed:
+            logger.warning(f"Marked {len(failed)} calls Failed after their dial outcome was lost")
+
+        return len(reclaimed) + len(failed) + len(released) + result.rowcount
+
+    @staticmethod
+    async def reclaim_expired_leases(db: AsyncSession) -> int:
+        """
+        Clean up calls whose lease expired mid-dispatch.
+
+        A lease outlives its owner when the worker died, or failed to release
+        it, at any point after claiming the call. Only calls that were never
+        handed to VAPI (no dial_attempted_at) go back to 'Queued', with their
+        service record back to 'Ready'. A call VAPI accepted (vapi_call_id set)
+        just loses its lease and is finished by its webhooks. A call whose dial
+        was attempted with no recorded outcome may already be ringing, so it is
+        marked 'Failed' rather than dialed again.
+
+        Args:
+            db: Database session
+
+        Returns:
+            int: Number of calls returned to the queue
+        """
+        reclaimed, failed, released = await CallLeaseService._settle_leases(
+            and_(Call.lease_owner.is_not(None), Call.lease_expires_at < func.now()), db
+        )
+
+        await db.commit()
+
+        if reclaimed:
+            logger.warning(f"Reclaimed {len(reclaimed)} calls with expired leases")
+        if failed:
+            logger.warning(f"Marked {len(failed)} calls Failed after their dial outcome was lost")
+        if released:
+            logger.info(f"Released {len(released)} expired leases on calls already accepted by VAPI")
+
+        return len(reclaimed)
+
+    @staticmethod
+    async def _settle_leases(
+        lease_condition: Any,
+        db: AsyncSession,
+        skip_locked: bool = True
+    ) -> Tuple[List[Any], List[Any], List[Any]]:
+        """
+        Clear the leases of 'In Progress' calls matching lease_condition, by dial outcome.
+
+        Rows locked by another transaction are skipped unless skip_locked is False.
+
+        Returns:
+            Tuple[List[Any], List[Any], List[Any]]: (calls re-queued, calls failed, leases just released)
+        """
+        reclaimed = await CallLeaseService._update_leased(
+            lease_condition, Call.dial_attempted_at.is_(None), "Queued", "Ready", db, skip_locked
+        )
+        failed = await CallLeaseService._update_leased(
+            lease_condition,
+            and_(Call.dial_attempted_at.is_not(None), Call.vapi_call_id.is_(None)),
+            "Failed",
+            "Failed",
+            db,
+            skip_locked
+        )
+        released = await CallLeaseService._update_leased(
+            lease_condition,
+            and_(Call.dial_attempted_at.is_not(None), Call.vapi_call_id.is_not(None)),
+            None,
+            None,
+            db,
+            skip_locked
+        )
+        return reclaimed, failed, released
+
+    @staticmethod
+    async def _update_leased(
+        lease_condition: Any,
+        condition: Any,
+        call_status: Optional[str],
+        service_record_status: Optional[str],
+        db: AsyncSession,
+        skip_locked: bool = True
+    ) -> List[Any]:
+        """Clear the leases of 'In Progress' calls matching both conditions, optionally moving the calls and their service records to new statuses."""
+        leased = (
+            select(Call.id)
+            .where(
+                and_(
+                    Call.status == "In Progress",
+                    lease_condition,
+                    condition
+                )
+            )
+            .with_for_update(skip_locked=skip_locked)
+        )
+
+        values = {"lease_owner": None, "lease_expires_at": None}
+        if call_status:
+            values["status"] = call_status
+
+        result = await db.execute(
+            update(Call)
+            .where(Call.id.in_(leased.scalar_subquery()))
+            .values(**values)
+            .returning(Call.id, Call.service_record_id)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+
+        service_record_ids = [row.service_record_id for row in rows if row.service_record_id]
+        if service_record_status and service_record_ids:
+            await db.execute(
+                update(ServiceRecord)
+                .where(ServiceRecord.id.in_(service_record_ids))
+                .values(status=service_record_status)
+                .execution_options(synchronize_session=False)
+            )
+
+        return rows
@@ -19,6 +19,7 @@ except ImportError:
     # This is a workaround for the linter issue
     joinedload = lambda x: x  # type: ignore
 
+from app.core.pagination import apply_keyset
 from app.models import Call, Campaign, ServiceRecord, User, Transcript, CallFeedback
 from app.schemas.call import CallCreate, CallUpdate
 from app.schemas.demo_call import DemoCallCreate
@@ -72,19 +73,21 @@ class CallService:
         service_record_id: Optional[int] = None,
         campaign_id: Optional[int] = None,
         db: AsyncSession = None,
+        cursor: Optional[str] = None,
     ) -> List[Call]:
         """
-        List calls with filters.
+        List calls with filters, newest first.
         
         Args:
             organization_id: Organization ID
-            skip: Number of calls to skip
+            skip: Number of calls to skip (ignored when cursor is given)
             limit: Maximum number of calls to return
             status: Filter by call status
             call_type: Filter by call type
             service_record_id: Filter by service record ID
             campaign_id: Filter by campaign ID
             db: Database session
+            cursor: Keyset cursor from the previous page
             
         Returns:
             List[Call]: List of calls
@@ -111,8 +114,7 @@ class CallService:
             )
         
         # Add order by and pagination
-        query = query.order_by(Call.created_at.desc())
-        query = query.offset(skip).limit(limit)
+        query = apply_keyset(query, Call, cursor, skip, limit)
         
         result = await db.execute(query)
         return list(result.scalars().all())
@@ -0,0 +1,494 @@
+"""
+Daily stats service.
+
+Maintains the daily_call_stats and daily_service_record_stats rollups.
+
+- Every ORM flush that creates, changes or deletes calls or service records
+  applies per-row deltas to the affected groups in the same transaction
+  (INSERT ... ON CONFLICT DO UPDATE SET x = x + excluded.x), so webhooks and
+  edits cost O(1) rollup work.
+- A periodic reconciliation, run by one process at a time, recomputes whole
+  (organization, day) slices for rows changed since a persisted watermark.
+  It covers bulk statements that bypass the ORM and corrects any drift.
+- rebuild() recomputes a whole date range.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, event, func, insert, inspect, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import async_session_factory, get_engine
+from app.models import (
+    Call,
+    DailyCallStats,
+    DailyServiceRecordStats,
+    DailyStatsWatermark,
+    Organization,
+    ServiceRecord,
+)
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock namespace for one organization's rollups: deltas take it
+# shared, recomputes exclusively, so a delta never lands on top of a
+# recompute that already counted its row
+ROLLUP_LOCK_NAMESPACE = 42017
+
+# Advisory lock held by the process running the periodic reconciliation
+ROLLUP_LEADER_LOCK_NAMESPACE = 42018
+
+# Name of the reconciliation's row in daily_stats_watermarks
+RECONCILE_WATERMARK = "changed_rows"
+
+# Group columns of each rollup (the unique key delta upserts conflict on)
+CALL_GROUP_COLUMNS = (
+    "organization_id", "day", "status", "direction", "campaign_id", "ended_reason", "call_reason"
+)
+SERVICE_RECORD_GROUP_COLUMNS = ("organization_id", "day", "status", "campaign_id", "is_demo")
+
+# Model attributes a row's rollup contribution depends on
+CALL_ROLLUP_ATTRIBUTES = (
+    "organization_id", "created_at", "status", "direction", "campaign_id", "ended_reason",
+    "call_reason", "duration_sec", "cost", "nps_score"
+)
+SERVICE_RECORD_ROLLUP_ATTRIBUTES = ("organization_id", "created_at", "status", "campaign_id", "is_demo")
+
+
+def _utc_day(column: Any) -> Any:
+    """UTC calendar day of a timestamptz column (literals inlined for GROUP BY)."""
+    return cast(func.timezone(literal_column("'UTC'"), column), Date)
+
+
+def _day_start(day: date) -> datetime:
+    """Start of a UTC day."""
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _rollup_values(
+    instance: Any,
+    attributes: Tuple[str, ...],
+    previous: bool = False,
+    load: bool = True
+) -> Dict[str, Any]:
+    """
+    Current or pre-flush values of an instance's rollup attributes.
+
+    Without load, unloaded attributes (server defaults such as created_at of
+    a row just inserted) are read as None instead of being loaded.
+    """
+    state = inspect(instance)
+    values = {}
+    for name in attributes:
+        history = state.attrs[name].history
+        if previous and history.deleted:
+            values[name] = history.deleted[0]
+        elif name in state.dict:
+            values[name] = state.dict[name]
+        else:
+            values[name] = getattr(instance, name) if load else None
+    return values
+
+
+def _utc_date(created_at: Optional[datetime]) -> date:
+    """UTC day a row belongs to (today for rows whose created_at is not loaded yet)."""
+    return (created_at or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+
+
+def _call_contribution(values: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """Group key and measures a call contributes to daily_call_stats."""
+    group = (
+        values["organization_id"],
+        _utc_date(values["created_at"]),
+        values["status"],
+        values["direction"],
+        values["campaign_id"],
+        values["ended_reason"],
+        values["call_reason"]
+    )
+    measures = {
+        "call_count": 1,
+        "duration_count": 1 if values["duration_sec"] is not None else 0,
+        "total_duration_sec": values["duration_sec"] or 0,
+        "total_cost": Decimal(str(values["cost"])) if values["cost"] is not None else Decimal(0),
+        "nps_count": 1 if values["nps_score"] is not None else 0,
+        "total_nps": values["nps_score"] or 0
+    }
+    return group, measures
+
+
+def _service_record_contribution(values: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """Group key and measures a service record contributes to daily_service_record_stats."""
+    group = (
+        values["organization_id"],
+        _utc_date(values["created_at"]),
+        values["status"],
+        values["campaign_id"],
+        bool(values["is_demo"])
+    )
+    return group, {"record_count": 1}
+
+
+def _collect_deltas(
+    session: Session,
+    model: Any,
+    attributes: Tuple[str, ...],
+    contribution: Any
+) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+    """Net per-group measure deltas of a flush's new, changed and deleted instances of a model."""
+    deltas: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    def add(values: Dict[str, Any], sign: int):
+        group, measures = contribution(values)
+        if group[0] is None or group[2] is None:
+            return
+        totals = deltas.setdefault(group, {})
+        for column, value in measures.items():
+            totals[column] = totals.get(column, 0) + sign * value
+
+    for instance in session.new:
+        if isinstance(instance, model):
+            add(_rollup_values(instance, attributes, load=False), 1)
+
+    for instance in session.dirty:
+        if isinstance(instance, model) and session.is_modified(instance, include_collections=False):
+            before = _rollup_values(instance, attributes, previous=True)
+            after = _rollup_values(instance, attributes)
+            if before != after:
+                add(before, -1)
+                add(after, 1)
+
+    for instance in session.deleted:
+        if isinstance(instance, model):
+            add(_rollup_values(instance, attributes, previous=True), -1)
+
+    return {
+        group: measures for group, measures in deltas.items()
+        if any(value != 0 for value in measures.values())
+    }
+
+
+def _apply_deltas(
+    connection: Any,
+    model: Any,
+    group_columns: Tuple[str, ...],
+    count_column: str,
+    deltas: Dict[Tuple[Any, ...], Dict[str, Any]]
+) -> None:
+    """Add measure deltas to their rollup rows, creating missing rows and dropping emptied ones."""
+    table = model.__table__
+
+    for organization_id in sorted({group[0] for group in deltas}, key=str):
+        connection.execute(
+            select(func.pg_advisory_xact_lock_shared(
+                literal(ROLLUP_LOCK_NAMESPACE),
+                func.hashtext(str(organization_id))
+            ))
+        )
+
+    rows = [
+        {**dict(zip(group_columns, group)), **measures}
+        for group, measures in sorted(deltas.items(), key=lambda item: str(item[0]))
+    ]
+    statement = pg_insert(table).values(rows)
+    measure_columns = [column for column in rows[0] if column not in group_columns]
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(group_columns),
+            set_={
+                **{column: table.c[column] + statement.excluded[column] for column in measure_columns},
+                "updated_at": func.now()
+            }
+        )
+    )
+
+    for group in deltas:
+        connection.execute(
+            delete(table).where(
+                table.c[count_column] == 0,
+                *(table.c[column].is_not_distinct_from(value) for column, value in zip(group_columns, group))
+            )
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollup_deltas(session: Session, flush_context: Any) -> None:
+    """Keep the daily rollups in step with ORM writes to calls and service records."""
+    call_deltas = _collect_deltas(session, Call, CALL_ROLLUP_ATTRIBUTES, _call_contribution)
+    record_deltas = _collect_deltas(
+        session, ServiceRecord, SERVICE_RECORD_ROLLUP_ATTRIBUTES, _service_record_contribution
+    )
+    if not call_deltas and not record_deltas:
+        return
+
+    connection = session.connection()
+    if call_deltas:
+        _apply_deltas(connection, DailyCallStats, CALL_GROUP_COLUMNS, "call_count", call_deltas)
+    if record_deltas:
+        _apply_deltas(connection, DailyServiceRecordStats, SERVICE_RECORD_GROUP_COLUMNS, "record_count", record_deltas)
+
+
+class DailyStatsService:
+    """Service for maintaining the daily analytics rollups."""
+
+    @staticmethod
+    async def _lock_organization(organization_id: UUID, db: AsyncSession) -> None:
+        """Serialize rollup refreshes for an organization until the transaction ends."""
+        await db.execute(
+            select(func.pg_advisory_xact_lock(
+                literal(ROLLUP_LOCK_NAMESPACE),
+                func.hashtext(str(organization_id))
+            ))
+        )
+
+    @staticmethod
+    async def _refresh_calls(
+        organization_id: UUID,
+        start_day: date,
+        end_day: date,
+        db: AsyncSession,
+        days: Optional[List[date]] = None
+    ) -> None:
+        """Recompute call rollups for an organization's days in [start_day, end_day]."""
+        day = _utc_day(Call.created_at)
+        conditions = [
+            Call.organization_id == organization_id,
+            Call.created_at >= _day_start(start_day),
+            Call.created_at < _day_start(end_day + timedelta(days=1))
+        ]
+        stale = [
+            DailyCallStats.organization_id == organization_id,
+            DailyCallStats.day >= start_day,
+            DailyCallStats.day <= end_day
+        ]
+        if days is not None:
+            conditions.append(day.in_(days))
+            stale.append(DailyCallStats.day.in_(days))
+
+        await db.execute(delete(DailyCallStats).where(*stale))
+
+        aggregates = (
+            select(
+                Call.organization_id,
+                day,
+                Call.status,
+                Call.direction,
+                Call.campaign_id,
+                Call.ended_reason,
+                Call.call_reason,
+                func.count(Call.id),
+                func.count(Call.duration_sec),
+                func.coalesce(func.sum(Call.duration_sec), 0),
+                func.coalesce(func.sum(Call.cost), 0),
+                func.count(Call.nps_score),
+                func.coalesce(func.sum(Call.nps_score), 0)
+            )
+            .where(*conditions)
+            .group_by(
+                Call.organization_id,
+                day,
+                Call.status,
+                Call.direction,
+                Call.campaign_id,
+                Call.ended_reason,
+                Call.call_reason
+            )
+        )
+        await db.execute(
+            insert(DailyCallStats).from_select(
+                [
+                    "organization_id", "day", "status", "direction", "campaign_id", "ended_reason",
+                    "call_reason", "call_count", "duration_count", "total_duration_sec", "total_cost",
+                    "nps_count", "total_nps"
+                ],
+                aggregates
+            )
+        )
+
+    @staticmethod
+    async def _refresh_service_records(
+        organization_id: UUID,
+        start_day: date,
+        end_day: date,
+        db: AsyncSession,
+        days: Optional[List[date]] = None
+    ) -> None:
+        """Recompute service record rollups for an organization's days in [start_day, end_day]."""
+        day = _utc_day(ServiceRecord.created_at)
+        conditions = [
+            ServiceRecord.organization_id == organization_id,
+            ServiceRecord.created_at >= _day_start(start_day),
+            ServiceRecord.created_at < _day_start(end_day + timedelta(days=1))
+        ]
+        stale = [
+            DailyServiceRecordStats.organization_id == organization_id,
+            DailyServiceRecordStats.day >= start_day,
+            DailyServiceRecordStats.day <= end_day
+        ]
+        if days is not None:
+            conditions.append(day.in_(days))
+            stale.append(DailyServiceRecordStats.day.in_(days))
+
+        await db.execute(delete(DailyServiceRecordStats).where(*stale))
+
+        aggregates = (
+            select(
+                ServiceRecord.organization_id,
+                day,
+                ServiceRecord.status,
+                ServiceRecord.campaign_id,
+                ServiceRecord.is_demo,
+                func.count(ServiceRecord.id)
+            )
+            .where(*conditions)
+            .group_by(
+                ServiceRecord.organization_id,
+                day,
+                ServiceRecord.status,
+                ServiceRecord.campaign_id,
+                ServiceRecord.is_demo
+            )
+        )
+        await db.execute(
+            insert(DailyServiceRecordStats).from_select(
+                ["organization_id", "day", "status", "campaign_id", "is_demo", "record_count"],
+                aggregates
+            )
+        )
+
+    @staticmethod
+    async def refresh_changed_since(since: datetime, db: AsyncSession) -> datetime:
+        """
+        Recompute the days of every call or service record updated since a time.
+
+        Covers status changes made by bulk statements that bypass the ORM
+        deltas (the call initiator, uploads) and corrects any drift.
+
+        Args:
+            since: Lower bound on updated_at
+            db: Database session
+
+        Returns:
+            datetime: Database time at the start of the pass (the next watermark)
+        """
+        now = (await db.execute(select(func.now()))).scalar()
+
+        changed: Dict[UUID, Tuple[Set[date], Set[date]]] = defaultdict(lambda: (set(), set()))
+
+        call_days = _utc_day(Call.created_at)
+        call_result = await db.execute(
+            select(Call.organization_id, call_days)
+            .where(Call.updated_at >= since)
+            .group_by(Call.organization_id, call_days)
+        )
+        for organization_id, day in call_result.all():
+            changed[organization_id][0].add(day)
+
+        record_days = _utc_day(ServiceRecord.created_at)
+        record_result = await db.execute(
+            select(ServiceRecord.organization_id, record_days)
+            .where(ServiceRecord.updated_at >= since)
+            .group_by(ServiceRecord.organization_id, record_days)
+        )
+        for organization_id, day in record_result.all():
+            changed[organization_id][1].add(day)
+        await db.commit()
+
+        for organization_id, (changed_call_days, changed_record_days) in changed.items():
+            await DailyStatsService._lock_organization(organization_id, db)
+            if changed_call_days:
+                days = sorted(changed_call_days)
+                await DailyStatsService._refresh_calls(organization_id, days[0], days[-1], db, days=days)
+            if changed_record_days:
+                days = sorted(changed_record_days)
+                await DailyStatsService._refresh_service_records(organization_id, days[0], days[-1], db, days=days)
+            await db.commit()
+
+        if changed:
+            logger.debug(f"Refreshed daily stats for {len(changed)} organizations")
+        return now
+
+    @staticmethod
+    async def rebuild(
+        start_date: date,
+        end_date: date,
+        db: AsyncSession,
+        organization_id: Optional[UUID] = None
+    ) -> int:
+        """
+        Recompute the rollups for a date range, one organization per transaction.
+
+        Args:
+            start_date: First UTC day
+            end_date: Last UTC day
+            db: Database session
+            organization_id: Organization to rebuild (None for all)
+
+        Returns:
+            int: Number of organizations rebuilt
+        """
+        if organization_id is not None:
+            organization_ids = [organization_id]
+        else:
+            result = await db.execute(select(Organization.id).order_by(Organization.id))
+            organization_ids = list(result.scalars().all())
+            await db.commit()
+
+        for org_id in organization_ids:
+            await DailyStatsService._lock_organization(org_id, db)
+            await DailyStatsService._refresh_calls(org_id, start_date, end_date, db)
+            await DailyStatsService._refresh_service_records(org_id, start_date, end_date, db)
+            await db.commit()
+            logger.info(f"Rebuilt daily stats for organization {org_id} ({start_date} to {end_date})")
+
+        return len(organization_ids)
+
+    @staticmethod
+    async def reconcile() -> bool:
+        """
+        Run one reconciliation pass, unless another process is running one.
+
+        A session-level advisory lock elects the process that runs the pass,
+        so API workers do not repeat each other's work. The pass resumes from
+        the watermark persisted by the previous one (less
+        DAILY_STATS_REFRESH_OVERLAP_SECONDS), so changes made while no process
+        was running are still picked up.
+
+        Returns:
+            bool: True if this process ran the pass
+        """
+        async with get_engine().connect() as connection:
+            leader_lock = (literal(ROLLUP_LEADER_LOCK_NAMESPACE), literal(0))
+            acquired = (await connection.execute(select(func.pg_try_advisory_lock(*leader_lock)))).scalar()
+            await connection.commit()
+            if not acquired:
+                return False
+
+            try:
+                async with async_session_factory(bind=connection) as db:
+                    watermark = await db.get(DailyStatsWatermark, RECONCILE_WATERMARK)
+                    if watermark is None:
+                        # First pass: earlier rows are covered by the migration backfill or a rebuild
+                        now = (await db.execute(select(func.now()))).scalar()
+                        db.add(DailyStatsWatermark(name=RECONCILE_WATERMARK, watermark=now))
+                    else:
+                        since = watermark.watermark - timedelta(seconds=settings.DAILY_STATS_REFRESH_OVERLAP_SECONDS)
+                        watermark.watermark = await DailyStatsService.refresh_changed_since(since, db)
+                    await db.commit()
+            finally:
+                try:
+                    await connection.execute(select(func.pg_advisory_unlock(*leader_lock)))
+                    await connection.commit()
+                except Exception:
+                    # Closing the database session releases the lock
+                    await connection.invalidate()
+
+        return True
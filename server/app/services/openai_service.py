@@ -8,9 +8,13 @@ import json
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from app.core.config import settings
+from app.core.http_client import NON_IDEMPOTENT_RETRY_STATUSES, http_clients, request_with_retries
 
 logger = logging.getLogger(__name__)
 
+# call_summary returned when the model output is not valid JSON
+PARSE_ERROR_SUMMARY = "Error parsing response"
+
 class OpenAIService:
     def __init__(self):
         self.base_url = settings.OPENAI_BASE_URL or "https://api.openai.com/v1"
@@ -69,32 +73,37 @@ class OpenAIService:
             logger.error(f"Error loading prompt templates: {e}")
             return {}
 
-    def _get_prompt_template(self, version: Optional[int] = None) -> str:
-        """Get prompt template for specified version or default to configured version."""
+    def resolve_prompt_version(self, version: Optional[int] = None) -> int:
+        """Get the prompt version that will actually be used for a requested version."""
         if version is None:
             version = getattr(self, "_default_prompt_version", 1)
         
         if version in self._prompt_templates:
-            return self._prompt_templates[version]
+            return version
         
         # Fallback to configured default, then to 1
         if getattr(self, "_default_prompt_version", None) in self._prompt_templates:
             logger.warning(f"Prompt version {version} not found, falling back to default version {self._default_prompt_version}")
-            return self._prompt_templates[self._default_prompt_version]
+            return self._default_prompt_version
         if 1 in self._prompt_templates:
             logger.warning(f"Prompt version {version} not found, falling back to version 1")
-            return self._prompt_templates[1]
+            return 1
         
         # If no templates loaded, raise an error
         raise ValueError("No prompt templates loaded and no fallback available")
 
+    def _get_prompt_template(self, version: Optional[int] = None) -> str:
+        """Get prompt template for specified version or default to configured version."""
+        return self._prompt_templates[self.resolve_prompt_version(version)]
+
     async def analyze_call_transcript(
         self,
         transcript_messages: List[Dict[str, Any]],
         service_record_data: Dict[str, Any],
         organization_data: Dict[str, Any],
         tags: List[str],
-        prompt_version: Optional[int] = None
+        prompt_version: Optional[int] = None,
+        model: Optional[str] = None
     ) -> Dict[str, Any]:
         prompt = self._build_analysis_prompt(
             transcript_messages, service_record_data, organization_data, tags, prompt_version
@@ -105,7 +114,7 @@ class OpenAIService:
                 f.write(prompt)
 
         payload = {
-            "model": settings.OPENAI_MODEL,  # must be a gpt-4o model (e.g., "gpt-4o-2024-08-06")
+            "model": model or settings.OPENAI_MODEL,  # must be a gpt-4o model (e.g., "gpt-4o-2024-08-06")
             "messages": [
                 {
                     "role": "system",
@@ -155,16 +164,19 @@ class OpenAIService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    json=payload,
-                    headers=self.headers
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                content = data["choices"][0]["message"]["content"]
-                return self._parse_analysis_result(content)
+            client = http_clients.get("openai", base_url=self.base_url, headers=self.headers)
+            # Completions are billed, so a response lost after a 5xx is not requested again
+            resp = await request_with_retries(
+                client,
+                "POST",
+                "/chat/completions",
+                retry_statuses=NON_IDEMPOTENT_RETRY_STATUSES,
+                json=payload
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            content = data["choices"][0]["message"]["content"]
+            return self._parse_analysis_result(content)
 
         except httpx.HTTPError as exc:
             logger.error(f"OpenAI API error: {exc}")
@@ -232,7 +244,7 @@ class OpenAIService:
             logger.error("JSON parse error from OpenAI response", exc_info=True)
             logger.error(f"Response content: {content}")
             return {
-                "call_summary": "Error parsing response",
+                "call_summary": PARSE_ERROR_SUMMARY,
                 "nps_score": None,
                 "overall_feedback": "",
                 "positive_mentions": [],
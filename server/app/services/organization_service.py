@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Call, Organization, ServiceRecord
 from app.schemas import OrganizationCreate, OrganizationUpdate, OrganizationSettingsUpdate
+from app.services.api_key_service import ApiKeyService
 
 
 class OrganizationService:
@@ -110,6 +111,7 @@ class OrganizationService:
         # Save changes
         await db.commit()
         await db.refresh(organization)
+        ApiKeyService.invalidate_organization_cache(organization_id)
         
         return organization
     
@@ -151,6 +153,7 @@ class OrganizationService:
         # Save changes
         await db.commit()
         await db.refresh(organization)
+        ApiKeyService.invalidate_organization_cache(organization_id)
         
         return organization
     
@@ -197,6 +200,7 @@ class OrganizationService:
         # Save changes
         await db.commit()
         await db.refresh(organization)
+        ApiKeyService.invalidate_organization_cache(organization_id)
         
         return organization
     
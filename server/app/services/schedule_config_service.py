@@ -9,6 +9,7 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.schedule_index import schedule_window_index
 from app.models.schedule_config import ScheduleConfig
 
 # Set up logging
@@ -97,6 +98,7 @@ class ScheduleConfigService:
             db.add(schedule_config)
             await db.commit()
             await db.refresh(schedule_config)
+            schedule_window_index.invalidate()
             
             logger.info(f"Created config: {schedule_config.id}, json: {schedule_config.config_json}")
             
@@ -152,6 +154,7 @@ class ScheduleConfigService:
             schedule_config.config_json = config_data
             await db.commit()
             await db.refresh(schedule_config)
+            schedule_window_index.invalidate()
             
             # Verify the update was successful
             logger.info(f"Updated config: {schedule_config.id}, json: {schedule_config.config_json}")
@@ -191,5 +194,6 @@ class ScheduleConfigService:
         
         await db.delete(schedule_config)
         await db.commit()
+        schedule_window_index.invalidate()
         
         return True 
\ No newline at end of file
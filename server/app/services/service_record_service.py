@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import apply_keyset
 from app.models import ServiceRecord, Call
 
 
@@ -57,18 +58,24 @@ class ServiceRecordService:
         skip: int = 0,
         limit: int = 100,
         status: Optional[str] = None,
-        campaign_id: Optional[int] = None
+        campaign_id: Optional[int] = None,
+        customer_name: Optional[str] = None,
+        vehicle_make: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[ServiceRecord]:
         """
-        List service records in an organization with filtering options.
+        List service records in an organization with filtering options, newest first.
         
         Args:
             db: Database session
             organization_id: Organization ID
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
             status: Filter by service record status
             campaign_id: Filter by campaign ID
+            customer_name: Filter by customer name (case-insensitive substring)
+            vehicle_make: Filter by vehicle info (case-insensitive substring)
+            cursor: Keyset cursor from the previous page
             
         Returns:
             List[ServiceRecord]: List of service records
@@ -83,8 +90,14 @@ class ServiceRecordService:
         if campaign_id:
             query = query.where(ServiceRecord.campaign_id == campaign_id)
         
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+        if customer_name:
+            query = query.where(ServiceRecord.customer_name.ilike(f"%{customer_name}%"))
+        
+        if vehicle_make:
+            query = query.where(ServiceRecord.vehicle_info.ilike(f"%{vehicle_make}%"))
+        
+        # Apply ordering and pagination
+        query = apply_keyset(query, ServiceRecord, cursor, skip, limit)
         
         # Execute query
         result = await db.execute(query)
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import NotFoundException
 from app.models import Setting, Organization
 from app.schemas import SettingCreate, SettingUpdate
+from app.services.api_key_service import ApiKeyService
 
 
 class SettingsService:
@@ -392,5 +393,6 @@ class SettingsService:
         
         await db.commit()
         await db.refresh(organization)
+        ApiKeyService.invalidate_organization_cache(organization_id)
         
         return organization 
\ No newline at end of file
@@ -8,6 +8,7 @@ import httpx
 from fastapi import Depends
 
 from app.core.config import settings
+from app.core.http_client import NON_IDEMPOTENT_RETRY_STATUSES, http_clients, request_with_retries
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,10 @@ class VAPIService:
             "Content-Type": "application/json"
         }
 
+    def _client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client for the VAPI API."""
+        return http_clients.get("vapi", base_url=self.base_url, headers=self.headers)
+
     async def create_call(
         self,
         phone: str,
@@ -81,14 +86,16 @@ class VAPIService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/call",    
-                    json=payload,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            # Only retry throttling: a call VAPI accepted must not be placed twice
+            response = await request_with_retries(
+                self._client(),
+                "POST",
+                "/call",
+                retry_statuses=NON_IDEMPOTENT_RETRY_STATUSES,
+                json=payload
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPError as e:
             logger.error(f"VAPI API error: {str(e)}")
             logger.error(f"Request payload: {payload}")
@@ -158,14 +165,16 @@ class VAPIService:
 
         try:
             logger.info(f"Making VAPI demo call request with payload: {payload}")
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/call",
-                    json=payload,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            # Only retry throttling: a call VAPI accepted must not be placed twice
+            response = await request_with_retries(
+                self._client(),
+                "POST",
+                "/call",
+                retry_statuses=NON_IDEMPOTENT_RETRY_STATUSES,
+                json=payload
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPError as e:
             logger.error(f"VAPI API error: {str(e)}")
             logger.error(f"Request payload: {payload}")
@@ -0,0 +1,257 @@
+"""
+Webhook queue service.
+
+Durable Postgres-backed inbox for webhook events: the endpoint stores events
+and acknowledges immediately, consumers claim and process them later.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookQueueService:
+    """Service for enqueuing and claiming webhook events."""
+
+    @staticmethod
+    async def enqueue(
+        payload: Dict[str, Any],
+        event_type: Optional[str],
+        db: AsyncSession,
+        source: str = "vapi"
+    ) -> WebhookEvent:
+        """
+        Store a webhook event for background processing.
+
+        Args:
+            payload: Webhook message
+            event_type: Event type (e.g. "end-of-call-report")
+            db: Database session
+            source: Webhook source
+
+        Returns:
+            WebhookEvent: Stored event
+        """
+        event = WebhookEvent(
+            source=source,
+            event_type=event_type,
+            payload=payload,
+            status="pending",
+            attempts=0
+        )
+        db.add(event)
+        await db.commit()
+        return event
+
+    @staticmethod
+    async def claim_events(
+        owner: str,
+        db: AsyncSession,
+        limit: int = 1
+    ) -> List[WebhookEvent]:
+        """
+        Claim pending events for processing.
+
+        Uses FOR UPDATE SKIP LOCKED so concurrent consumers never claim the
+        same event. Events whose consumer lease expired (the consumer died
+        mid-processing) are claimed again.
+
+        Args:
+            owner: Consumer identifier
+            db: Database session
+            limit: Maximum number of events to claim
+
+        Returns:
+            List[WebhookEvent]: Claimed events
+        """
+        claimable = (
+            select(WebhookEvent.id)
+            .where(
+                or_(
+                    and_(
+                        WebhookEvent.status == "pending",
+                        WebhookEvent.available_at <= func.now()
+                    ),
+                    and_(
+                        WebhookEvent.status == "processing",
+                        WebhookEvent.locked_until < func.now()
+                    )
+                )
+            )
+            .order_by(WebhookEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        result = await db.execute(
+            update(WebhookEvent)
+            .where(WebhookEvent.id.in_(claimable.scalar_subquery()))
+            .values(
+                status="processing",
+                locked_by=owner,
+                locked_until=func.now() + timedelta(seconds=settings.WEBHOOK_CONSUMER_LEASE_SECONDS),
+                attempts=WebhookEvent.attempts + 1
+            )
+            .returning(WebhookEvent)
+            .execution_options(synchronize_session=False)
+        )
+        events = list(result.scalars().all())
+        await db.commit()
+        return events
+
+    @staticmethod
+    async def mark_processed(event_id: int, owner: str, db: AsyncSession) -> None:
+        """
+        Mark a claimed event as processed.
+
+        Args:
+            event_id: Event ID
+            owner: Consumer identifier
+            db: Database session
+        """
+        await db.execute(
+            update(WebhookEvent)
+            .where(and_(WebhookEvent.id == event_id, WebhookEvent.locked_by == owner))
+            .values(
+                status="processed",
+                processed_at=func.now(),
+                last_error=None,
+                locked_by=None,
+                locked_until=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    @staticmethod
+    async def mark_failed(
+        event_id: int,
+        attempts: int,
+        error: str,
+        owner: str,
+        db: AsyncSession
+    ) -> None:
+        """
+        Record a processing failure and schedule a retry with exponential backoff.
+
+        After WEBHOOK_MAX_ATTEMPTS the event is parked as "failed".
+
+        Args:
+            event_id: Event ID
+            attempts: Attempts made so far
+            error: Error message
+            owner: Consumer identifier
+            db: Database session
+        """
+        if attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+            values = {"status": "failed"}
+            logger.error(f"Webhook event {event_id} failed after {attempts} attempts: {error}")
+        else:
+            backoff = settings.WEBHOOK_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1))
+            values = {
+                "status": "pending",
+                "available_at": func.now() + timedelta(seconds=backoff)
+            }
+            logger.warning(f"Webhook event {event_id} failed (attempt {attempts}), retrying in {backoff}s: {error}")
+
+        await db.execute(
+            update(WebhookEvent)
+            .where(and_(WebhookEvent.id == event_id, WebhookEvent.locked_by == owner))
+            .values(last_error=error, locked_by=None, locked_until=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    @staticmethod
+    async def purge_old_events(db: AsyncSession, batch_size: Optional[int] = None) -> int:
+        """
+        Delete processed and dead events past their retention period.
+
+        Processed events are kept for WEBHOOK_PROCESSED_RETENTION_DAYS after
+        processing, failed ones for WEBHOOK_FAILED_RETENTION_DAYS after their
+        last attempt. Rows are deleted in batches, one commit each, so the
+        purge never holds many locks at once.
+
+        Args:
+            db: Database session
+            batch_size: Rows per batch (defaults to WEBHOOK_PURGE_BATCH_SIZE)
+
+        Returns:
+            int: Number of events deleted
+        """
+        batch_size = batch_size or settings.WEBHOOK_PURGE_BATCH_SIZE
+        expired = or_(
+            and_(
+                WebhookEvent.status == "processed",
+                WebhookEvent.processed_at < func.now() - timedelta(days=settings.WEBHOOK_PROCESSED_RETENTION_DAYS)
+            ),
+            and_(
+                WebhookEvent.status == "failed",
+                WebhookEvent.updated_at < func.now() - timedelta(days=settings.WEBHOOK_FAILED_RETENTION_DAYS)
+            )
+        )
+
+        deleted = 0
+        while True:
+            batch = (
+                select(WebhookEvent.id)
+                .where(expired)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                delete(WebhookEvent)
+                .where(WebhookEvent.id.in_(batch.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+
+        if deleted:
+            logger.info(f"Purged {deleted} old webhook events")
+        return deleted
+
+    @staticmethod
+    async def get_queue_stats(db: AsyncSession) -> Dict[str, Any]:
+        """
+        Get queue depth and lag metrics.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dict: Counts by status, depth (pending + processing) and lag in
+            seconds of the oldest unprocessed event
+        """
+        counts_result = await db.execute(
+            select(WebhookEvent.status, func.count(WebhookEvent.id))
+            .where(WebhookEvent.status.in_(["pending", "processing", "failed"]))
+            .group_by(WebhookEvent.status)
+        )
+        by_status = {status: count for status, count in counts_result.all()}
+
+        lag_result = await db.execute(
+            select(
+                func.extract("epoch", func.now() - func.min(WebhookEvent.created_at))
+            ).where(WebhookEvent.status.in_(["pending", "processing"]))
+        )
+        lag_seconds = lag_result.scalar()
+
+        return {
+            "depth": by_status.get("pending", 0) + by_status.get("processing", 0),
+            "pending": by_status.get("pending", 0),
+            "processing": by_status.get("processing", 0),
+            "failed": by_status.get("failed", 0),
+            "lag_seconds": round(float(lag_seconds), 3) if lag_seconds is not None else 0.0
+        }
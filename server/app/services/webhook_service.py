@@ -5,17 +5,21 @@ Service for processing VAPI webhook data.
 import json
 from datetime import datetime
 import pytz
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-from sqlalchemy import select
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Call, ServiceRecord, Transcript
+from app.models import Call, ProcessedWebhookEvent, ServiceRecord, Transcript
 from app.core.config import settings
 from app.services.call_analysis_service import CallAnalysisService
 
 logger = logging.getLogger(__name__)
 
+# Column order of rows produced by WebhookService._map_transcript_rows
+TRANSCRIPT_COLUMNS = ["call_id", "role", "message", "time", "end_time", "duration"]
+
 class WebhookService:
     """Service for processing VAPI webhook data."""
     
@@ -44,6 +48,12 @@ class WebhookService:
             
             logger.info(f"Processing webhook event: {event_type}")
             
+            if event_type in ("end-of-call-report", "status-update"):
+                dedup_key = self.get_dedup_key(data)
+                if dedup_key and not await self._claim_dedup_key(dedup_key, db):
+                    logger.info(f"Skipping duplicate {event_type} event for VAPI call {dedup_key[0]}")
+                    return {"status": "duplicate", "message": f"Event {event_type} already processed"}
+            
             if event_type == "end-of-call-report":
                 return await self.process_call_report(data, db)
             elif event_type == "status-update":
@@ -56,6 +66,99 @@ class WebhookService:
             logger.error(f"Error processing webhook data: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    @staticmethod
+    def get_dedup_key(data: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+        """
+        Build the (vapi call id, event type, event timestamp) idempotency key for an event.
+        
+        End-of-call reports fall back to endedAt (or an empty timestamp, since
+        a call only has one report). Other events without a timestamp are not
+        deduplicated.
+        
+        Args:
+            data: Webhook data from VAPI
+            
+        Returns:
+            Optional[Tuple[str, str, str]]: Dedup key, or None if it cannot be built
+        """
+        call_data = data.get("call")
+        vapi_call_id = call_data.get("id") if isinstance(call_data, dict) else None
+        event_type = data.get("type")
+        
+        if not vapi_call_id or not event_type:
+            return None
+        
+        event_timestamp = data.get("timestamp")
+        if event_timestamp is None and event_type == "end-of-call-report":
+            event_timestamp = data.get("endedAt") or ""
+        
+        if event_timestamp is None:
+            return None
+        
+        return str(vapi_call_id), event_type, str(event_timestamp)
+    
+    async def _claim_dedup_key(
+        self,
+        dedup_key: Tuple[str, str, str],
+        db: AsyncSession
+    ) -> bool:
+        """
+        Record an event's dedup key in the current transaction.
+        
+        The key is committed together with the event's changes, so an event
+        that fails before committing can still be retried. A concurrent
+        delivery of the same event waits on the unique index and then sees
+        the conflict.
+        
+        Args:
+            dedup_key: (vapi call id, event type, event timestamp)
+            db: Database session
+            
+        Returns:
+            bool: True if the key is new, False if the event was already processed
+        """
+        vapi_call_id, event_type, event_timestamp = dedup_key
+        
+        result = await db.execute(
+            pg_insert(ProcessedWebhookEvent)
+            .values(
+                vapi_call_id=vapi_call_id,
+                event_type=event_type,
+                event_timestamp=event_timestamp
+            )
+            .on_conflict_do_nothing(constraint="uq_processed_webhook_events_dedup_key")
+            .returning(ProcessedWebhookEvent.id)
+        )
+        return result.scalar_one_or_none() is not None
+    
+    async def _release_dedup_key(
+        self,
+        dedup_key: Optional[Tuple[str, str, str]],
+        db: AsyncSession
+    ) -> None:
+        """
+        Forget an event's dedup key so a redelivery of the event is processed again.
+        
+        Args:
+            dedup_key: (vapi call id, event type, event timestamp), or None
+            db: Database session
+        """
+        if dedup_key is None:
+            return
+        
+        vapi_call_id, event_type, event_timestamp = dedup_key
+        
+        await db.execute(
+            delete(ProcessedWebhookEvent).where(
+                and_(
+                    ProcessedWebhookEvent.vapi_call_id == vapi_call_id,
+                    ProcessedWebhookEvent.event_type == event_type,
+                    ProcessedWebhookEvent.event_timestamp == event_timestamp
+                )
+            )
+        )
+        await db.commit()
+    
     async def process_status_update(
         self,
         data: Dict[str, Any],
@@ -141,6 +244,12 @@ class WebhookService:
         """
         Process end-of-call report data from VAPI.
         
+        The call update, transcripts and the event's dedup key are committed
+        together before analysis runs. If analysis then fails, the dedup key is
+        released and an error is returned, so the inbox (or VAPI) redelivers
+        the report; transcripts are replaced rather than appended, so the
+        redelivery is safe.
+        
         Args:
             data: Webhook data
             db: Database session
@@ -201,20 +310,35 @@ class WebhookService:
                 messages = data["artifact"].get("messages", [])
             
             if messages:
+                # Replace the transcript of an earlier delivery whose analysis failed
+                await db.execute(delete(Transcript).where(Transcript.call_id == call_id))
                 await self.save_transcripts(call_id, messages, db)
             
             # Commit all changes
             await db.commit()
             
-            # Trigger after-call analysis
-            logger.info(f"Triggering after-call analysis for call {call_id}")
-            analysis_result = await CallAnalysisService.trigger_after_call_analysis(call_id, db)
+            if messages:
+                # Trigger after-call analysis
+                logger.info(f"Triggering after-call analysis for call {call_id}")
+                analysis_result = await CallAnalysisService.trigger_after_call_analysis(call_id, db)
+            else:
+                analysis_result = {"status": "skipped", "message": "No transcript for call"}
             
             # Log the analysis result status
-            if analysis_result.get("status") == "success":
-                logger.info(f"After-call analysis completed successfully for call {call_id}")
-            else:
+            analysis_failed = analysis_result.get("status") == "error"
+            if analysis_failed:
                 logger.warning(f"After-call analysis failed for call {call_id}: {analysis_result.get('message')}")
+                await db.rollback()
+                await self._release_dedup_key(self.get_dedup_key(data), db)
+            elif analysis_result.get("status") == "success":
+                logger.info(f"After-call analysis completed successfully for call {call_id}")
+            
+            if analysis_failed:
+                return {
+                    "status": "error",
+                    "message": f"After-call analysis failed: {analysis_result.get('message')}",
+                    "call_id": call_id
+                }
             
             return {
                 "status": "success", 
@@ -228,6 +352,58 @@ class WebhookService:
             logger.error(f"Error processing call report: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    @staticmethod
+    def _map_transcript_rows(
+        call_id: int,
+        messages: List[Dict[str, Any]]
+    ) -> List[Tuple[int, str, str, Optional[float], Optional[float], Optional[float]]]:
+        """
+        Map VAPI artifact messages to transcript rows.
+        
+        Args:
+            call_id: Call ID
+            messages: List of message objects
+            
+        Returns:
+            List of (call_id, role, message, time, end_time, duration) tuples,
+            in TRANSCRIPT_COLUMNS order
+        """
+        # Map VAPI roles to our roles; other roles (system, tool calls) are skipped
+        role_mapping = {
+            "user": "human",
+            "bot": "assistant"
+        }
+        rows = []
+        
+        for message in messages:
+            mapped_role = role_mapping.get(message.get("role"))
+            if mapped_role is None:
+                continue
+            
+            # Extract time information
+            time_seconds = message.get("secondsFromStart")
+            end_time_seconds = None
+            duration_seconds = None
+            
+            # If we have duration, convert from ms to seconds
+            if "duration" in message:
+                duration_seconds = message["duration"] / 1000.0
+            
+            # If we have endTime and time, calculate end_time_seconds
+            if "endTime" in message and "time" in message and time_seconds is not None:
+                end_time_seconds = time_seconds + (duration_seconds or 0)
+            
+            rows.append((
+                call_id,
+                mapped_role,
+                message.get("message", ""),
+                time_seconds,
+                end_time_seconds,
+                duration_seconds
+            ))
+        
+        return rows
+    
     async def save_transcripts(
         self,
         call_id: int,
@@ -237,60 +413,39 @@ class WebhookService:
         """
         Save transcript messages to the database.
         
+        Rows are written without building ORM objects: long transcripts go
+        through asyncpg's COPY (copy_records_to_table) on the session's own
+        connection, shorter ones through a single multi-row INSERT. Both run
+        inside the caller's transaction.
+        
         Args:
             call_id: Call ID
             messages: List of message objects
             db: Database session
         """
         try:
-            transcripts = []
+            rows = self._map_transcript_rows(call_id, messages)
             
-            for message in messages:
-                # Only process user and bot messages
-                if message.get("role") not in ["user", "bot"]:
-                    continue
-                
-                # Map VAPI roles to our roles
-                role_mapping = {
-                    "user": "human",
-                    "bot": "assistant"
-                }
-                
-                role = message.get("role", "")
-                mapped_role = role_mapping.get(role, role)
-                
-                # Get message content
-                content = message.get("message", "")
-                
-                # Extract time information
-                time_seconds = message.get("secondsFromStart")
-                end_time_seconds = None
-                duration_seconds = None
-                
-                # If we have duration, convert from ms to seconds
-                if "duration" in message:
-                    duration_seconds = message["duration"] / 1000.0
-                
-                # If we have endTime and time, calculate end_time_seconds
-                if "endTime" in message and "time" in message and time_seconds is not None:
-                    end_time_seconds = time_seconds + (duration_seconds or 0)
-                
-                # Create transcript record using the correct field names
-                transcript = Transcript()
-                transcript.call_id = call_id
-                transcript.role = mapped_role
-                transcript.message = content
-                transcript.time = time_seconds
-                transcript.end_time = end_time_seconds
-                transcript.duration = duration_seconds
+            if not rows:
+                return
+            
+            if len(rows) >= settings.TRANSCRIPT_COPY_THRESHOLD:
+                connection = await db.connection()
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
                 
-                transcripts.append(transcript)
+                if hasattr(driver_connection, "copy_records_to_table"):
+                    await driver_connection.copy_records_to_table(
+                        Transcript.__tablename__,
+                        records=rows,
+                        columns=TRANSCRIPT_COLUMNS
+                    )
+                    return
             
-            # Add all transcripts to the database
-            if transcripts:
-                db.add_all(transcripts)
-                await db.flush()
+            await db.execute(
+                insert(Transcript).values([dict(zip(TRANSCRIPT_COLUMNS, row)) for row in rows])
+            )
                 
         except Exception as e:
             logger.error(f"Error saving transcripts: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
@@ -0,0 +1,7 @@
+"""
+Webhook consumer module for processing queued webhook events.
+"""
+
+from .worker import WebhookConsumer, webhook_consumer
+
+__all__ = ["WebhookConsumer", "webhook_consumer"]
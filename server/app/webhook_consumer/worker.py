@@ -0,0 +1,193 @@
+"""
+Webhook Consumer - Process webhook events stored in the webhook inbox.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import uuid
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_engine, async_session_factory
+from app.models import WebhookEvent
+from app.services.webhook_queue_service import WebhookQueueService
+from app.services.webhook_service import WebhookService
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookConsumer:
+    """Pool of background consumers draining the webhook inbox with bounded concurrency."""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.consumer_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.concurrency = concurrency or settings.WEBHOOK_CONSUMER_CONCURRENCY
+        self._stop_event = asyncio.Event()
+        self._wakeup_event = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def _get_db_session(self) -> AsyncSession:
+        """Get a database session."""
+        engine = get_engine()
+        async_session = async_session_factory(bind=engine)
+        return async_session
+
+    def notify(self):
+        """Wake idle consumers because a new event was enqueued."""
+        self._wakeup_event.set()
+
+    async def _wait_for_work(self):
+        """Sleep until notified, stopped, or the poll interval elapses."""
+        try:
+            await asyncio.wait_for(
+                self._wakeup_event.wait(),
+                timeout=settings.WEBHOOK_CONSUMER_POLL_INTERVAL_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup_event.clear()
+
+    async def process_next_event(self) -> bool:
+        """
+        Claim and process a single event.
+
+        Returns:
+            bool: True if an event was claimed
+        """
+        async with await self._get_db_session() as db:
+            events = await WebhookQueueService.claim_events(self.consumer_id, db, limit=1)
+
+        if not events:
+            return False
+
+        await self._process_event(events[0])
+        return True
+
+    async def _process_event(self, event: WebhookEvent):
+        """Run the webhook handler for an event and record the outcome."""
+        error = None
+
+        try:
+            async with await self._get_db_session() as db:
+                result = await WebhookService().process_webhook_data(event.payload, db)
+            if result.get("status") == "error":
+                error = result.get("message") or "Unknown error"
+        except Exception as e:
+            error = str(e)
+
+        async with await self._get_db_session() as db:
+            if error is None:
+                await WebhookQueueService.mark_processed(event.id, self.consumer_id, db)
+            else:
+                await WebhookQueueService.mark_failed(event.id, event.attempts, error, self.consumer_id, db)
+
+    async def _consume(self, index: int):
+        """Consumer loop: drain events until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                claimed = await self.process_next_event()
+            except Exception as e:
+                logger.error(f"Webhook consumer {index} error: {str(e)}")
+                claimed = False
+
+            if not claimed:
+                await self._wait_for_work()
+
+    async def _report_metrics(self):
+        """Periodically log queue depth and lag."""
+        while not self._stop_event.is_set():
+            try:
+                async with await self._get_db_session() as db:
+                    stats = await WebhookQueueService.get_queue_stats(db)
+                logger.info(
+                    f"Webhook queue depth={stats['depth']} pending={stats['pending']} "
+                    f"processing={stats['processing']} failed={stats['failed']} lag={stats['lag_seconds']}s"
+                )
+            except Exception as e:
+                logger.error(f"Error reading webhook queue stats: {str(e)}")
+
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=settings.WEBHOOK_QUEUE_METRICS_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _purge_old_events(self):
+        """Periodically delete processed and dead events past their retention."""
+        while not self._stop_event.is_set():
+            try:
+                async with await self._get_db_session() as db:
+                    await WebhookQueueService.purge_old_events(db)
+            except Exception as e:
+                logger.error(f"Error purging old webhook events: {str(e)}")
+
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=settings.WEBHOOK_PURGE_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the consumer tasks on the running event loop."""
+        logger.info(f"Starting {self.concurrency} webhook consumers")
+        self._stop_event.clear()
+        self._tasks = [
+            asyncio.create_task(self._consume(index)) for index in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._report_metrics()))
+        self._tasks.append(asyncio.create_task(self._purge_old_events()))
+
+    async def stop(self):
+        """Stop the consumers, letting in-flight events finish."""
+        self._stop_event.set()
+        self._wakeup_event.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Webhook consumers stopped")
+
+    async def run_forever(self):
+        """Run the consumers until cancelled."""
+        self.start()
+        try:
+            await self._stop_event.wait()
+        finally:
+            await self.stop()
+
+
+# Global consumer instance used by the API process
+webhook_consumer = WebhookConsumer()
+
+
+async def main(concurrency: Optional[int] = None):
+    """Main entry point."""
+    consumer = WebhookConsumer(concurrency=concurrency)
+    await consumer.run_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+    parser = argparse.ArgumentParser(description="Webhook consumer")
+    parser.add_argument("--concurrency", type=int, default=None, help="Number of concurrent consumers")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(concurrency=args.concurrency))
+    except KeyboardInterrupt:
+        print("🛑 Webhook consumer stopped by user")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Re-analyse completed calls after a prompt or model change.
+
+Creates an analysis backfill job (or resumes an existing one) and runs it in
+this process. Progress is checkpointed per chunk, so an interrupted run can
+be resumed with --resume.
+
+Examples:
+    python scripts/backfill_call_analysis.py --prompt-version 2
+    python scripts/backfill_call_analysis.py --organization-id <uuid> --since 2025-08-01 --concurrency 8
+    python scripts/backfill_call_analysis.py --resume 12 --force
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import UUID
+
+# Add the server directory to the Python path
+server_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(server_dir))
+
+from app.core.database import get_engine, async_session_factory
+from app.core.http_client import http_clients
+from app.services.analysis_backfill_service import AnalysisBackfillService
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> int:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Re-analyse completed calls")
+    parser.add_argument("--organization-id", type=UUID, help="Only re-analyse this organization's calls")
+    parser.add_argument("--since", help="Only re-analyse calls created at or after this ISO date/time (UTC)")
+    parser.add_argument("--model", help="LLM model (defaults to OPENAI_MODEL)")
+    parser.add_argument("--prompt-version", type=int, help="Prompt version from config/prompts.json")
+    parser.add_argument("--resume", type=int, metavar="JOB_ID", help="Resume an existing job instead of creating one")
+    parser.add_argument("--force", action="store_true", help="Resume a job still marked running (its runner died)")
+    parser.add_argument("--concurrency", type=int, help="Max parallel LLM requests")
+    parser.add_argument("--chunk-size", type=int, help="Calls per chunk")
+    args = parser.parse_args()
+
+    since = None
+    if args.since:
+        since = datetime.fromisoformat(args.since)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+    try:
+        job_id = args.resume
+        if job_id is None:
+            async with async_session_factory(bind=get_engine()) as db:
+                job = await AnalysisBackfillService.create_job(
+                    db,
+                    organization_id=args.organization_id,
+                    completed_since=since,
+                    model=args.model,
+                    prompt_version=args.prompt_version
+                )
+            job_id = job.id
+            logger.info(f"Created re-analysis job {job_id} for {job.total_count} calls")
+
+        job = await AnalysisBackfillService.run_job(
+            job_id,
+            concurrency=args.concurrency,
+            chunk_size=args.chunk_size,
+            force=args.force
+        )
+        return 0 if job is not None and job.status == "completed" else 1
+    except Exception as e:
+        logger.error(f"Re-analysis failed: {str(e)}")
+        return 1
+    finally:
+        await http_clients.aclose()
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily analytics rollups.
+
+Recomputes daily_call_stats and daily_service_record_stats from the raw calls
+and service records for a range of UTC days, one organization per
+transaction. Safe to run while the application is serving traffic: each
+organization's refresh takes the same advisory lock as the live refreshes.
+
+Examples:
+    python scripts/rebuild_daily_stats.py --since 2025-01-01
+    python scripts/rebuild_daily_stats.py --since 2025-08-01 --until 2025-08-31 --organization-id <uuid>
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+from uuid import UUID
+
+# Add the server directory to the Python path
+server_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(server_dir))
+
+from app.core.database import get_engine, async_session_factory
+from app.services.daily_stats_service import DailyStatsService
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> int:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Rebuild the daily analytics rollups")
+    parser.add_argument("--since", required=True, type=date.fromisoformat, help="First UTC day (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Last UTC day (YYYY-MM-DD, defaults to today)")
+    parser.add_argument("--organization-id", type=UUID, help="Only rebuild this organization's rollups")
+    args = parser.parse_args()
+
+    until = args.until or datetime.now(timezone.utc).date()
+    if until < args.since:
+        logger.error("--until must not be before --since")
+        return 1
+
+    try:
+        async with async_session_factory(bind=get_engine()) as db:
+            count = await DailyStatsService.rebuild(args.since, until, db, organization_id=args.organization_id)
+        logger.info(f"Rebuilt daily stats for {count} organizations ({args.since} to {until})")
+        return 0
+    except Exception as e:
+        logger.error(f"Daily stats rebuild failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
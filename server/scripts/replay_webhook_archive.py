@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Replay archived webhook payloads.
+
+Reads the compressed NDJSON segments written by the webhook archive
+(WEBHOOK_ARCHIVE_ENABLED) and either lists them or re-enqueues them into the
+webhook inbox for the background consumers. Event deduplication makes it safe
+to replay payloads that were already processed.
+
+Examples:
+    python scripts/replay_webhook_archive.py webhook_archive/
+    python scripts/replay_webhook_archive.py webhook_archive/ --event-type end-of-call-report --since 2025-08-01 --enqueue
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+# Add the server directory to the Python path
+server_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(server_dir))
+
+from app.core.database import get_engine, async_session_factory
+from app.core.webhook_archive import SEGMENT_PREFIX, read_archive_segment
+from app.models import WebhookEvent
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+def find_segments(paths: List[str]) -> List[Path]:
+    """Expand files and directories into archive segments, oldest first."""
+    segments = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            segments.extend(p for p in path.iterdir() if p.name.startswith(SEGMENT_PREFIX))
+        else:
+            segments.append(path)
+    return sorted(segments)
+
+
+def iter_records(segments: List[Path], event_type: Optional[str], since: Optional[datetime]) -> Iterator[dict]:
+    """Yield archived records matching the filters."""
+    for segment in segments:
+        logger.info(f"Reading {segment}")
+        for record in read_archive_segment(segment):
+            if event_type and record.get("event_type") != event_type:
+                continue
+            if since and datetime.fromisoformat(record["received_at"]) < since:
+                continue
+            yield record
+
+
+async def replay(records: Iterator[dict], enqueue: bool, batch_size: int = 500) -> int:
+    """List records or enqueue them into the webhook inbox in batches."""
+    count = 0
+
+    if not enqueue:
+        for record in records:
+            print(f"{record['received_at']}  {record.get('event_type')}")
+            count += 1
+        return count
+
+    async with async_session_factory(bind=get_engine()) as db:
+        for record in records:
+            payload = record["payload"]
+            # Same unwrapping as the webhook endpoint
+            message = payload.get("message", payload)
+            db.add(WebhookEvent(
+                source="vapi",
+                event_type=record.get("event_type"),
+                payload=message,
+                status="pending",
+                attempts=0
+            ))
+            count += 1
+            if count % batch_size == 0:
+                await db.commit()
+                logger.info(f"Enqueued {count} events")
+        await db.commit()
+
+    return count
+
+
+async def main() -> int:
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Replay archived webhook payloads")
+    parser.add_argument("paths", nargs="+", help="Archive segments or directories")
+    parser.add_argument("--event-type", help="Only replay this event type")
+    parser.add_argument("--since", help="Only replay payloads received at or after this ISO date/time (UTC)")
+    parser.add_argument("--enqueue", action="store_true", help="Enqueue into the webhook inbox instead of listing")
+    args = parser.parse_args()
+
+    since = None
+    if args.since:
+        since = datetime.fromisoformat(args.since)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+    try:
+        records = iter_records(find_segments(args.paths), args.event_type, since)
+        count = await replay(records, args.enqueue)
+        logger.info(f"{'Enqueued' if args.enqueue else 'Found'} {count} archived webhook payloads")
+        return 0
+    except Exception as e:
+        logger.error(f"Webhook replay failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
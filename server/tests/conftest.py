@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration.
+"""
+
+import os
+import sys
+
+# Make the app package importable when pytest is run from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
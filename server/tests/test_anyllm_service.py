@@ -0,0 +1,48 @@
+"""
+Tests for the per-provider concurrency cap of AnyLLMService completions.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+anyllm_service = pytest.importorskip("app.services.anyLLM_service", exc_type=ImportError)
+
+
+@pytest.fixture
+def sync_completion(monkeypatch):
+    """Force the thread pool path with a completion that sleeps as asked."""
+    def completion(sleep, **kwargs):
+        time.sleep(sleep)
+        return "done"
+
+    monkeypatch.setattr(anyllm_service, "acompletion", None)
+    monkeypatch.setattr(anyllm_service, "completion", completion)
+    monkeypatch.setattr(anyllm_service, "_provider_semaphores", {})
+    monkeypatch.setattr(anyllm_service.settings, "LLM_PROVIDER_CONCURRENCY", {"test": 1})
+    monkeypatch.setattr(anyllm_service.settings, "LLM_REQUEST_TIMEOUT_SECONDS", 0.1)
+
+
+def test_timed_out_thread_keeps_its_slot_until_it_finishes(sync_completion):
+    service = object.__new__(anyllm_service.AnyLLMService)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await service._complete("test", sleep=0.5)
+        semaphore = anyllm_service._get_provider_semaphore("test")
+        held_after_timeout = semaphore.locked()
+        await asyncio.sleep(0.6)
+        return held_after_timeout, semaphore.locked()
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_completed_request_releases_its_slot(sync_completion):
+    service = object.__new__(anyllm_service.AnyLLMService)
+
+    async def run():
+        result = await service._complete("test", sleep=0)
+        return result, anyllm_service._get_provider_semaphore("test").locked()
+
+    assert asyncio.run(run()) == ("done", False)
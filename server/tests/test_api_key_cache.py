@@ -0,0 +1,127 @@
+"""
+Tests for the verified API key cache.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.models import ApiKey
+from app.services import api_key_service as api_key_service_module
+from app.services.api_key_service import ApiKeyService
+
+RAW_KEY = "sk_test_key"
+
+
+class FakeClock:
+    """Stand-in for the time module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeResult:
+    def __init__(self, record):
+        self.record = record
+
+    def scalar_one_or_none(self):
+        return self.record
+
+
+class FakeSession:
+    """Answers every query with the stored key, counting the round trips."""
+
+    def __init__(self, record):
+        self.record = record
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return FakeResult(self.record)
+
+
+def make_api_key(**overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        name="Test key",
+        secret_hash=ApiKeyService.hash_api_key(RAW_KEY),
+        secret_key_preview="sk_test_...",
+        organization_id=uuid.uuid4(),
+        created_by_id=1,
+        is_active=True,
+        usage_count=0,
+        rate_limit_per_minute=10,
+        webhook_timeout=30,
+    )
+    values.update(overrides)
+    api_key = ApiKey(**values)
+    api_key.organization = None
+    return api_key
+
+
+def verify(db):
+    return asyncio.run(ApiKeyService.verify_api_key(RAW_KEY, db))
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(api_key_service_module, "time", fake)
+    monkeypatch.setattr(api_key_service_module.settings, "API_KEY_CACHE_TTL_SECONDS", 60)
+    ApiKeyService.clear_cache()
+    yield fake
+    ApiKeyService.clear_cache()
+
+
+def test_verified_key_is_served_from_cache_within_ttl(clock):
+    db = FakeSession(make_api_key())
+
+    first = verify(db)
+    clock.now += 59
+    second = verify(db)
+
+    assert db.queries == 1
+    assert second is first
+
+
+def test_cache_entry_is_reloaded_after_ttl(clock):
+    db = FakeSession(make_api_key())
+
+    verify(db)
+    clock.now += 60
+    verify(db)
+
+    assert db.queries == 2
+
+
+def test_inactive_cached_key_is_not_served(clock):
+    db = FakeSession(make_api_key())
+    cached = verify(db)
+
+    cached.is_active = False
+    db.record = None
+
+    assert verify(db) is None
+    assert db.queries == 2
+
+
+def test_unknown_key_is_not_cached(clock):
+    db = FakeSession(None)
+
+    assert verify(db) is None
+    assert verify(db) is None
+    assert db.queries == 2
+
+
+def test_invalidate_cache_forces_a_reload(clock):
+    db = FakeSession(make_api_key())
+
+    verify(db)
+    ApiKeyService.invalidate_cache(ApiKeyService.hash_api_key(RAW_KEY))
+    verify(db)
+
+    assert db.queries == 2
@@ -0,0 +1,84 @@
+"""
+Tests for the bulk API key usage flush.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import api_key_service as api_key_service_module
+from app.services.api_key_service import ApiKeyService
+
+
+class RecordingSession:
+    """Records the SQL of each statement, optionally failing on one of them."""
+
+    def __init__(self, fail_on=None):
+        self.statements = []
+        self.fail_on = fail_on
+        self.committed = False
+        self.rolled_back = False
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        if self.fail_on is not None and len(self.statements) == self.fail_on:
+            raise RuntimeError("database unavailable")
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.fixture(autouse=True)
+def pending_usage(monkeypatch):
+    monkeypatch.setattr(api_key_service_module, "_pending_usage", {})
+
+
+def record(api_key_id, times):
+    for _ in range(times):
+        ApiKeyService.record_usage(type("Key", (), {"id": api_key_id})())
+
+
+def test_flush_without_usage_does_nothing():
+    db = RecordingSession()
+
+    assert asyncio.run(ApiKeyService.flush_usage(db)) == 0
+    assert db.statements == []
+
+
+def test_rows_are_locked_in_id_order_before_the_update():
+    record(uuid.uuid4(), 2)
+    record(uuid.uuid4(), 1)
+    db = RecordingSession()
+
+    assert asyncio.run(ApiKeyService.flush_usage(db)) == 2
+
+    lock, update = db.statements
+    assert lock.startswith("SELECT api_keys.id")
+    assert lock.endswith("ORDER BY api_keys.id FOR UPDATE")
+    assert update.startswith("UPDATE api_keys SET")
+    assert "usage_count=(api_keys.usage_count + usage.uses)" in update
+    assert db.committed
+    assert api_key_service_module._pending_usage == {}
+
+
+@pytest.mark.parametrize("fail_on", [1, 2])
+def test_failed_flush_puts_counts_back(fail_on):
+    api_key_id = uuid.uuid4()
+    record(api_key_id, 3)
+    db = RecordingSession(fail_on=fail_on)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ApiKeyService.flush_usage(db))
+
+    # Later requests add to the restored counts
+    assert db.rolled_back
+    record(api_key_id, 1)
+    count, last_used_at = api_key_service_module._pending_usage[api_key_id]
+    assert count == 4
+    assert last_used_at <= datetime.now(timezone.utc)
@@ -0,0 +1,155 @@
+"""
+Tests for settling leased calls when a dial does not go through.
+
+Statements are compiled with literal values and recorded by a fake session,
+so these tests check the SQL each path issues without a database.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.call_initiator import worker as worker_module
+from app.call_initiator.worker import CallInitiatorWorker
+from app.services.call_lease_service import CallLeaseService
+
+OWNER = "host:1:abcd1234"
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+        self.rowcount = len(rows)
+
+    def all(self):
+        return self.rows
+
+
+class RecordingSession:
+    """Records each statement; call updates return the given rows."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        self.statements.append(" ".join(sql.split()))
+        return FakeResult(self.rows if sql.startswith("UPDATE calls") else [])
+
+    async def commit(self):
+        self.commits += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def call_updates(db):
+    return [sql for sql in db.statements if sql.startswith("UPDATE calls")]
+
+
+def test_fail_dial_marks_the_leased_call_and_its_service_record_failed():
+    db = RecordingSession(rows=[SimpleNamespace(id=7, service_record_id=3)])
+
+    assert asyncio.run(CallLeaseService.fail_dial(7, OWNER, db)) == 1
+
+    (call_update,) = call_updates(db)
+    assert call_update.startswith("UPDATE calls SET status='Failed', lease_owner=NULL, lease_expires_at=NULL")
+    assert f"calls.lease_owner = '{OWNER}'" in call_update
+    assert "calls.id = 7" in call_update
+    assert "SKIP LOCKED" not in call_update
+    assert db.statements[-1].startswith("UPDATE servicerecords SET status='Failed'")
+    assert db.commits == 1
+
+
+def test_release_settles_in_progress_calls_before_clearing_leases():
+    db = RecordingSession()
+
+    asyncio.run(CallLeaseService.release_calls([7, 8], OWNER, db))
+
+    requeue, fail, release, clear = call_updates(db)
+    assert "status='Queued'" in requeue and "calls.dial_attempted_at IS NULL" in requeue
+    assert "status='Failed'" in fail and "calls.vapi_call_id IS NULL" in fail
+    assert "status=" not in release and "calls.vapi_call_id IS NOT NULL" in release
+    for sql in (requeue, fail, release):
+        assert "calls.status = 'In Progress'" in sql
+        assert f"calls.lease_owner = '{OWNER}'" in sql
+        assert "SKIP LOCKED" not in sql
+    assert clear.startswith("UPDATE calls SET lease_owner=NULL, lease_expires_at=NULL,")
+    assert "status" not in clear
+    assert db.commits == 1
+
+
+def test_release_without_calls_does_nothing():
+    db = RecordingSession()
+
+    assert asyncio.run(CallLeaseService.release_calls([], OWNER, db)) == 0
+    assert db.statements == []
+
+
+@pytest.fixture
+def dial_calls(monkeypatch):
+    """Record the lease service calls the worker makes around a dial."""
+    calls = []
+
+    async def mark_dial_attempted(call_id, owner, db):
+        calls.append(("mark_dial_attempted", call_id, owner))
+        return True
+
+    async def record_dial(call_id, owner, vapi_call_id, db):
+        calls.append(("record_dial", call_id, owner))
+        return 1
+
+    async def fail_dial(call_id, owner, db):
+        calls.append(("fail_dial", call_id, owner))
+        return 1
+
+    monkeypatch.setattr(worker_module.CallLeaseService, "mark_dial_attempted", mark_dial_attempted)
+    monkeypatch.setattr(worker_module.CallLeaseService, "record_dial", record_dial)
+    monkeypatch.setattr(worker_module.CallLeaseService, "fail_dial", fail_dial)
+    return calls
+
+
+def trigger_dial(monkeypatch, create_call):
+    monkeypatch.setattr(worker_module, "VAPIService", lambda: SimpleNamespace(create_call=create_call))
+    worker = CallInitiatorWorker()
+
+    async def get_db_session():
+        return RecordingSession()
+
+    worker._get_db_session = get_db_session
+    call = SimpleNamespace(id=7)
+    service_record = SimpleNamespace(
+        customer_name="Jane Doe",
+        customer_phone="+15550000000",
+        service_advisor_name=None,
+        service_type=None
+    )
+    organization = SimpleNamespace(name="Organization", location_city=None, location=None)
+    return worker, asyncio.run(worker._trigger_vapi_call(call, service_record, organization))
+
+
+def test_dial_exception_fails_the_call_under_its_lease(monkeypatch, dial_calls):
+    async def create_call(**kwargs):
+        raise RuntimeError("VAPI timed out")
+
+    worker, initiated = trigger_dial(monkeypatch, create_call)
+
+    assert initiated is False
+    assert dial_calls == [("mark_dial_attempted", 7, worker.worker_id), ("fail_dial", 7, worker.worker_id)]
+
+
+def test_accepted_dial_is_recorded(monkeypatch, dial_calls):
+    async def create_call(**kwargs):
+        return {"id": "vapi-123"}
+
+    worker, initiated = trigger_dial(monkeypatch, create_call)
+
+    assert initiated is True
+    assert dial_calls == [("mark_dial_attempted", 7, worker.worker_id), ("record_dial", 7, worker.worker_id)]
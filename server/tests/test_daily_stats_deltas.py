@@ -0,0 +1,159 @@
+"""
+Tests for the per-flush rollup deltas.
+
+Deltas are computed from the session's pending changes before anything is
+written, so these tests run on an unbound session.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models import Call, ServiceRecord
+from app.services.daily_stats_service import (
+    CALL_ROLLUP_ATTRIBUTES,
+    SERVICE_RECORD_ROLLUP_ATTRIBUTES,
+    _call_contribution,
+    _collect_deltas,
+    _service_record_contribution,
+)
+
+ORGANIZATION_ID = uuid.uuid4()
+CREATED_AT = datetime(2025, 3, 1, 23, 30, tzinfo=timezone.utc)
+
+
+def make_call(**overrides):
+    values = dict(
+        id=uuid.uuid4(),
+        organization_id=ORGANIZATION_ID,
+        created_at=CREATED_AT,
+        status="Queued",
+        direction="outbound",
+        campaign_id=None,
+        ended_reason=None,
+        call_reason=None,
+        duration_sec=None,
+        cost=None,
+        nps_score=None,
+    )
+    values.update(overrides)
+    return Call(**values)
+
+
+def persistent(session, instance):
+    """Attach an instance as if it had been loaded from the database."""
+    make_transient_to_detached(instance)
+    session.add(instance)
+    return instance
+
+
+def call_group(status):
+    return (ORGANIZATION_ID, CREATED_AT.date(), status, "outbound", None, None, None)
+
+
+def call_deltas(session):
+    return _collect_deltas(session, Call, CALL_ROLLUP_ATTRIBUTES, _call_contribution)
+
+
+def record_deltas(session):
+    return _collect_deltas(session, ServiceRecord, SERVICE_RECORD_ROLLUP_ATTRIBUTES, _service_record_contribution)
+
+
+def test_new_call_adds_its_measures():
+    session = Session()
+    session.add(make_call(status="Completed", duration_sec=42, cost=0.25, nps_score=9))
+
+    assert call_deltas(session) == {
+        call_group("Completed"): {
+            "call_count": 1,
+            "duration_count": 1,
+            "total_duration_sec": 42,
+            "total_cost": Decimal("0.25"),
+            "nps_count": 1,
+            "total_nps": 9,
+        }
+    }
+
+
+def test_new_calls_in_one_group_are_summed():
+    session = Session()
+    session.add_all([make_call(duration_sec=10), make_call(duration_sec=20), make_call()])
+
+    deltas = call_deltas(session)
+
+    assert deltas[call_group("Queued")]["call_count"] == 3
+    assert deltas[call_group("Queued")]["duration_count"] == 2
+    assert deltas[call_group("Queued")]["total_duration_sec"] == 30
+
+
+def test_status_change_moves_the_call_between_groups():
+    session = Session()
+    call = persistent(session, make_call())
+    call.status = "Completed"
+    call.duration_sec = 30
+
+    deltas = call_deltas(session)
+
+    assert deltas[call_group("Queued")]["call_count"] == -1
+    assert deltas[call_group("Queued")]["total_duration_sec"] == 0
+    assert deltas[call_group("Completed")]["call_count"] == 1
+    assert deltas[call_group("Completed")]["total_duration_sec"] == 30
+
+
+def test_measure_change_within_a_group_keeps_only_the_difference():
+    session = Session()
+    call = persistent(session, make_call(status="Completed", duration_sec=30))
+    call.duration_sec = 45
+
+    assert call_deltas(session) == {
+        call_group("Completed"): {
+            "call_count": 0,
+            "duration_count": 0,
+            "total_duration_sec": 15,
+            "total_cost": Decimal(0),
+            "nps_count": 0,
+            "total_nps": 0,
+        }
+    }
+
+
+def test_change_to_unrelated_attribute_has_no_delta():
+    session = Session()
+    call = persistent(session, make_call())
+    call.summary = "Left a voicemail"
+
+    assert call_deltas(session) == {}
+
+
+def test_unchanged_value_assignment_has_no_delta():
+    session = Session()
+    call = persistent(session, make_call())
+    call.status = "Queued"
+
+    assert call_deltas(session) == {}
+
+
+def test_deleted_service_record_is_subtracted():
+    session = Session()
+    record = persistent(session, ServiceRecord(
+        id=uuid.uuid4(),
+        organization_id=ORGANIZATION_ID,
+        created_at=CREATED_AT,
+        status="Ready",
+        campaign_id=None,
+        is_demo=None,
+    ))
+    session.delete(record)
+
+    assert record_deltas(session) == {
+        (ORGANIZATION_ID, CREATED_AT.date(), "Ready", None, False): {"record_count": -1}
+    }
+
+
+def test_rows_without_organization_or_status_are_not_rolled_up():
+    session = Session()
+    session.add_all([make_call(organization_id=None), make_call(status=None)])
+
+    assert call_deltas(session) == {}
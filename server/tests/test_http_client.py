@@ -0,0 +1,99 @@
+"""
+Tests for the shared HTTP client registry and the retry policy.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.http_client import (
+    DEFAULT_RETRY_STATUSES,
+    NON_IDEMPOTENT_RETRY_STATUSES,
+    HTTPClientRegistry,
+    request_with_retries,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_CLIENT_BACKOFF_BASE_SECONDS", 0)
+    monkeypatch.setattr(settings, "HTTP_CLIENT_MAX_RETRIES", 2)
+
+
+def test_client_is_reused_within_a_loop():
+    registry = HTTPClientRegistry()
+
+    async def get_twice():
+        first, second = registry.get("test"), registry.get("test")
+        await registry.aclose()
+        return first, second
+
+    first, second = asyncio.run(get_twice())
+    assert first is second
+
+
+def test_client_from_a_finished_loop_is_closed_when_replaced():
+    registry = HTTPClientRegistry()
+
+    async def get():
+        return registry.get("test")
+
+    async def replace():
+        client = registry.get("test")
+        await asyncio.sleep(0)
+        await registry.aclose()
+        return client
+
+    stale = asyncio.run(get())
+    fresh = asyncio.run(replace())
+
+    assert fresh is not stale
+    assert stale.is_closed
+    assert not registry._closing
+
+
+def respond(*outcomes):
+    """Client whose requests get the given statuses (or raise the given errors) in turn."""
+    outcomes = list(outcomes)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://api.test"), requests
+
+
+def send(client, retry_statuses):
+    async def post():
+        async with client:
+            return await request_with_retries(client, "POST", "/calls", retry_statuses=retry_statuses)
+
+    return asyncio.run(post())
+
+
+@pytest.mark.parametrize("status", [502, 503, 504])
+def test_non_idempotent_request_is_not_retried_on_gateway_errors(status):
+    client, requests = respond(status, 200)
+
+    assert send(client, NON_IDEMPOTENT_RETRY_STATUSES).status_code == status
+    assert len(requests) == 1
+
+
+def test_non_idempotent_request_is_retried_when_throttled_or_unconnected():
+    client, requests = respond(429, httpx.ConnectError("refused"), 200)
+
+    assert send(client, NON_IDEMPOTENT_RETRY_STATUSES).status_code == 200
+    assert len(requests) == 3
+
+
+def test_retries_stop_at_the_limit():
+    client, requests = respond(503, 503, 503, 200)
+
+    assert send(client, DEFAULT_RETRY_STATUSES).status_code == 503
+    assert len(requests) == 3
@@ -0,0 +1,75 @@
+"""
+Tests for keyset pagination cursors.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.exceptions import BadRequestException
+from app.core.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def raw_cursor(payload):
+    """Encode arbitrary JSON the way encode_cursor does."""
+    raw = json.dumps(payload).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    datetime(2025, 3, 1, 12, 30, tzinfo=timezone(timedelta(hours=-5))),
+    datetime(2025, 3, 1, 12, 30),
+])
+@pytest.mark.parametrize("row_id", [0, 1, 987654321])
+def test_round_trip(created_at, row_id):
+    cursor = encode_cursor(created_at, row_id)
+
+    assert decode_cursor(cursor) == (created_at, row_id)
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor",
+    "%%%",
+    "ë",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode("ascii"),
+    raw_cursor(None),
+    raw_cursor(42),
+    raw_cursor([]),
+    raw_cursor(["2025-03-01T12:30:00+00:00"]),
+    raw_cursor(["2025-03-01T12:30:00+00:00", 1, 2]),
+    raw_cursor(["not a date", 1]),
+    raw_cursor([1740832200, 1]),
+    raw_cursor([None, 1]),
+    raw_cursor(["2025-03-01T12:30:00+00:00", "1"]),
+    raw_cursor(["2025-03-01T12:30:00+00:00", 1.5]),
+    raw_cursor(["2025-03-01T12:30:00+00:00", True]),
+    raw_cursor(["2025-03-01T12:30:00+00:00", None]),
+    raw_cursor(["2025-03-01T12:30:00+00:00", [1]]),
+    raw_cursor({"created_at": "2025-03-01T12:30:00+00:00", "id": 1}),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(BadRequestException) as excinfo:
+        decode_cursor(cursor)
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == "Invalid cursor"
+
+
+def test_next_cursor_points_after_the_last_row_of_a_full_page():
+    created_at = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    rows = [SimpleNamespace(created_at=created_at + timedelta(minutes=i), id=i) for i in range(3, 0, -1)]
+
+    assert decode_cursor(next_cursor(rows, 3)) == (rows[-1].created_at, 1)
+
+
+def test_next_cursor_is_none_after_the_last_page():
+    rows = [SimpleNamespace(created_at=datetime(2025, 3, 1, tzinfo=timezone.utc), id=1)]
+
+    assert next_cursor(rows, 2) is None
+    assert next_cursor([], 2) is None
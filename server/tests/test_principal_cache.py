@@ -0,0 +1,100 @@
+"""
+Tests for principal cache eviction on ORM writes.
+
+A flush is simulated by calling the mapper listeners directly; commits and
+rollbacks run on an unbound session, which fires the session events without
+a database.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.principal_cache import _evict_organization, _evict_user, principal_cache
+from app.models import Organization, User
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+def attach(session, instance):
+    """Attach an instance as loaded and unchanged, so a commit has nothing to flush."""
+    make_transient_to_detached(instance)
+    session.add(instance)
+
+
+def cached_user(user_id=1):
+    user = User(id=user_id, email=f"user{user_id}@example.com")
+    principal_cache.put_user(f"subject-{user_id}", user)
+    return user
+
+
+def cached_organization():
+    organization = Organization(id=uuid.uuid4(), name="Organization", email="org@example.com")
+    principal_cache.put_organization(organization)
+    return organization
+
+
+def test_flushed_user_is_evicted_only_on_commit():
+    session = Session()
+    user = cached_user()
+    attach(session, user)
+
+    _evict_user(None, None, user)
+    assert principal_cache.get_user("subject-1") is not None
+
+    session.commit()
+    assert principal_cache.get_user("subject-1") is None
+
+
+def test_flushed_organization_is_evicted_only_on_commit():
+    session = Session()
+    organization = cached_organization()
+    organization_id = organization.id
+    attach(session, organization)
+
+    _evict_organization(None, None, organization)
+    assert principal_cache.get_organization(organization_id) is not None
+
+    session.commit()
+    assert principal_cache.get_organization(organization_id) is None
+
+
+def test_rollback_evicts_too():
+    session = Session()
+    session.begin()
+    user = cached_user()
+    attach(session, user)
+
+    _evict_user(None, None, user)
+    session.rollback()
+
+    assert principal_cache.get_user("subject-1") is None
+
+
+def test_commit_only_evicts_what_its_session_flushed():
+    flushing, other = Session(), Session()
+    user = cached_user(1)
+    cached_user(2)
+    attach(flushing, user)
+
+    _evict_user(None, None, user)
+    other.commit()
+    assert principal_cache.get_user("subject-1") is not None
+
+    flushing.commit()
+    assert principal_cache.get_user("subject-1") is None
+    assert principal_cache.get_user("subject-2") is not None
+
+
+def test_object_without_session_is_evicted_at_once():
+    user = cached_user()
+
+    _evict_user(None, None, user)
+
+    assert principal_cache.get_user("subject-1") is None
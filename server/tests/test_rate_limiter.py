@@ -0,0 +1,173 @@
+"""
+Tests for the rate limiter: in-memory token buckets and backend leasing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core import rate_limiter as rate_limiter_module
+from app.core.rate_limiter import InMemoryRateLimiter, PostgresRateLimiterBackend, RateLimiterBackend
+
+
+class FakeClock:
+    """Stand-in for the time module with a manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def limiter():
+    return InMemoryRateLimiter()
+
+
+def test_new_identifier_may_burst_up_to_the_limit(clock, limiter):
+    assert [limiter.is_allowed("key", 5) for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_identifiers_have_separate_buckets(clock, limiter):
+    for _ in range(3):
+        limiter.is_allowed("a", 3)
+
+    assert not limiter.is_allowed("a", 3)
+    assert limiter.is_allowed("b", 3)
+
+
+def test_tokens_refill_at_limit_per_window(clock, limiter):
+    for _ in range(5):
+        limiter.is_allowed("key", 5, window_seconds=60)
+
+    # One token every 12 seconds
+    clock.advance(11.9)
+    assert not limiter.is_allowed("key", 5, window_seconds=60)
+    clock.advance(0.1)
+    assert limiter.is_allowed("key", 5, window_seconds=60)
+    assert not limiter.is_allowed("key", 5, window_seconds=60)
+
+
+def test_refill_never_exceeds_the_limit(clock, limiter):
+    limiter.is_allowed("key", 5)
+    clock.advance(3600)
+
+    assert [limiter.is_allowed("key", 5) for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_reset_time_is_time_until_the_next_token(clock, limiter):
+    assert limiter.get_reset_time("unknown") == 0
+
+    for _ in range(5):
+        limiter.is_allowed("key", 5, window_seconds=60)
+    assert limiter.get_reset_time("key", 60) == 12
+
+    clock.advance(5)
+    assert limiter.get_reset_time("key", 60) == 7
+
+    clock.advance(7)
+    assert limiter.get_reset_time("key", 60) == 0
+
+
+def test_limit_change_applies_to_an_existing_bucket(clock, limiter):
+    for _ in range(2):
+        limiter.is_allowed("key", 2)
+    assert not limiter.is_allowed("key", 2)
+
+    # A raised limit raises the capacity but does not grant tokens up front
+    assert not limiter.is_allowed("key", 10)
+    clock.advance(6)
+    assert limiter.is_allowed("key", 10)
+
+
+def test_cleanup_drops_refilled_buckets_least_recently_used_first(clock, limiter):
+    limiter.is_allowed("fast", 60)  # refills in 1 second
+    limiter.is_allowed("slow", 1)  # refills in 60 seconds
+    limiter.is_allowed("also-fast", 60)
+
+    clock.advance(2)
+    # The walk stops at the first bucket still refilling
+    assert limiter.cleanup() == 1
+    assert list(limiter.buckets) == ["slow", "also-fast"]
+
+    clock.advance(60)
+    assert limiter.cleanup() == 2
+    assert not limiter.buckets
+
+
+def test_use_moves_a_bucket_to_the_most_recently_used_end(clock, limiter):
+    limiter.is_allowed("a", 60)
+    limiter.is_allowed("b", 60)
+    limiter.is_allowed("a", 60)
+
+    assert list(limiter.buckets) == ["b", "a"]
+
+
+def test_dropped_bucket_behaves_like_a_full_one(clock, limiter):
+    limiter.is_allowed("key", 3)
+    clock.advance(60)
+    limiter.cleanup()
+    assert "key" not in limiter.buckets
+
+    assert [limiter.is_allowed("key", 3) for _ in range(4)] == [True] * 3 + [False]
+
+
+def test_backend_interface_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        RateLimiterBackend()
+
+
+@pytest.mark.parametrize("limit, chunk", [(1, 1), (3, 3), (10, 5), (20, 5), (100, 10), (1000, 100)])
+def test_lease_chunk_has_a_floor_and_never_exceeds_the_limit(limit, chunk):
+    assert PostgresRateLimiterBackend.lease_chunk(limit) == chunk
+
+
+class SharedBucket:
+    """In-memory stand-in for the rate_limit_buckets upsert, without refill."""
+
+    def __init__(self, limit):
+        self.tokens = limit
+        self.round_trips = 0
+
+    async def lease_tokens(self, identifier, limit, window_seconds, chunk):
+        self.round_trips += 1
+        granted = min(chunk, self.tokens)
+        self.tokens -= granted
+        return granted, float(self.tokens), limit / window_seconds
+
+
+@pytest.mark.parametrize("limit, round_trips", [(10, 2), (60, 10)])
+def test_postgres_backend_leases_several_requests_per_round_trip(clock, limit, round_trips):
+    backend = PostgresRateLimiterBackend(InMemoryRateLimiter())
+    bucket = SharedBucket(limit)
+    backend._lease_tokens = bucket.lease_tokens
+
+    async def acquire_all():
+        return [(await backend.acquire("key", limit))[0] for _ in range(limit)]
+
+    assert asyncio.run(acquire_all()) == [True] * limit
+    assert bucket.round_trips == round_trips
+
+
+def test_postgres_backend_denies_once_the_shared_bucket_is_empty(clock):
+    backend = PostgresRateLimiterBackend(InMemoryRateLimiter())
+    bucket = SharedBucket(10)
+    backend._lease_tokens = bucket.lease_tokens
+
+    async def acquire_all():
+        return [await backend.acquire("key", 10) for _ in range(11)]
+
+    results = asyncio.run(acquire_all())
+    assert [allowed for allowed, _ in results] == [True] * 10 + [False]
+    assert results[-1][1] == 6
@@ -0,0 +1,166 @@
+"""
+Tests for the precompiled schedule window index.
+
+The index replaced a per-cycle check of every organization's schedule config;
+these tests compare the two at minute granularity.
+"""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.schedule_index import (
+    MINUTES_PER_WEEK,
+    ScheduleWindowIndex,
+    compile_schedule_windows,
+    minute_of_week,
+)
+
+ALL_DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+WEEKDAYS = ALL_DAYS[:5]
+
+
+def legacy_in_window(config, now):
+    """The per-config check the call initiator worker used to run."""
+    if not config.get("auto_call_enabled", False):
+        return False
+
+    timezone_str = config.get("timezone", "UTC")
+    try:
+        tz = ZoneInfo(timezone_str)
+    except Exception:
+        tz = ZoneInfo("UTC")
+
+    current_time = now.astimezone(tz)
+    if current_time.strftime("%A").lower() not in config.get("active_days", []):
+        return False
+
+    start_time = datetime.strptime(config.get("start_time", "00:00"), "%H:%M").time()
+    end_time = datetime.strptime(config.get("end_time", "23:59"), "%H:%M").time()
+    current_time_only = current_time.time()
+
+    if start_time <= end_time:
+        return start_time <= current_time_only <= end_time
+    return current_time_only >= start_time or current_time_only <= end_time
+
+
+def schedule(start, end, days, tz="UTC", enabled=True):
+    return {
+        "auto_call_enabled": enabled,
+        "timezone": tz,
+        "start_time": start,
+        "end_time": end,
+        "active_days": days,
+    }
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+# Monday 2025-08-04 is the reference week
+REFERENCE = utc(2025, 8, 4, 0, 0)
+
+
+@pytest.mark.parametrize(
+    "config, moment, expected",
+    [
+        # Business hours
+        (schedule("09:00", "17:00", WEEKDAYS), utc(2025, 8, 4, 8, 59), False),
+        (schedule("09:00", "17:00", WEEKDAYS), utc(2025, 8, 4, 9, 0), True),
+        (schedule("09:00", "17:00", WEEKDAYS), utc(2025, 8, 4, 17, 0), True),
+        (schedule("09:00", "17:00", WEEKDAYS), utc(2025, 8, 4, 17, 1), False),
+        # Day-of-week boundaries
+        (schedule("09:00", "17:00", WEEKDAYS), utc(2025, 8, 9, 12, 0), False),
+        (schedule("00:00", "23:59", ["sunday"]), utc(2025, 8, 10, 23, 59), True),
+        (schedule("00:00", "23:59", ["sunday"]), utc(2025, 8, 11, 0, 0), False),
+        (schedule("00:00", "23:59", ["monday"]), utc(2025, 8, 4, 0, 0), True),
+        # Ranges spanning midnight only cover the active day itself
+        (schedule("22:00", "06:00", ["monday"]), utc(2025, 8, 4, 23, 30), True),
+        (schedule("22:00", "06:00", ["monday"]), utc(2025, 8, 4, 5, 0), True),
+        (schedule("22:00", "06:00", ["monday"]), utc(2025, 8, 5, 2, 0), False),
+        (schedule("22:00", "06:00", ["monday"]), utc(2025, 8, 4, 12, 0), False),
+        (schedule("22:00", "06:00", ["sunday"]), utc(2025, 8, 10, 23, 59), True),
+        # Timezone conversion: 09:00-17:00 in Los Angeles is 16:00-00:00 UTC in summer
+        (schedule("09:00", "17:00", WEEKDAYS, "America/Los_Angeles"), utc(2025, 8, 4, 15, 59), False),
+        (schedule("09:00", "17:00", WEEKDAYS, "America/Los_Angeles"), utc(2025, 8, 4, 16, 0), True),
+        (schedule("09:00", "17:00", WEEKDAYS, "America/Los_Angeles"), utc(2025, 8, 5, 0, 0), True),
+        (schedule("09:00", "17:00", WEEKDAYS, "America/Los_Angeles"), utc(2025, 8, 9, 0, 0), True),
+        (schedule("09:00", "17:00", WEEKDAYS, "America/Los_Angeles"), utc(2025, 8, 4, 3, 0), False),
+        # Local Monday morning in Tokyo is still Sunday in UTC
+        (schedule("08:00", "10:00", ["monday"], "Asia/Tokyo"), utc(2025, 8, 10, 23, 30), True),
+        (schedule("08:00", "10:00", ["monday"], "Asia/Tokyo"), utc(2025, 8, 4, 0, 30), True),
+        (schedule("08:00", "10:00", ["monday"], "Asia/Tokyo"), utc(2025, 8, 4, 1, 1), False),
+        # Disabled schedules and invalid timezones
+        (schedule("00:00", "23:59", ALL_DAYS, enabled=False), utc(2025, 8, 4, 12, 0), False),
+        (schedule("09:00", "17:00", WEEKDAYS, "Not/A_Zone"), utc(2025, 8, 4, 9, 0), True),
+    ],
+)
+def test_lookup_matches_legacy_check(config, moment, expected):
+    index = ScheduleWindowIndex()
+    index.build([("org", config)], now=REFERENCE)
+
+    assert legacy_in_window(config, moment) is expected
+    assert ("org" in index.lookup(moment)) is expected
+
+
+SWEEP_CONFIGS = [
+    schedule("09:00", "17:00", WEEKDAYS),
+    schedule("09:00", "17:00", WEEKDAYS, "America/New_York"),
+    schedule("22:00", "06:00", ["friday", "saturday", "sunday"], "Europe/Berlin"),
+    schedule("00:00", "23:59", ALL_DAYS, "Australia/Adelaide"),
+    schedule("18:30", "02:15", ["monday", "thursday"], "Asia/Kolkata"),
+    schedule("07:45", "07:44", ["wednesday"], "Pacific/Auckland"),
+    schedule("12:00", "12:00", ["tuesday"], "America/Los_Angeles"),
+]
+
+
+@pytest.mark.parametrize(
+    "reference",
+    [
+        REFERENCE,
+        # Mid-week build, so the week wraps around the index boundary
+        utc(2025, 8, 7, 13, 17),
+        # Week containing the US spring-forward transition
+        utc(2024, 3, 8, 12, 0),
+        # Week containing the European fall-back transition
+        utc(2024, 10, 25, 12, 0),
+    ],
+)
+def test_index_matches_legacy_check_for_a_week(reference):
+    index = ScheduleWindowIndex()
+    index.build(list(enumerate(SWEEP_CONFIGS)), now=reference)
+
+    # Windows are resolved with the UTC offsets of the week after the build. The
+    # index is rebuilt far more often than that, and within six days of a build
+    # it must agree exactly, even across a DST change.
+    for minute in range(0, 6 * 24 * 60, 7):
+        moment = reference + timedelta(minutes=minute)
+        open_orgs = index.lookup(moment)
+        for org_id, config in enumerate(SWEEP_CONFIGS):
+            assert (org_id in open_orgs) == legacy_in_window(config, moment), (config, moment)
+
+
+def test_invalid_time_format_is_skipped():
+    index = ScheduleWindowIndex()
+    index.build(
+        [("bad", schedule("9am", "17:00", ALL_DAYS)), ("good", schedule("00:00", "23:59", ALL_DAYS))],
+        now=REFERENCE,
+    )
+
+    assert index.lookup(utc(2025, 8, 4, 12, 0)) == frozenset({"good"})
+
+
+def test_compile_splits_intervals_wrapping_the_week():
+    # Monday 08:00-10:00 in Tokyo is Sunday 23:00 to Monday 01:00 UTC
+    windows = compile_schedule_windows(schedule("08:00", "10:00", ["monday"], "Asia/Tokyo"), REFERENCE)
+
+    assert sorted(windows) == [(0, 61), (MINUTES_PER_WEEK - 60, MINUTES_PER_WEEK)]
+
+
+def test_compile_keeps_real_length_across_dst_change():
+    # Berlin falls back at 03:00 on 2024-10-27, so 00:00-06:00 local lasts seven hours
+    windows = compile_schedule_windows(schedule("00:00", "06:00", ["sunday"], "Europe/Berlin"), utc(2024, 10, 25, 12, 0))
+
+    assert windows == [(minute_of_week(utc(2024, 10, 26, 22, 0)), minute_of_week(utc(2024, 10, 27, 5, 1)))]